@@ -2,11 +2,26 @@
 Inicialización de la aplicación Flask
 """
 import os
-from flask import Flask, render_template
+from flask import Flask
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from app.config import config
+from app.compression import GzipMiddleware
+from app.assets import AssetStore, MANIFEST_NAME
+from app.models import RowJSONProvider
+from app.events import broker
+from app.timing import init_timing
+from app.profiling import init_profiling
+from app.tracing import init_tracing
+from app.query_budget import init_query_budgets
+from logger import APP_LOGGER_NAME, init_request_id, setup_logger
+
+def _count_rate_limited(app):
+    """Cuenta el rechazo en /metrics si las métricas están habilitadas"""
+    if app.config['METRICS_ENABLED']:
+        from app.metrics import rate_limited
+        rate_limited()
 
 def create_app(config_name='default'):
     """
@@ -26,9 +41,15 @@ def create_app(config_name='default'):
                 static_url_path=''
                 )
     
+    # Serializar las filas de app.models como objetos JSON
+    app.json = RowJSONProvider(app)
+    
     # Cargar configuración
     app.config.from_object(config[config_name])
     
+    # Handlers del logger global (una vez por proceso)
+    setup_logger(APP_LOGGER_NAME)
+    
     # Configurar CORS
     CORS(app, origins=config[config_name].CORS_ORIGINS)
     
@@ -40,24 +61,81 @@ def create_app(config_name='default'):
         storage_uri="memory://"
     )
     
+    # Desglose de tiempos por petición (después del Limiter)
+    init_timing(app)
+    
+    # Métricas Prometheus por ruta (opcional)
+    if app.config['METRICS_ENABLED']:
+        from app.metrics import init_metrics
+        init_metrics(app)
+    
+    # Trazas por petición (después de timing y métricas)
+    if app.config['TRACING_ENABLED']:
+        init_tracing(app)
+    
+    # Peticiones que superan su presupuesto de consultas (opcional)
+    if app.config['QUERY_BUDGET_MODE'] == 'log':
+        init_query_budgets(app)
+    
+    # ID por petición en los logs y en X-Request-ID (antes de los demás hooks)
+    init_request_id(app)
+    
+    # Perfilado bajo demanda (X-Profile) y muestreo continuo de pilas
+    if app.config['PROFILING_ENABLED'] or app.config['SAMPLING_PROFILER_ENABLED']:
+        init_profiling(app)
+    
     # Registrar blueprints
     from .routes.auth_routes import auth_bp
     from .routes.user_routes import user_bp
     from .routes.course_routes import course_bp
     from .routes.assignment_routes import assignment_bp
+    from .routes.export_routes import export_bp
+    from .routes.event_routes import event_bp
+    from .routes.sync_routes import sync_bp
+    from .routes.health_routes import health_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(course_bp)
     app.register_blueprint(assignment_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(event_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(health_bp)
+    
+    # Las sondas del balanceador no consumen el límite de peticiones
+    limiter.exempt(health_bp)
+    
+    if app.config['METRICS_ENABLED']:
+        from .routes.metrics_routes import metrics_bp
+        app.register_blueprint(metrics_bp)
+        # El scraper no consume el límite de peticiones
+        limiter.exempt(metrics_bp)
     
     # Aplicar rate limit específico a rutas de auth
     limiter.limit("5 per minute")(auth_bp)
     
+    # Compresión gzip de respuestas (API y archivos estáticos)
+    if app.config['COMPRESSION_ENABLED']:
+        app.wsgi_app = GzipMiddleware(
+            app.wsgi_app,
+            level=app.config['COMPRESSION_LEVEL'],
+            min_size=app.config['COMPRESSION_MIN_SIZE'],
+            cache_entries=app.config['COMPRESSION_CACHE_ENTRIES']
+        )
+    
+    # Puente de eventos entre workers (opcional)
+    if app.config['EVENTS_BRIDGE_DIR']:
+        broker.start_bridge(app.config['EVENTS_BRIDGE_DIR'], app.config['SECRET_KEY'])
+    
+    # Archivos del build servidos desde memoria con cache inmutable
+    if os.path.exists(os.path.join(app.config['ASSETS_DIR'], MANIFEST_NAME)):
+        app.wsgi_app = AssetStore(app.wsgi_app, app.config['ASSETS_DIR'])
+    
     # Ruta de prueba
     @app.route('/')
     def index():
-        return render_template("login.html")
+        return app.send_static_file("login.html")
     
     # Manejador de errores 404
     @app.errorhandler(404)
@@ -78,6 +156,7 @@ def create_app(config_name='default'):
     # Manejador de rate limit
     @app.errorhandler(429)
     def ratelimit_handler(error):
+        _count_rate_limited(app)
         return {
             'success': False,
             'message': 'Demasiadas peticiones. Intenta de nuevo más tarde.'
@@ -0,0 +1,125 @@
+"""
+Archivos estáticos precompilados del frontend
+Sirve desde memoria los archivos generados por scripts/build_assets.py
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+from app.compression import ETAG_SUFFIX, accepts_gzip
+
+MANIFEST_NAME = 'manifest.json'
+
+# Los archivos con hash en el nombre nunca cambian de contenido
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+PAGE_CACHE = 'no-cache'
+
+class Asset:
+    """Archivo cargado en memoria con su versión comprimida"""
+    
+    __slots__ = ('body', 'gzip_body', 'content_type', 'etag', 'cache_control')
+    
+    def __init__(self, body, gzip_body, content_type, cache_control):
+        self.body = body
+        self.gzip_body = gzip_body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def load_assets(dist_dir):
+    """
+    Carga en memoria los archivos listados en el manifiesto
+    
+    Args:
+        dist_dir: Carpeta generada por scripts/build_assets.py
+    
+    Returns:
+        dict: {ruta URL: Asset}, vacío si no existe el manifiesto
+    """
+    manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+    
+    if not os.path.exists(manifest_path):
+        return {}
+    
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    files = [(name, IMMUTABLE_CACHE) for name in manifest['assets'].values()]
+    files += [(name, PAGE_CACHE) for name in manifest['pages']]
+    
+    assets = {}
+    for name, cache_control in files:
+        path = os.path.join(dist_dir, name)
+        gzip_path = path + '.gz'
+        
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        
+        assets['/' + name] = Asset(
+            _read(path),
+            _read(gzip_path) if os.path.exists(gzip_path) else None,
+            content_type,
+            cache_control
+        )
+    
+    return assets
+
+class AssetStore:
+    """
+    Middleware WSGI que responde desde memoria los archivos del build
+    
+    Las rutas que no están en el build pasan a la aplicación Flask.
+    """
+    
+    def __init__(self, app, dist_dir, index='login.html'):
+        """
+        Args:
+            app: Aplicación WSGI a envolver
+            dist_dir: Carpeta generada por scripts/build_assets.py
+            index: Página que se sirve en /
+        """
+        self.app = app
+        self.assets = load_assets(dist_dir)
+        self.index = '/' + index
+    
+    def __call__(self, environ, start_response):
+        method = environ.get('REQUEST_METHOD')
+        path = environ.get('PATH_INFO', '')
+        if path == '/':
+            path = self.index
+        
+        asset = self.assets.get(path) if method in ('GET', 'HEAD') else None
+        if asset is None:
+            return self.app(environ, start_response)
+        
+        headers = [
+            ('Content-Type', asset.content_type),
+            ('Cache-Control', asset.cache_control)
+        ]
+        
+        body = asset.body
+        etag = asset.etag
+        if asset.gzip_body is not None:
+            headers.append(('Vary', 'Accept-Encoding'))
+            if accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING', '')):
+                body = asset.gzip_body
+                etag += ETAG_SUFFIX
+                headers.append(('Content-Encoding', 'gzip'))
+        etag = f'"{etag}"'
+        headers.append(('ETag', etag))
+        
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH', '')
+        if etag in if_none_match or if_none_match.strip() == '*':
+            start_response('304 Not Modified', headers)
+            return []
+        
+        headers.append(('Content-Length', str(len(body))))
+        start_response('200 OK', headers)
+        
+        return [] if method == 'HEAD' else [body]
@@ -9,6 +9,8 @@ from flask import request, g
 from app.config import Config
 from app.utils.responses import error_response
 from app.database import execute_query
+from app.timing import timed
+from app.tracing import span
 
 def get_token_from_header():
     """Extrae el token JWT del header Authorization"""
@@ -45,6 +47,56 @@ def decode_token(token):
     except jwt.InvalidTokenError:
         raise jwt.InvalidTokenError("Token inválido")
 
+def authenticate(token):
+    """
+    Valida el token y carga el usuario en g.current_user
+    
+    El usuario se busca una sola vez por petición aunque se autentique
+    antes de la vista (p. ej. el perfilado con X-Profile).
+    
+    Returns:
+        tuple: Respuesta de error o None si el usuario es válido
+    """
+    if not token:
+        return error_response("Token no proporcionado", 401)
+    
+    if g.get('_authenticated_token') == token:
+        return None
+    
+    with timed('auth'), span('auth.token_required'):
+        return _load_user(token)
+
+def _load_user(token):
+    """Decodifica el token y busca al usuario (ver authenticate)"""
+    try:
+        with timed('jwt'):
+            payload = decode_token(token)
+        user_id = payload.get('user_id')
+        
+        # Obtener usuario de la BD
+        query = """
+            SELECT u.id, u.username, u.email, u.is_active, 
+                   r.name as role_name, u.role_id
+            FROM users u
+            JOIN roles r ON u.role_id = r.id
+            WHERE u.id = %s AND u.is_active = TRUE
+        """
+        user = execute_query(query, (user_id,), fetch_one=True)
+        
+        if not user:
+            return error_response("Usuario no encontrado o inactivo", 401)
+        
+        # Almacenar usuario en contexto
+        g.current_user = user
+        g._authenticated_token = token
+    
+    except jwt.InvalidTokenError as e:
+        return error_response(str(e), 401)
+    except Exception as e:
+        return error_response(f"Error de autenticación: {str(e)}", 401)
+    
+    return None
+
 def token_required(f):
     """
     Decorador para requerir autenticación JWT
@@ -52,35 +104,24 @@ def token_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = get_token_from_header()
-        
-        if not token:
-            return error_response("Token no proporcionado", 401)
+        error = authenticate(get_token_from_header())
+        if error:
+            return error
         
-        try:
-            payload = decode_token(token)
-            user_id = payload.get('user_id')
-            
-            # Obtener usuario de la BD
-            query = """
-                SELECT u.id, u.username, u.email, u.is_active, 
-                       r.name as role_name, u.role_id
-                FROM users u
-                JOIN roles r ON u.role_id = r.id
-                WHERE u.id = %s AND u.is_active = TRUE
-            """
-            user = execute_query(query, (user_id,), fetch_one=True)
-            
-            if not user:
-                return error_response("Usuario no encontrado o inactivo", 401)
-            
-            # Almacenar usuario en contexto
-            g.current_user = user
-            
-        except jwt.InvalidTokenError as e:
-            return error_response(str(e), 401)
-        except Exception as e:
-            return error_response(f"Error de autenticación: {str(e)}", 401)
+        return f(*args, **kwargs)
+    
+    return decorated
+
+def stream_token_required(f):
+    """
+    Igual que token_required, pero acepta también ?token= porque
+    EventSource no permite enviar el header Authorization
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        error = authenticate(get_token_from_header() or request.args.get('token'))
+        if error:
+            return error
         
         return f(*args, **kwargs)
     
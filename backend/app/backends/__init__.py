@@ -0,0 +1,28 @@
+"""
+Backends de almacenamiento
+
+Cada backend es un módulo con la misma interfaz:
+- NAME, PER_THREAD (una conexión por hilo en lugar de un pool compartido)
+- connect(cursorclass, cursor_classes): conexión con la interfaz de PyMySQL
+- translate_ddl(sentencia): sentencias del esquema en su dialecto
+- has_column(cursor, tabla, columna), has_index(cursor, tabla, nombre)
+- table_estimates(cursor, tablas): filas aproximadas sin recorrer las tablas
+- utc_offset(conn): zona horaria de las fechas naive que retorna la BD
+
+Se elige con DATABASE_BACKEND (mysql o sqlite).
+"""
+
+from importlib import import_module
+
+BACKENDS = ('mysql', 'sqlite')
+
+def get_backend(name):
+    """
+    Retorna el módulo del backend
+    
+    Raises:
+        ValueError: Si el backend no existe
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"DATABASE_BACKEND inválido: '{name}' (opciones: {', '.join(BACKENDS)})")
+    return import_module(f"app.backends.{name}")
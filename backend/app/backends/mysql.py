@@ -0,0 +1,76 @@
+"""
+Backend MySQL (PyMySQL)
+Backend por defecto: el esquema y las consultas de la app están
+escritas en su dialecto, así que no hay nada que traducir.
+"""
+
+import pymysql
+from datetime import timedelta
+from app.config import Config
+
+NAME = 'mysql'
+
+# Conexiones compartidas entre hilos a través del pool
+PER_THREAD = False
+
+def translate_ddl(statement):
+    """Las sentencias de scripts/init_db.py ya están en dialecto MySQL"""
+    return [statement]
+
+def has_column(cursor, table, column):
+    """Indica si la tabla tiene la columna"""
+    cursor.execute(
+        """SELECT COUNT(*) AS total FROM information_schema.columns
+           WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s""",
+        (table, column)
+    )
+    return bool(cursor.fetchone()['total'])
+
+def has_index(cursor, table, name):
+    """Indica si la tabla tiene el índice"""
+    cursor.execute(
+        """SELECT COUNT(*) AS total FROM information_schema.statistics
+           WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s""",
+        (table, name)
+    )
+    return bool(cursor.fetchone()['total'])
+
+def table_estimates(cursor, tables):
+    """
+    Filas estimadas de cada tabla según information_schema, sin recorrerlas
+    (InnoDB actualiza la estadística de forma aproximada)
+    
+    Returns:
+        dict: {tabla: filas estimadas} solo de las tablas que existen
+    """
+    marks = ', '.join(['%s'] * len(tables))
+    cursor.execute(
+        f"""SELECT table_name AS name, table_rows AS estimate FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_name IN ({marks})""",
+        tuple(tables)
+    )
+    return {row['name']: row['estimate'] or 0 for row in cursor.fetchall()}
+
+def utc_offset(conn):
+    """
+    Diferencia entre la zona horaria de la sesión y UTC: las columnas
+    TIMESTAMP llegan como fechas naive en la zona de la sesión
+    
+    Returns:
+        timedelta: Hora de la sesión menos UTC
+    """
+    cursor = conn.cursor(pymysql.cursors.Cursor)
+    cursor.execute("SELECT TIMESTAMPDIFF(SECOND, UTC_TIMESTAMP(), NOW())")
+    seconds = cursor.fetchone()[0]
+    cursor.close()
+    return timedelta(seconds=seconds)
+
+def connect(cursorclass, cursor_classes=None):
+    """
+    Abre una conexión nueva con los datos de Config
+    
+    Args:
+        cursorclass: Clase de cursor por defecto
+        cursor_classes: No se usa (las clases de PyMySQL son las nativas)
+    """
+    return pymysql.connect(**Config.get_database_uri(), cursorclass=cursorclass)
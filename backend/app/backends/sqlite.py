@@ -0,0 +1,413 @@
+"""
+Backend SQLite (embebido, sin servidor)
+
+Conexiones sqlite3 con la interfaz de PyMySQL que usa app.database:
+cursores con placeholders %s, filas como tuplas o dicts, errores de
+pymysql.err y transacciones explícitas (autocommit desactivado). El
+dialecto traduce lo que difiere en las consultas (NOW(6), LIKE con
+escapes \\) y en el esquema de scripts/init_db.py (AUTO_INCREMENT,
+índices, ON UPDATE CURRENT_TIMESTAMP, collation _ci).
+
+Modo WAL: los lectores no bloquean al escritor; las escrituras se
+serializan (una a la vez, con espera de SQLITE_BUSY_TIMEOUT_MS).
+"""
+
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+import pymysql
+from pymysql.cursors import DictCursorMixin
+from app.config import Config
+
+NAME = 'sqlite'
+
+# Una conexión por hilo (sqlite3 no comparte conexiones entre hilos)
+PER_THREAD = True
+
+NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+CURRENT_TIMESTAMP_SQL = "datetime('now', 'localtime')"
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter('TIMESTAMP', _parse_datetime)
+sqlite3.register_converter('DATETIME', _parse_datetime)
+sqlite3.register_converter('DECIMAL', lambda value: Decimal(value.decode()))
+
+# Dialecto de consultas
+
+_LIKE_PARAM = re.compile(r"\bLIKE\s+%s(?!\s+ESCAPE)", re.IGNORECASE)
+_NOW = re.compile(r"\b(?:NOW|CURRENT_TIMESTAMP)\(\d?\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s|%%")
+_WRITE = re.compile(r"\s*(?:INSERT|UPDATE|DELETE|REPLACE|CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+def _placeholder(match):
+    if match.group(1):
+        return f":{match.group(1)}"
+    return '?' if match.group(0) == '%s' else '%'
+
+@lru_cache(maxsize=1024)
+def translate(query, formatted=True):
+    """
+    Traduce una consulta del dialecto MySQL usado en la app a SQLite
+    
+    Args:
+        query: Query SQL con placeholders %s o %(nombre)s
+        formatted: Si la consulta lleva parámetros (PyMySQL solo
+                   interpreta %s y %% en ese caso)
+    
+    Returns:
+        str: Query con placeholders ? o :nombre
+    """
+    # En MySQL \ es el escape por defecto de LIKE; en SQLite no hay ninguno
+    query = _LIKE_PARAM.sub(r"LIKE %s ESCAPE '\\'", query)
+    query = _NOW.sub(NOW_SQL, query)
+    if formatted:
+        query = _PLACEHOLDER.sub(_placeholder, query)
+    return query
+
+# Dialecto del esquema
+
+_CREATE_TABLE = re.compile(
+    r"CREATE TABLE (IF NOT EXISTS )?(\w+)\s*\((.*)\)([^)]*)$", re.IGNORECASE | re.DOTALL
+)
+_ADD_COLUMN = re.compile(r"ALTER TABLE (\w+) ADD COLUMN (.+)$", re.IGNORECASE | re.DOTALL)
+_ADD_INDEX = re.compile(r"ALTER TABLE (\w+) ADD (?:INDEX|KEY) (\w+) (\(.+\))$", re.IGNORECASE | re.DOTALL)
+_INDEX = re.compile(r"(?:INDEX|KEY) (\w+) (\(.+\))$", re.IGNORECASE | re.DOTALL)
+_UNIQUE_KEY = re.compile(r"UNIQUE (?:INDEX|KEY) (\w+) (\(.+\))$", re.IGNORECASE | re.DOTALL)
+_AUTO_INCREMENT = re.compile(r"^(\w+) (?:BIG)?INT AUTO_INCREMENT PRIMARY KEY$", re.IGNORECASE)
+_ON_UPDATE = re.compile(r"\s+ON UPDATE CURRENT_TIMESTAMP(?:\(\d\))?", re.IGNORECASE)
+_DEFAULT_NOW = re.compile(r"\bCURRENT_TIMESTAMP(\(\d\))?", re.IGNORECASE)
+_TEXT_TYPE = re.compile(r"^(\w+ (?:VARCHAR|CHAR)\(\d+\)|\w+ TEXT)", re.IGNORECASE)
+
+def _split_definitions(body):
+    """Separa las definiciones de CREATE TABLE por comas de primer nivel"""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+def _on_update_trigger(table, column):
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{column}_on_update AFTER UPDATE ON {table} "
+        f"FOR EACH ROW WHEN NEW.{column} IS OLD.{column} "
+        f"BEGIN UPDATE {table} SET {column} = {NOW_SQL} WHERE id = NEW.id; END"
+    )
+
+def _column(table, definition, case_insensitive):
+    """
+    Traduce la definición de una columna
+    
+    Returns:
+        tuple: (definición, sentencias extra)
+    """
+    match = _AUTO_INCREMENT.match(definition)
+    if match:
+        return f"{match.group(1)} INTEGER PRIMARY KEY AUTOINCREMENT", []
+    
+    extra = []
+    if _ON_UPDATE.search(definition):
+        definition = _ON_UPDATE.sub('', definition)
+        extra.append(_on_update_trigger(table, definition.split()[0]))
+    
+    definition = _DEFAULT_NOW.sub(
+        lambda match: f"({NOW_SQL})" if match.group(1) else f"({CURRENT_TIMESTAMP_SQL})", definition
+    )
+    if case_insensitive:
+        definition = _TEXT_TYPE.sub(r"\1 COLLATE NOCASE", definition)
+    return definition, extra
+
+def translate_ddl(statement):
+    """
+    Traduce una sentencia del esquema MySQL de scripts/init_db.py
+    
+    Los índices declarados dentro de CREATE TABLE pasan a CREATE INDEX y
+    ON UPDATE CURRENT_TIMESTAMP a un trigger. Las tablas con collation
+    _ci comparan texto sin distinguir mayúsculas (COLLATE NOCASE).
+    
+    Returns:
+        list: Sentencias SQLite equivalentes
+    """
+    statement = statement.strip().rstrip(';').strip()
+    
+    match = _ADD_INDEX.match(statement)
+    if match:
+        table, name, columns = match.groups()
+        return [f"CREATE INDEX IF NOT EXISTS {name} ON {table} {columns}"]
+    
+    match = _ADD_COLUMN.match(statement)
+    if match:
+        table, definition = match.groups()
+        definition, extra = _column(table, definition.strip(), False)
+        return [f"ALTER TABLE {table} ADD COLUMN {definition}"] + extra
+    
+    match = _CREATE_TABLE.match(statement)
+    if not match:
+        return [statement]
+    
+    if_not_exists, table, body, options = match.groups()
+    case_insensitive = '_ci' in options.lower()
+    definitions, extra = [], []
+    
+    for definition in _split_definitions(body):
+        unique = _UNIQUE_KEY.match(definition)
+        index = _INDEX.match(definition)
+        if unique:
+            definitions.append(f"CONSTRAINT {unique.group(1)} UNIQUE {unique.group(2)}")
+        elif index:
+            extra.append(f"CREATE INDEX IF NOT EXISTS {index.group(1)} ON {table} {index.group(2)}")
+        elif re.match(r"(?:FOREIGN|PRIMARY) KEY|CONSTRAINT ", definition, re.IGNORECASE):
+            definitions.append(definition)
+        else:
+            column, statements = _column(table, definition, case_insensitive)
+            definitions.append(column)
+            extra.extend(statements)
+    
+    create = f"CREATE TABLE {if_not_exists or ''}{table} (\n    " + ",\n    ".join(definitions) + "\n)"
+    return [create] + extra
+
+def has_column(cursor, table, column):
+    """Indica si la tabla tiene la columna"""
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM pragma_table_info(%s) WHERE name = %s", (table, column)
+    )
+    return bool(cursor.fetchone()['total'])
+
+def has_index(cursor, table, name):
+    """Indica si la tabla tiene el índice"""
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+        (table, name)
+    )
+    return bool(cursor.fetchone()['total'])
+
+def table_estimates(cursor, tables):
+    """
+    Filas de cada tabla sin recorrerla: SQLite no guarda estimaciones
+    (salvo con ANALYZE), así que se usa MAX(id), una búsqueda en la
+    clave primaria (cota superior si hubo eliminaciones)
+    
+    Returns:
+        dict: {tabla: filas estimadas} solo de las tablas que existen
+    """
+    marks = ', '.join(['%s'] * len(tables))
+    cursor.execute(
+        f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({marks})", tuple(tables)
+    )
+    estimates = {}
+    for table in [row['name'] for row in cursor.fetchall()]:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS estimate FROM {table}")
+        estimates[table] = cursor.fetchone()['estimate']
+    return estimates
+
+def utc_offset(conn):
+    """
+    Diferencia entre la hora local y UTC: los valores por defecto y
+    NOW(6) se guardan en la hora local del proceso ('localtime')
+    
+    Returns:
+        timedelta: Hora local menos UTC
+    """
+    return datetime.now().astimezone().utcoffset()
+
+# Conexión y cursores con la interfaz de PyMySQL
+
+def _mysql_error(error):
+    """Convierte un error de sqlite3 en el error equivalente de pymysql"""
+    message = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        code = 1062 if 'UNIQUE' in message else 1452 if 'FOREIGN KEY' in message else 1048
+        return pymysql.err.IntegrityError(code, message)
+    if isinstance(error, sqlite3.OperationalError):
+        code = 1205 if 'locked' in message or 'busy' in message else 1064
+        return pymysql.err.OperationalError(code, message)
+    return pymysql.err.ProgrammingError(0, message)
+
+# Expresiones (MAX(updated_at), NOW(6)...) no tienen tipo declarado y
+# llegan como texto: se convierten solo las columnas con nombre de fecha,
+# por alias o por la expresión sin alias (MAX(updated_at)); el texto de
+# los usuarios nunca cambia de tipo según su contenido
+_TIMESTAMP_COLUMN = re.compile(r"(?:_at|_date)\)?$|^now$", re.IGNORECASE)
+
+def _timestamp(value):
+    if type(value) is str:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+class _Many(list):
+    """Marca los parámetros de executemany al pasar por execute"""
+
+class SQLiteCursor:
+    """Cursor sqlite3 con la interfaz de un Cursor de PyMySQL (filas como tuplas)"""
+    
+    dict_rows = False
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._timestamp_columns = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def execute(self, query, args=None):
+        sql = translate(query, args is not None)
+        
+        try:
+            self.connection.ensure_transaction(sql)
+            if isinstance(args, _Many):
+                self._cursor.executemany(sql, args)
+            else:
+                if args is None:
+                    args = ()
+                elif not isinstance(args, (tuple, list, dict)):
+                    args = (args,)
+                self._cursor.execute(sql, args)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        
+        self.description = self._cursor.description
+        self._timestamp_columns = tuple(
+            index for index, column in enumerate(self.description or ())
+            if _TIMESTAMP_COLUMN.search(column[0])
+        )
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+    
+    def executemany(self, query, args):
+        # Pasa por execute para que los cursores medidos lo cuenten (una vez por lote)
+        return self.execute(query, _Many(tuple(params) if isinstance(params, list) else params
+                                         for params in args))
+    
+    def _rows(self, rows):
+        if self._timestamp_columns:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in self._timestamp_columns:
+                    row[index] = _timestamp(row[index])
+            rows = [tuple(row) for row in rows]
+        if self.dict_rows:
+            names = [column[0] for column in self.description]
+            return [dict(zip(names, row)) for row in rows]
+        return rows
+    
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return None if row is None else self._rows([row])[0]
+    
+    def fetchmany(self, size=None):
+        return self._rows(self._cursor.fetchmany(size or self._cursor.arraysize))
+    
+    def fetchall(self):
+        return self._rows(self._cursor.fetchall())
+    
+    def __iter__(self):
+        return iter(self.fetchone, None)
+    
+    def close(self):
+        self._cursor.close()
+
+class SQLiteDictCursor(SQLiteCursor):
+    """Cursor sqlite3 con filas como dicts (DictCursor de PyMySQL)"""
+    
+    dict_rows = True
+
+class SQLiteConnection:
+    """
+    Conexión sqlite3 con la interfaz de una conexión de PyMySQL
+    
+    Las transacciones empiezan con la primera sentencia (BEGIN IMMEDIATE
+    si escribe, para tomar el bloqueo de escritura de entrada) y terminan
+    con commit o rollback, igual que con autocommit desactivado en MySQL.
+    """
+    
+    def __init__(self, raw, cursorclass, cursor_classes):
+        self.raw = raw
+        self.cursorclass = cursorclass
+        self.cursor_classes = cursor_classes
+        self.open = True
+    
+    def cursor(self, cursor=None):
+        cursor = cursor or self.cursorclass
+        default = SQLiteDictCursor if issubclass(cursor, DictCursorMixin) else SQLiteCursor
+        return self.cursor_classes.get(cursor, default)(self)
+    
+    def ensure_transaction(self, sql):
+        if not self.raw.in_transaction:
+            self.raw.execute('BEGIN IMMEDIATE' if _WRITE.match(sql) else 'BEGIN')
+    
+    def begin(self):
+        if not self.raw.in_transaction:
+            self.raw.execute('BEGIN')
+    
+    def query(self, sql):
+        """Sentencia sin cursor (savepoints); siempre dentro de una transacción"""
+        self.begin()
+        try:
+            self.raw.execute(sql)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+    
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute('COMMIT')
+    
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute('ROLLBACK')
+    
+    def ping(self, reconnect=True):
+        pass
+    
+    def close(self):
+        if self.open:
+            self.open = False
+            self.raw.close()
+
+def connect(cursorclass, cursor_classes=None, path=None):
+    """
+    Abre una conexión al archivo SQLITE_PATH (lo crea si no existe)
+    
+    Args:
+        cursorclass: Clase de cursor de PyMySQL por defecto
+        cursor_classes: {clase de PyMySQL: clase de cursor SQLite} para
+                        resolver las clases que pide app.database
+        path: Archivo de la base de datos (default: Config.SQLITE_PATH)
+    """
+    path = path or Config.SQLITE_PATH
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    
+    raw = sqlite3.connect(
+        path,
+        timeout=Config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        detect_types=sqlite3.PARSE_DECLTYPES
+    )
+    raw.execute("PRAGMA journal_mode = WAL")
+    raw.execute("PRAGMA synchronous = NORMAL")
+    raw.execute("PRAGMA foreign_keys = ON")
+    return SQLiteConnection(raw, cursorclass, cursor_classes or {})
@@ -0,0 +1,293 @@
+"""
+Compresión gzip de respuestas
+Middleware WSGI que negocia Accept-Encoding y comprime respuestas de la API
+y archivos estáticos del frontend
+"""
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from app.metrics import cache_result
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/x-javascript',
+    'application/x-ndjson',
+    'application/xml',
+    'image/svg+xml'
+)
+
+# Tipos que deben entregarse sin buffer (Server-Sent Events)
+EXCLUDED_TYPES = ('text/event-stream',)
+
+ETAG_SUFFIX = '-gzip'
+
+def accepts_gzip(accept_encoding):
+    """
+    Determina si el cliente acepta gzip según Accept-Encoding
+    
+    Args:
+        accept_encoding: Valor del header (puede ser vacío)
+    
+    Returns:
+        bool: True si gzip (o *) tiene q > 0
+    """
+    qualities = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[token] = quality
+    
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+    
+    return qualities.get('*', 0) > 0
+
+def is_compressible(content_type):
+    """Indica si el tipo de contenido se comprime"""
+    mimetype = (content_type or '').split(';')[0].strip().lower()
+    
+    if not mimetype or mimetype in EXCLUDED_TYPES:
+        return False
+    
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+def _strip_etag_suffix(header):
+    """Quita el sufijo -gzip de los ETag de If-None-Match"""
+    return header.replace(ETAG_SUFFIX + '"', '"')
+
+def _add_etag_suffix(etag):
+    """Distingue el ETag de la representación comprimida"""
+    if etag.endswith('"') and not etag.endswith(ETAG_SUFFIX + '"'):
+        return etag[:-1] + ETAG_SUFFIX + '"'
+    return etag
+
+class CompressedCache:
+    """
+    Caché LRU de cuerpos comprimidos, indexada por ruta y ETag del original
+    (solo para archivos estáticos: las respuestas de la API son por usuario)
+    """
+    
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+        cache_result('gzip_static', body is not None)
+        return body
+    
+    def set(self, key, body):
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+class GzipMiddleware:
+    """
+    Middleware WSGI de compresión gzip
+    
+    - Respuestas con Content-Length: se comprimen completas si superan min_size
+    - Respuestas en streaming (sin Content-Length): se comprimen bloque por
+      bloque con Z_SYNC_FLUSH, sin acumular el cuerpo
+    - Se omiten HEAD, códigos sin cuerpo, tipos ya comprimidos o binarios,
+      text/event-stream y respuestas que ya traen Content-Encoding
+    - Los archivos estáticos comprimidos se guardan en caché por ETag
+    """
+    
+    def __init__(self, app, level=6, min_size=1024, cache_entries=128, api_prefix='/api/'):
+        """
+        Args:
+            app: Aplicación WSGI a envolver
+            level: Nivel de compresión (1 = rápido, 9 = máximo)
+            min_size: Tamaño mínimo en bytes para comprimir
+            cache_entries: Archivos estáticos comprimidos a conservar
+            api_prefix: Prefijo de rutas que no se guardan en caché
+        """
+        self.app = app
+        self.level = level
+        self.min_size = min_size
+        self.cache = CompressedCache(cache_entries)
+        self.api_prefix = api_prefix
+    
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+        
+        if not accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING', '')):
+            return self.app(environ, start_response)
+        
+        # El cliente puede tener guardada la representación comprimida
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and ETAG_SUFFIX in if_none_match:
+            environ['HTTP_IF_NONE_MATCH'] = _strip_etag_suffix(if_none_match)
+        
+        captured = {}
+        
+        def capture(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            return captured.setdefault('written', []).append
+        
+        app_iter = self.app(environ, capture)
+        chunks = iter(app_iter)
+        
+        # Flask llama start_response antes de retornar; por si acaso, el
+        # primer bloque obliga a que se haya llamado
+        first = []
+        if 'status' not in captured:
+            first = [chunk for chunk in [next(chunks, None)] if chunk is not None]
+        
+        status = captured['status']
+        headers = captured['headers']
+        exc_info = captured['exc_info']
+        body_prefix = captured.get('written', []) + first
+        
+        header_map = {name.lower(): value for name, value in headers}
+        
+        if not self._should_compress(status, header_map):
+            if status.startswith('304') and if_none_match and ETAG_SUFFIX in if_none_match:
+                headers = self._with_etag_suffix(headers)
+            start_response(status, headers, exc_info)
+            if not body_prefix:
+                return app_iter
+            return self._passthrough(body_prefix, chunks, app_iter)
+        
+        headers = [
+            (name, value) for name, value in headers
+            if name.lower() not in ('content-length', 'vary')
+        ]
+        headers.append(('Vary', self._vary(captured['headers'])))
+        
+        if 'content-length' not in header_map:
+            # Streaming: se comprime a medida que la app produce bloques
+            headers.append(('Content-Encoding', 'gzip'))
+            start_response(status, self._with_etag_suffix(headers), exc_info)
+            return self._stream(body_prefix, chunks, app_iter)
+        
+        cache_key = None
+        path = environ.get('PATH_INFO', '')
+        if 'etag' in header_map and not path.startswith(self.api_prefix):
+            cache_key = (path, header_map['etag'])
+        
+        compressed = self.cache.get(cache_key) if cache_key else None
+        
+        if compressed is None:
+            try:
+                body = b''.join(body_prefix) + b''.join(chunks)
+            finally:
+                self._close(app_iter)
+            
+            if len(body) < self.min_size:
+                headers.append(('Content-Length', str(len(body))))
+                start_response(status, headers, exc_info)
+                return [body]
+            
+            compressed = gzip.compress(body, compresslevel=self.level, mtime=0)
+            if cache_key:
+                self.cache.set(cache_key, compressed)
+        else:
+            # El archivo no se lee: se usa la versión comprimida en caché
+            self._close(app_iter)
+        
+        headers.extend([
+            ('Content-Encoding', 'gzip'),
+            ('Content-Length', str(len(compressed)))
+        ])
+        start_response(status, self._with_etag_suffix(headers), exc_info)
+        return [compressed]
+    
+    def _should_compress(self, status, header_map):
+        """Decide si la respuesta se comprime"""
+        code = int(status.split(' ', 1)[0])
+        if code < 200 or code >= 300 or code in (204, 206):
+            return False
+        
+        if 'content-encoding' in header_map:
+            return False
+        
+        if 'no-transform' in header_map.get('cache-control', ''):
+            return False
+        
+        if not is_compressible(header_map.get('content-type')):
+            return False
+        
+        content_length = header_map.get('content-length')
+        if content_length is not None and int(content_length) < self.min_size:
+            return False
+        
+        return True
+    
+    def _stream(self, body_prefix, chunks, app_iter):
+        """Comprime incrementalmente una respuesta en streaming"""
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        
+        try:
+            for source in (body_prefix, chunks):
+                for chunk in source:
+                    if not chunk:
+                        continue
+                    # SYNC_FLUSH entrega cada bloque al cliente sin esperar más datos
+                    data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                    if data:
+                        yield data
+            yield compressor.flush()
+        finally:
+            self._close(app_iter)
+    
+    def _passthrough(self, body_prefix, chunks, app_iter):
+        """Entrega la respuesta sin cambios"""
+        try:
+            yield from body_prefix
+            yield from chunks
+        finally:
+            self._close(app_iter)
+    
+    @staticmethod
+    def _vary(headers):
+        """Une los headers Vary existentes y agrega Accept-Encoding"""
+        values = [
+            value.strip()
+            for name, header in headers if name.lower() == 'vary'
+            for value in header.split(',') if value.strip()
+        ]
+        if 'accept-encoding' not in (value.lower() for value in values):
+            values.append('Accept-Encoding')
+        return ', '.join(values)
+    
+    @staticmethod
+    def _with_etag_suffix(headers):
+        """Marca el ETag de la representación comprimida"""
+        return [
+            (name, _add_etag_suffix(value) if name.lower() == 'etag' else value)
+            for name, value in headers
+        ]
+    
+    @staticmethod
+    def _close(app_iter):
+        close = getattr(app_iter, 'close', None)
+        if close is not None:
+            close()
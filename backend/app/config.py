@@ -43,7 +43,14 @@ class Config:
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     DEBUG = FLASK_ENV == 'development'
     
-    # Base de Datos
+    # Base de Datos: mysql (servidor) o sqlite (archivo local, sin servicio;
+    # ver app/backends/sqlite.py)
+    DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv(
+        'SQLITE_PATH',
+        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'academic_system.sqlite3'))
+    )
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
     DATABASE_HOST = os.getenv('DATABASE_HOST', 'localhost')
     DATABASE_PORT = int(os.getenv('DATABASE_PORT', 3306))
     DATABASE_USER = os.getenv('DATABASE_USER', 'academic_user')
@@ -63,6 +70,88 @@ class Config:
     # Seguridad
     BCRYPT_ROUNDS = 12
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max
+    # Solo para pruebas de carga locales (scripts/loadtest.py): todas las
+    # peticiones salen de la misma IP
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    
+    # Operaciones masivas
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', 500))
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+    
+    # Importación de usuarios
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    
+    # Compresión de respuestas
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_CACHE_ENTRIES = int(os.getenv('COMPRESSION_CACHE_ENTRIES', 128))
+    
+    # Desglose de tiempos por petición (header Server-Timing y log de accesos)
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    ACCESS_LOG_SLOW_MS = float(os.getenv('ACCESS_LOG_SLOW_MS', 500))
+    
+    # Logging: formato de consola (text o json), archivo con rotación diaria
+    # comprimida (uno por proceso: {pid} se reemplaza por el PID) y fracción
+    # de registros de éxito de alto volumen que se conservan
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text' if DEBUG else 'json')
+    LOG_FILE = os.getenv('LOG_FILE', os.path.join('logs', 'app-{pid}.log'))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 14))
+    LOG_SUCCESS_SAMPLE_RATE = float(os.getenv('LOG_SUCCESS_SAMPLE_RATE', 0.1))
+    
+    # Métricas Prometheus en /metrics (deshabilitadas por defecto: la ruta
+    # no pasa por el rate limiter); con varios workers, carpeta compartida
+    # donde cada proceso escribe su instantánea. METRICS_TOKEN exige
+    # Authorization: Bearer <token> al scraper
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', '')
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    
+    # Presupuestos de consultas por endpoint (app/query_budget.py): con
+    # QUERY_BUDGET_MODE=log se registran las peticiones que los superan o
+    # repiten una misma sentencia QUERY_REPEAT_THRESHOLD veces (N+1)
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off')
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 3))
+    
+    # Trazas por petición (spans en JSON de OTLP, ver scripts/trace_report.py);
+    # {pid}: un archivo por worker
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACING_FILE = os.getenv('TRACING_FILE', os.path.join('logs', 'traces-{pid}.jsonl'))
+    TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', 1.0))
+    TRACING_BATCH_SIZE = int(os.getenv('TRACING_BATCH_SIZE', 512))
+    TRACING_FLUSH_SECONDS = float(os.getenv('TRACING_FLUSH_SECONDS', 5))
+    
+    # Perfilado: X-Profile: 1 (solo admin) guarda un .prof de la petición;
+    # el muestreador continuo escribe pilas .folded cada FLUSH_SECONDS
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    SAMPLING_PROFILER_ENABLED = os.getenv('SAMPLING_PROFILER_ENABLED', 'false').lower() == 'true'
+    SAMPLING_PROFILER_INTERVAL_MS = float(os.getenv('SAMPLING_PROFILER_INTERVAL_MS', 10))
+    SAMPLING_PROFILER_FLUSH_SECONDS = float(os.getenv('SAMPLING_PROFILER_FLUSH_SECONDS', 60))
+    PROFILE_DIR = os.getenv(
+        'PROFILE_DIR',
+        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'profiles'))
+    )
+    
+    # Eventos en tiempo real (SSE); con varios workers, carpeta compartida
+    # donde cada proceso anuncia su puerto UDP local. Cada stream abierto
+    # ocupa un hilo del worker: por encima de EVENTS_MAX_STREAMS por
+    # proceso se responde 503 (0 = sin límite)
+    EVENTS_BRIDGE_DIR = os.getenv('EVENTS_BRIDGE_DIR', '')
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_MAX_STREAMS = int(os.getenv('EVENTS_MAX_STREAMS', 32))
+    
+    # Sondas del balanceador: /healthz no toca la BD; /readyz verifica una
+    # conexión del pool y reutiliza el resultado durante este tiempo
+    READINESS_CACHE_SECONDS = float(os.getenv('READINESS_CACHE_SECONDS', 1))
+    
+    # Archivos estáticos compilados (python scripts/build_assets.py)
+    ASSETS_DIR = os.getenv(
+        'ASSETS_DIR',
+        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'frontend', 'dist'))
+    )
     
     @staticmethod
     def get_database_uri():
@@ -1,22 +1,124 @@
 """
-Módulo de conexión a la base de datos MySQL
-Utiliza PyMySQL con consultas parametrizadas y connection pooling
+Módulo de conexión a la base de datos
+Utiliza PyMySQL con consultas parametrizadas y connection pooling; con
+DATABASE_BACKEND=sqlite, conexiones sqlite3 por hilo con la misma
+interfaz (app/backends/sqlite.py)
 """
 
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import Cursor, DictCursor, SSCursor, SSDictCursor
 from contextlib import contextmanager
 from app.config import Config
+from app.backends import get_backend
+from app.backends.sqlite import SQLiteCursor, SQLiteDictCursor
+from app.metrics import registry, DB_POOL_CONNECTIONS, DB_POOL_WAIT
+import itertools
 import threading
+import time
+import weakref
+
+# Funciones llamadas después de cada consulta: listener(query, segundos)
+_query_listeners = []
+
+def add_query_listener(listener):
+    """
+    Registra una función que se llama después de cada consulta
+    
+    Args:
+        listener: Función (query, segundos); no debe lanzar excepciones
+    """
+    if listener not in _query_listeners:
+        _query_listeners.append(listener)
+
+def remove_query_listener(listener):
+    """Quita una función registrada con add_query_listener"""
+    if listener in _query_listeners:
+        _query_listeners.remove(listener)
+
+def _notify_query(query, started):
+    elapsed = time.perf_counter() - started
+    for listener in _query_listeners:
+        listener(query, elapsed)
+
+class TimedCursorMixin:
+    """
+    Mide cada execute y notifica a los listeners
+    
+    executemany también pasa por aquí (una vez por cada lote enviado).
+    Con cursores sin buffer solo se mide el envío de la consulta, no la
+    lectura de las filas.
+    """
+    
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            _notify_query(query, started)
+
+class TimedCursor(TimedCursorMixin, Cursor):
+    pass
+
+class TimedDictCursor(TimedCursorMixin, DictCursor):
+    pass
+
+class TimedSSCursor(TimedCursorMixin, SSCursor):
+    pass
+
+class TimedSSDictCursor(TimedCursorMixin, SSDictCursor):
+    pass
+
+TIMED_CURSORS = {
+    Cursor: TimedCursor,
+    DictCursor: TimedDictCursor,
+    SSCursor: TimedSSCursor,
+    SSDictCursor: TimedSSDictCursor
+}
+
+class TimedSQLiteCursor(TimedCursorMixin, SQLiteCursor):
+    pass
+
+class TimedSQLiteDictCursor(TimedCursorMixin, SQLiteDictCursor):
+    pass
+
+# Cursor SQLite para cada clase de PyMySQL (sqlite3 lee siempre con buffer)
+SQLITE_CURSORS = {
+    Cursor: SQLiteCursor,
+    DictCursor: SQLiteDictCursor,
+    SSCursor: SQLiteCursor,
+    SSDictCursor: SQLiteDictCursor,
+    TimedCursor: TimedSQLiteCursor,
+    TimedDictCursor: TimedSQLiteDictCursor,
+    TimedSSCursor: TimedSQLiteCursor,
+    TimedSSDictCursor: TimedSQLiteDictCursor
+}
+
+# Backend elegido en Config (mysql o sqlite)
+backend = get_backend(Config.DATABASE_BACKEND)
+
+def _cursor(conn, cursor_class=None):
+    """Abre un cursor de la clase pedida con medición de consultas"""
+    if cursor_class is None:
+        return conn.cursor()
+    return conn.cursor(TIMED_CURSORS.get(cursor_class, cursor_class))
 
 # Pool de conexiones simple
 class ConnectionPool:
     def __init__(self, max_connections=10):
         self.max_connections = max_connections
         self.connections = []
+        self.in_use = 0
         self.lock = threading.Lock()
     
     def get_connection(self):
+        started = time.perf_counter()
+        conn = self._acquire()
+        DB_POOL_WAIT.observe(time.perf_counter() - started)
+        with self.lock:
+            self.in_use += 1
+        return conn
+    
+    def _acquire(self):
         with self.lock:
             # Reutilizar conexión existente
             if self.connections:
@@ -29,13 +131,11 @@ class ConnectionPool:
                     pass
             
             # Crear nueva conexión
-            return pymysql.connect(
-                **Config.get_database_uri(),
-                cursorclass=DictCursor
-            )
+            return backend.connect(TimedDictCursor)
     
     def return_connection(self, conn):
         with self.lock:
+            self.in_use -= 1
             if len(self.connections) < self.max_connections:
                 try:
                     conn.ping(reconnect=True)
@@ -50,27 +150,279 @@ class ConnectionPool:
                     conn.close()
                 except:
                     pass
+    
+    def discard_connection(self, conn):
+        """Cierra una conexión obtenida del pool sin devolverla"""
+        with self.lock:
+            self.in_use -= 1
+        try:
+            conn.close()
+        except:
+            pass
+    
+    def collect_metrics(self):
+        """Actualiza los gauges del pool (idle, in_use, max)"""
+        DB_POOL_CONNECTIONS.set(len(self.connections), state='idle')
+        DB_POOL_CONNECTIONS.set(self.in_use, state='in_use')
+        DB_POOL_CONNECTIONS.set(self.max_connections, state='max')
+
+class ThreadLocalPool:
+    """
+    Una conexión por hilo para backends que no comparten conexiones
+    entre hilos (SQLite)
+    
+    Si el mismo hilo pide otra conexión mientras usa la suya (un stream
+    abierto, una consulta dentro de get_db), recibe una vista con
+    savepoint de la misma conexión.
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+        self.connections = weakref.WeakSet()
+        self.in_use = 0
+        self.lock = threading.Lock()
+    
+    def get_connection(self):
+        local = self.local
+        conn = getattr(local, 'conn', None)
+        
+        if conn is None or not conn.open:
+            conn = local.conn = backend.connect(TimedDictCursor, SQLITE_CURSORS)
+            local.depth = 0
+            self.connections.add(conn)
+        
+        local.depth += 1
+        if local.depth > 1:
+            return SavepointConnection(conn)
+        
+        with self.lock:
+            self.in_use += 1
+        return conn
+    
+    def _release(self):
+        self.local.depth -= 1
+        if not self.local.depth:
+            with self.lock:
+                self.in_use -= 1
+    
+    def return_connection(self, conn):
+        if isinstance(conn, SavepointConnection):
+            conn.close()
+        self._release()
+    
+    def discard_connection(self, conn):
+        """Revierte lo pendiente (la conexión del hilo se conserva)"""
+        conn.rollback()
+        if isinstance(conn, SavepointConnection):
+            conn.close()
+        self._release()
+    
+    def collect_metrics(self):
+        """Actualiza los gauges de conexiones (idle, in_use)"""
+        open_connections = len(self.connections)
+        DB_POOL_CONNECTIONS.set(open_connections - self.in_use, state='idle')
+        DB_POOL_CONNECTIONS.set(self.in_use, state='in_use')
 
 # Pool global
-_pool = ConnectionPool(max_connections=10)
+_pool = ThreadLocalPool() if backend.PER_THREAD else ConnectionPool(max_connections=10)
+registry.on_collect(lambda: _pool.collect_metrics())
+
+# Con una transacción fijada (tests) los cursores sin buffer se cambian por
+# cursores con buffer: en una sola conexión no se pueden intercalar
+# consultas mientras queda un resultado pendiente de leer
+_BUFFERED_CURSORS = {
+    SSCursor: Cursor,
+    SSDictCursor: DictCursor,
+    TimedSSCursor: TimedCursor,
+    TimedSSDictCursor: TimedDictCursor
+}
+
+# Conexión fijada por pinned_transaction (None = usar el pool)
+_pinned = None
+_savepoint_ids = itertools.count(1)
+
+class SavepointConnection:
+    """
+    Vista con savepoint de una conexión en uso: la que entrega
+    get_db_connection mientras hay una transacción fijada (pinned=True)
+    y la de ThreadLocalPool cuando un hilo pide una segunda conexión
+    
+    Cada vista abre su propio savepoint: commit lo libera (y abre otro
+    para lo que siga), rollback revierte hasta él; la transacción la
+    confirma o revierte el dueño de la conexión. Los savepoints se envían
+    sin cursor para no contar como consultas en los listeners.
+    """
+    
+    def __init__(self, conn, pinned=False):
+        self._conn = conn
+        self._name = None
+        self.pinned = pinned
+        self._begin()
+    
+    def _begin(self):
+        self._name = f"sp_{next(_savepoint_ids)}"
+        self._conn.query(f"SAVEPOINT {self._name}")
+    
+    def _release(self):
+        if self._name:
+            self._conn.query(f"RELEASE SAVEPOINT {self._name}")
+            self._name = None
+    
+    def cursor(self, cursor_class=None):
+        if cursor_class is None:
+            return self._conn.cursor()
+        return self._conn.cursor(_BUFFERED_CURSORS.get(cursor_class, cursor_class))
+    
+    def commit(self):
+        self._release()
+        self._begin()
+    
+    def rollback(self):
+        if self._name:
+            self._conn.query(f"ROLLBACK TO SAVEPOINT {self._name}")
+    
+    def ping(self, reconnect=True):
+        pass
+    
+    def close(self):
+        self._release()
+
+@contextmanager
+def pinned_transaction():
+    """
+    Fija una sola conexión para todo el módulo dentro de una transacción
+    que se revierte al salir (aislamiento de tests)
+    
+    Mientras está activa, get_db_connection, get_db, execute_query,
+    execute_many, stream_query y compañía usan esa conexión con un
+    savepoint por operación, así que los commit y rollback del código
+    se comportan igual pero nada queda guardado. Si ya hay una conexión
+    fijada, abre un savepoint y lo revierte al salir.
+    
+    La conexión no es segura entre hilos: pensado para tests que hacen
+    peticiones con app.test_client().
+    
+    Uso: with pinned_transaction(): ...
+    """
+    global _pinned
+    
+    if _pinned is not None:
+        conn = SavepointConnection(_pinned, pinned=True)
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.close()
+        return
+    
+    conn = get_db_connection()
+    conn.begin()
+    _pinned = conn
+    try:
+        yield conn
+    finally:
+        _pinned = None
+        try:
+            conn.rollback()
+        finally:
+            _pool.return_connection(conn)
 
 def get_db_connection():
     """
     Obtiene una conexión del pool
+    
+    Con una transacción fijada (pinned_transaction) retorna una vista
+    con savepoint de la conexión fijada.
     """
+    if _pinned is not None:
+        return SavepointConnection(_pinned, pinned=True)
+    
     try:
         return _pool.get_connection()
     except pymysql.Error as e:
         raise Exception(f"Error al conectar a la base de datos: {str(e)}")
 
+def _return_connection(conn):
+    """Devuelve la conexión al pool (o libera el savepoint si está fijada)"""
+    if getattr(conn, 'pinned', False):
+        conn.close()
+    else:
+        _pool.return_connection(conn)
+
+def _discard_connection(conn):
+    """Cierra la conexión sin devolverla (o revierte el savepoint si está fijada)"""
+    if getattr(conn, 'pinned', False):
+        conn.rollback()
+        conn.close()
+    else:
+        _pool.discard_connection(conn)
+
+def check_connection():
+    """
+    Verifica que el pool entregue una conexión sana (para /readyz)
+    
+    El pool ya hace ping a la conexión que reutiliza; SELECT 1 confirma
+    que el servidor responde consultas. Una conexión que falla se cierra
+    en lugar de volver al pool.
+    
+    Raises:
+        Exception: Si no se puede obtener la conexión o la consulta falla
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+        conn.commit()
+    except Exception:
+        _discard_connection(conn)
+        raise
+    _return_connection(conn)
+
+# Diferencia entre la hora de la BD y UTC, consultada como máximo una vez
+# por hora (cambios de horario de verano)
+UTC_OFFSET_TTL_SECONDS = 3600
+_utc_offset = None
+_utc_offset_expires = 0
+
+def get_db_utc_offset():
+    """
+    Diferencia entre la zona horaria de las fechas naive de la BD y UTC
+    
+    Se consulta con un cursor sin medición, así no cuenta en el
+    presupuesto de consultas de la petición que la actualiza.
+    
+    Returns:
+        timedelta: Hora de la BD menos UTC
+    """
+    global _utc_offset, _utc_offset_expires
+    
+    now = time.monotonic()
+    if _utc_offset is None or now >= _utc_offset_expires:
+        conn = get_db_connection()
+        try:
+            offset = backend.utc_offset(conn)
+            conn.commit()
+        except Exception:
+            _discard_connection(conn)
+            raise
+        _return_connection(conn)
+        _utc_offset, _utc_offset_expires = offset, now + UTC_OFFSET_TTL_SECONDS
+    
+    return _utc_offset
+
 @contextmanager
-def get_db():
+def get_db(cursor_class=None):
     """
     Context manager para manejar conexiones de BD con pool
     Uso: with get_db() as (conn, cursor): ...
+    
+    Args:
+        cursor_class: Clase de cursor (default: DictCursor de la conexión)
     """
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = _cursor(conn, cursor_class)
     try:
         yield conn, cursor
         conn.commit()
@@ -79,7 +431,7 @@ def get_db():
         raise e
     finally:
         cursor.close()
-        _pool.return_connection(conn)
+        _return_connection(conn)
 
 def execute_query(query, params=None, fetch_one=False, fetch_all=True):
     """
@@ -104,17 +456,129 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=True):
         else:
             return cursor.lastrowid
 
-def execute_many(query, params_list):
+def execute_query_columnar(query, params=None):
+    """
+    Ejecuta un SELECT y retorna el resultado en formato columnar
+    
+    Usa un cursor de tuplas: los nombres de columna se envían una sola
+    vez y las filas no se convierten a dict.
+    
+    Args:
+        query: Query SQL con placeholders %s
+        params: Tupla o lista de parámetros
+    
+    Returns:
+        dict: {'columns': [nombres], 'rows': [tuplas]}
+    """
+    with get_db(Cursor) as (conn, cursor):
+        cursor.execute(query, params or ())
+        
+        return {
+            'columns': [column[0] for column in cursor.description],
+            'rows': list(cursor.fetchall())
+        }
+
+def execute_query_rows(query, params=None, model=None, fetch_one=False):
+    """
+    Ejecuta un SELECT con cursor de tuplas y retorna filas del modelo
+    
+    Evita el dict por fila del DictCursor: el mapeo de columnas se
+    resuelve una vez por consulta y cada fila ocupa solo sus __slots__.
+    
+    Args:
+        query: Query SQL con placeholders %s
+        params: Tupla o lista de parámetros
+        model: Subclase de Row (app.models) para las filas
+        fetch_one: Si es True, retorna solo un resultado
+    
+    Returns:
+        list: Instancias del modelo (o una instancia/None con fetch_one)
+    """
+    with get_db(Cursor) as (conn, cursor):
+        cursor.execute(query, params or ())
+        
+        if fetch_one:
+            row = cursor.fetchone()
+            return None if row is None else model.from_cursor(cursor, [row])[0]
+        
+        return model.from_cursor(cursor, cursor.fetchall())
+
+def execute_many(query, params_list, chunk_size=None):
     """
     Ejecuta múltiples inserts/updates de forma eficiente
     
+    PyMySQL agrupa los INSERT ... VALUES en sentencias multi-fila;
+    con chunk_size se limita el número de filas por lote, todo dentro
+    de la misma transacción.
+    
     Args:
         query: Query SQL con placeholders
         params_list: Lista de tuplas de parámetros
+        chunk_size: Filas por lote (None = todas en un solo lote)
         
     Returns:
         Número de filas afectadas
     """
+    params_list = list(params_list)
+    
+    if not params_list:
+        return 0
+    
+    size = chunk_size or len(params_list)
+    
     with get_db() as (conn, cursor):
-        cursor.executemany(query, params_list)
-        return cursor.rowcount
\ No newline at end of file
+        total = 0
+        for start in range(0, len(params_list), size):
+            cursor.executemany(query, params_list[start:start + size])
+            total += cursor.rowcount
+        return total
+
+def stream_query(query, params=None, batch_size=1000, cursor_class=SSDictCursor, model=None):
+    """
+    Ejecuta una consulta con cursor del lado del servidor y entrega
+    las filas a medida que llegan, sin cargar el resultado completo
+    
+    La conexión queda reservada mientras se consume el generador.
+    Si el consumidor abandona la lectura, la conexión se cierra en lugar
+    de devolverse al pool (vaciar el resultado pendiente sería costoso).
+    
+    Args:
+        query: Query SQL con placeholders %s
+        params: Tupla o lista de parámetros
+        batch_size: Filas leídas por cada viaje al servidor
+        cursor_class: Clase de cursor sin buffer a utilizar
+        model: Subclase de Row (app.models); si se indica, se lee con
+               un cursor de tuplas y cada fila se entrega como el modelo
+    
+    Yields:
+        Cada fila del resultado
+    """
+    conn = get_db_connection()
+    cursor = None
+    completed = False
+    
+    try:
+        cursor = _cursor(conn, SSCursor if model else cursor_class)
+        cursor.execute(query, params or ())
+        
+        row_type = None
+        if model:
+            row_type = model.for_columns(column[0] for column in cursor.description)
+        
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            if row_type:
+                rows = map(row_type, rows)
+            for row in rows:
+                yield row
+        
+        completed = True
+    finally:
+        if completed:
+            cursor.close()
+            conn.commit()
+            _return_connection(conn)
+        else:
+            _discard_connection(conn)
\ No newline at end of file
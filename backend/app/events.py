@@ -0,0 +1,290 @@
+"""
+Eventos de cambios en tiempo real
+Pub/sub en proceso para notificar creaciones, cambios y eliminaciones
+de cursos, inscripciones y asignaciones (consumido por /api/events/stream)
+
+Con varios workers, un puente UDP en localhost reenvía cada evento a los
+demás procesos registrados en una carpeta compartida.
+"""
+
+import atexit
+import glob
+import hashlib
+import hmac
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+
+# Ventana de eventos recientes para reanudar con Last-Event-ID
+HISTORY_SIZE = 256
+
+# Eventos pendientes por suscriptor antes de considerarlo desbordado
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Segundos que se reutiliza la lista de workers del puente
+PEERS_REFRESH_SECONDS = 1.0
+
+# Bytes de la firma HMAC-SHA256 al inicio de cada datagrama del puente
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+class Subscription:
+    """Cola de eventos de un cliente conectado"""
+    
+    __slots__ = ('queue', 'overflowed')
+    
+    def __init__(self, size):
+        self.queue = queue.Queue(maxsize=size)
+        self.overflowed = False
+    
+    def get(self, timeout):
+        """
+        Espera el siguiente evento
+        
+        Returns:
+            dict: Evento o None si no llegó ninguno en timeout segundos
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBroker:
+    """
+    Distribuye eventos de cambios entre los clientes conectados
+    
+    Cada evento lleva una versión creciente (microsegundos) que también
+    se usa como id del evento SSE.
+    """
+    
+    def __init__(self, history_size=HISTORY_SIZE, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.history = deque(maxlen=history_size)
+        self.lock = threading.Lock()
+        self.last_version = 0
+        self.bridge = None
+    
+    def _next_version(self):
+        version = max(time.time_ns() // 1000, self.last_version + 1)
+        self.last_version = version
+        return version
+    
+    def publish(self, type_, action, id_, course_id, **extra):
+        """
+        Publica un evento de cambio
+        
+        Args:
+            type_: 'course', 'enrollment' o 'assignment'
+            action: 'created', 'updated' o 'deleted'
+            id_: ID del registro (None si el evento agrupa varios)
+            course_id: Curso al que pertenece el cambio (para filtrar)
+            **extra: Datos adicionales (teacher_id, student_id, count)
+        
+        Returns:
+            dict: Evento publicado
+        """
+        with self.lock:
+            event = {
+                'type': type_,
+                'action': action,
+                'id': id_,
+                'course_id': course_id,
+                'version': self._next_version(),
+                **extra
+            }
+        
+        self.deliver(event)
+        
+        if self.bridge:
+            self.bridge.send(event)
+        
+        return event
+    
+    def deliver(self, event):
+        """Entrega un evento a los suscriptores de este proceso"""
+        with self.lock:
+            self.last_version = max(self.last_version, event['version'])
+            self.history.append(event)
+            subscribers = list(self.subscribers)
+        
+        for subscription in subscribers:
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except queue.Full:
+                # Cliente demasiado lento: se le pedirá recargar todo
+                subscription.overflowed = True
+    
+    def subscribe(self, limit=0):
+        """
+        Registra un nuevo suscriptor
+        
+        Args:
+            limit: Máximo de suscriptores en el proceso (0 = sin límite)
+        
+        Returns:
+            Subscription: Cola del suscriptor (liberar con unsubscribe)
+                          o None si ya se alcanzó el límite
+        """
+        subscription = Subscription(self.queue_size)
+        with self.lock:
+            if limit and len(self.subscribers) >= limit:
+                return None
+            self.subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+    
+    def events_since(self, version):
+        """
+        Eventos recientes posteriores a una versión
+        
+        Returns:
+            list: Eventos o None si la versión ya salió de la ventana
+        """
+        with self.lock:
+            history = list(self.history)
+        
+        # Con la ventana llena, lo anterior al primer evento ya se descartó
+        if len(history) == self.history.maxlen and version < history[0]['version']:
+            return None
+        
+        return [event for event in history if event['version'] > version]
+    
+    def start_bridge(self, directory, secret):
+        """Activa el puente UDP entre workers (idempotente)"""
+        if self.bridge is None:
+            self.bridge = UdpBridge(self, directory, secret)
+        return self.bridge
+
+class UdpBridge:
+    """
+    Puente entre procesos por UDP en localhost
+    
+    Cada worker escucha en un puerto efímero y lo anuncia con un archivo
+    <pid>.port en la carpeta compartida; al publicar se envía un datagrama
+    a cada puerto anunciado.
+    
+    Cualquier proceso local puede enviar a esos puertos: cada datagrama
+    lleva una firma HMAC con la clave compartida (SECRET_KEY) y los que
+    no la traen válida se descartan.
+    """
+    
+    def __init__(self, broker, directory, secret):
+        self.broker = broker
+        self.directory = directory
+        self.key = secret.encode('utf-8') if isinstance(secret, str) else secret
+        os.makedirs(directory, exist_ok=True)
+        
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.peers = []
+        self.peers_loaded_at = 0
+        
+        self.port_file = os.path.join(directory, f"{os.getpid()}.port")
+        with open(self.port_file, 'w') as f:
+            f.write(str(self.port))
+        atexit.register(self.close)
+        
+        thread = threading.Thread(target=self._listen, name='events-bridge', daemon=True)
+        thread.start()
+    
+    def _load_peers(self):
+        now = time.monotonic()
+        if now - self.peers_loaded_at < PEERS_REFRESH_SECONDS:
+            return self.peers
+        
+        peers = []
+        for path in glob.glob(os.path.join(self.directory, '*.port')):
+            if not _owner_alive(path):
+                # Worker terminado sin limpiar (kill -9): se elimina su archivo
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            
+            try:
+                with open(path) as f:
+                    port = int(f.read().strip())
+            except (OSError, ValueError):
+                continue
+            if port != self.port:
+                peers.append(port)
+        
+        self.peers = peers
+        self.peers_loaded_at = now
+        return peers
+    
+    def send(self, event):
+        """Reenvía el evento a los demás workers"""
+        body = json.dumps(event, separators=(',', ':')).encode('utf-8')
+        payload = self._sign(body) + body
+        
+        for port in self._load_peers():
+            try:
+                self.sender.sendto(payload, ('127.0.0.1', port))
+            except OSError:
+                # Worker terminado: su archivo se elimina al recargar la lista
+                pass
+    
+    def _sign(self, body):
+        return hmac.new(self.key, body, hashlib.sha256).digest()
+    
+    def _listen(self):
+        while True:
+            try:
+                payload = self.socket.recv(65535)
+            except OSError:
+                return
+            
+            signature, body = payload[:SIGNATURE_SIZE], payload[SIGNATURE_SIZE:]
+            if not hmac.compare_digest(signature, self._sign(body)):
+                continue
+            
+            try:
+                event = json.loads(body)
+            except ValueError:
+                continue
+            
+            self.broker.deliver(event)
+    
+    def close(self):
+        try:
+            os.remove(self.port_file)
+        except OSError:
+            pass
+        self.socket.close()
+        self.sender.close()
+
+def _owner_alive(path):
+    """Indica si el proceso dueño de un archivo <pid>.port sigue vivo"""
+    try:
+        pid = int(os.path.basename(path).split('.', 1)[0])
+    except ValueError:
+        return False
+    
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# Broker global del proceso
+broker = EventBroker()
+
+def publish_event(type_, action, id_, course_id, **extra):
+    """Publica un evento de cambio en el broker global"""
+    return broker.publish(type_, action, id_, course_id, **extra)
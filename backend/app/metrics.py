@@ -0,0 +1,455 @@
+"""
+Métricas en formato de exposición de Prometheus
+Contadores, gauges e histogramas en memoria, sin dependencias externas
+
+Con varios workers, cada proceso escribe periódicamente una instantánea
+en METRICS_DIR y /metrics suma las de todos los procesos del nodo.
+
+El registro global está deshabilitado hasta init_metrics: sin
+METRICS_ENABLED las métricas no registran nada.
+"""
+
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+from flask import g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class Metric:
+    """Base de las métricas: valores por combinación de etiquetas"""
+    
+    type_name = None
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+        self.registry = None
+    
+    @property
+    def enabled(self):
+        return self.registry is None or self.registry.enabled
+    
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Etiquetas inválidas para {self.name}: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def snapshot(self):
+        """Valores serializables a JSON: [[etiquetas, valor], ...]"""
+        with self.lock:
+            return [[list(key), value] for key, value in self.values.items()]
+
+class Counter(Metric):
+    """Valor que solo aumenta"""
+    
+    type_name = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    """Valor que sube y baja (en multi-proceso se suman los procesos vivos)"""
+    
+    type_name = 'gauge'
+    
+    def set(self, value, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+    
+    def inc(self, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+    
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(Metric):
+    """Distribución de observaciones en buckets acumulativos"""
+    
+    type_name = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                # Conteo por bucket (no acumulado), +Inf al final, y suma
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            state[0][index] += 1
+            state[1] += value
+    
+    def snapshot(self):
+        with self.lock:
+            return [[list(key), [list(counts), total]] for key, (counts, total) in self.values.items()]
+
+class Registry:
+    """Conjunto de métricas de la aplicación"""
+    
+    def __init__(self, enabled=True):
+        self.metrics = {}
+        self.collectors = []
+        self.directory = None
+        self.enabled = enabled
+    
+    def register(self, metric):
+        metric.registry = self
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def on_collect(self, callback):
+        """Registra una función que actualiza gauges antes de cada lectura"""
+        self.collectors.append(callback)
+    
+    def snapshot(self):
+        """
+        Instantánea del proceso actual
+        
+        Returns:
+            dict: {nombre: valores} serializable a JSON
+        """
+        for callback in self.collectors:
+            callback()
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+    
+    # Multi-proceso
+    
+    def enable_multiprocess(self, directory, flush_seconds=5):
+        """
+        Escribe la instantánea del proceso en directory cada flush_seconds
+        
+        Args:
+            directory: Carpeta compartida por los workers del nodo
+            flush_seconds: Intervalo de escritura
+        """
+        if self.directory is not None:
+            return
+        
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        
+        def flush_loop():
+            while True:
+                time.sleep(flush_seconds)
+                self.flush()
+        
+        threading.Thread(target=flush_loop, name='metrics-flush', daemon=True).start()
+        atexit.register(self.flush)
+    
+    @property
+    def snapshot_name(self):
+        """
+        Archivo de la instantánea del proceso: PID y hora de inicio, para
+        que un worker nuevo que reutiliza el PID de uno terminado no
+        sobrescriba su instantánea
+        """
+        pid = os.getpid()
+        return f"metrics_{pid}_{_process_start(pid) or 0}.json"
+    
+    def flush(self):
+        """Escribe la instantánea del proceso (reemplazo atómico)"""
+        if self.directory is None:
+            return
+        
+        path = os.path.join(self.directory, self.snapshot_name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    
+    def collect(self):
+        """
+        Valores de todo el nodo
+        
+        Contadores e histogramas suman también los procesos terminados
+        (no deben retroceder); los gauges solo los procesos vivos.
+        
+        Returns:
+            dict: {nombre: {etiquetas: valor}}
+        """
+        if self.directory is None:
+            return self._merge([(True, self.snapshot())])
+        
+        # fcntl solo existe en POSIX: se importa solo en modo multi-proceso
+        import fcntl
+        
+        self.flush()
+        
+        # Un solo proceso a la vez archiva y lee, para no contar dos veces
+        # una instantánea que otro worker está archivando
+        with open(os.path.join(self.directory, 'archive.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._archive_dead_snapshots()
+            snapshots = [(False, _read_snapshot(os.path.join(self.directory, ARCHIVE_FILE)) or {})]
+            for path in glob.glob(os.path.join(self.directory, 'metrics_*.json')):
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    snapshots.append((True, snapshot))
+        
+        return self._merge(snapshots)
+    
+    def _archive_dead_snapshots(self):
+        """
+        Suma las instantáneas de procesos terminados al archivo acumulado
+        y las elimina (sus gauges se descartan)
+        """
+        archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+        dead = [
+            path for path in glob.glob(os.path.join(self.directory, 'metrics_*.json'))
+            if not _process_alive(*_snapshot_owner(path))
+        ]
+        if not dead:
+            return
+        
+        snapshots = [(False, _read_snapshot(archive_path) or {})]
+        snapshots.extend((False, _read_snapshot(path) or {}) for path in dead)
+        archive = {
+            name: [[list(key), list(value) if isinstance(value, tuple) else value]
+                   for key, value in values.items()]
+            for name, values in self._merge(snapshots).items()
+            if values
+        }
+        
+        tmp_path = archive_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(archive, f, separators=(',', ':'))
+        os.replace(tmp_path, archive_path)
+        
+        for path in dead:
+            os.remove(path)
+    
+    def _merge(self, snapshots):
+        """Suma instantáneas [(proceso vivo, instantánea)] por métrica y etiquetas"""
+        merged = {name: {} for name in self.metrics}
+        for alive, snapshot in snapshots:
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.type_name == 'gauge' and not alive):
+                    continue
+                target = merged[name]
+                for labels, value in values:
+                    key = tuple(labels)
+                    if metric.type_name == 'histogram':
+                        counts, total = target.get(key, ([0] * len(value[0]), 0.0))
+                        target[key] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+                    else:
+                        target[key] = target.get(key, 0) + value
+        return merged
+    
+    def render(self):
+        """
+        Texto en formato de exposición de Prometheus
+        
+        Returns:
+            str: Métricas de todo el nodo
+        """
+        merged = self.collect()
+        lines = []
+        
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            
+            for key, value in sorted(merged[name].items()):
+                labels = list(zip(metric.labelnames, key))
+                
+                if metric.type_name != 'histogram':
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (math.inf,), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        
+        return '\n'.join(lines) + '\n'
+
+# Contadores e histogramas acumulados de los procesos terminados
+ARCHIVE_FILE = 'archive.json'
+
+def _read_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _snapshot_owner(path):
+    """(pid, hora de inicio) del nombre metrics_<pid>_<inicio>.json"""
+    parts = os.path.basename(path)[len('metrics_'):-len('.json')].split('_')
+    return int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
+
+def _process_start(pid):
+    """Hora de inicio del proceso en ticks desde el arranque (Linux) o None"""
+    try:
+        with open(f'/proc/{pid}/stat', encoding='utf-8') as f:
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _process_alive(pid, start=0):
+    if pid == os.getpid():
+        return not start or start == (_process_start(pid) or start)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    # Mismo PID pero otro proceso: el PID se reutilizó
+    return not start or start == (_process_start(pid) or start)
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+# Registro global y métricas de la aplicación (habilitado por init_metrics)
+registry = Registry(enabled=False)
+
+REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds',
+    'Duración de las peticiones HTTP',
+    ('blueprint', 'route', 'method')
+)
+REQUESTS_TOTAL = registry.counter(
+    'http_requests_total',
+    'Peticiones HTTP por código de estado',
+    ('blueprint', 'route', 'method', 'status')
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    'http_requests_in_flight',
+    'Peticiones HTTP en curso'
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    'db_pool_connections',
+    'Conexiones del pool por estado',
+    ('state',)
+)
+DB_POOL_WAIT = registry.histogram(
+    'db_pool_wait_seconds',
+    'Tiempo para obtener una conexión del pool',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+)
+CACHE_REQUESTS = registry.counter(
+    'cache_requests_total',
+    'Consultas a cachés (hit o miss)',
+    ('cache', 'result')
+)
+PASSWORD_HASH_QUEUE = registry.gauge(
+    'password_hash_queue_depth',
+    'Contraseñas pendientes en el pool de hashing bcrypt'
+)
+RATE_LIMITED = registry.counter(
+    'rate_limit_rejections_total',
+    'Peticiones rechazadas por el rate limiter',
+    ('blueprint', 'route')
+)
+
+def cache_result(cache, hit):
+    """Cuenta un hit o miss de la caché indicada"""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def rate_limited():
+    """Cuenta una petición rechazada por el rate limiter"""
+    blueprint, route = request_labels()
+    RATE_LIMITED.inc(blueprint=blueprint, route=route)
+
+def init_metrics(app):
+    """
+    Registra la instrumentación de peticiones en la aplicación
+    
+    Las rutas se etiquetan con la regla (/api/courses/<int:course_id>),
+    no con la URL, para acotar la cardinalidad; sin regla, 'unmatched'.
+    """
+    registry.enabled = True
+    
+    if app.config['METRICS_DIR']:
+        registry.enable_multiprocess(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_SECONDS'])
+    
+    def start_request():
+        g._metrics_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+    
+    def record_request(response):
+        started = g.get('_metrics_started')
+        if started is not None:
+            blueprint, route = request_labels()
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                blueprint=blueprint, route=route, method=request.method
+            )
+            REQUESTS_TOTAL.inc(
+                blueprint=blueprint, route=route, method=request.method,
+                status=response.status_code
+            )
+        return response
+    
+    def end_request(error=None):
+        if g.pop('_metrics_started', None) is not None:
+            REQUESTS_IN_FLIGHT.dec()
+    
+    app.before_request_funcs.setdefault(None, []).insert(0, start_request)
+    app.after_request(record_request)
+    app.teardown_request(end_request)
+
+def request_labels():
+    """
+    Etiquetas blueprint y route de la petición en curso
+    
+    Returns:
+        tuple: (blueprint, route)
+    """
+    rule = request.url_rule
+    return request.blueprint or '', rule.rule if rule is not None else 'unmatched'
@@ -0,0 +1,147 @@
+"""
+Modelos de filas
+Tipos ligeros con __slots__ para leer filas desde cursores de tuplas,
+sin crear un dict por fila
+"""
+
+import keyword
+from flask.json.provider import DefaultJSONProvider
+
+class Row:
+    """
+    Fila con atributos en __slots__ leída desde un cursor de tuplas
+    
+    Cada modelo genera (y guarda en caché) una subclase por conjunto de
+    columnas de la consulta, de modo que el mapeo columna -> posición se
+    resuelve una sola vez por consulta y no por fila.
+    
+    Soporta acceso por atributo (row.id) y por llave (row['id']) para que
+    el código que trabajaba con dicts siga funcionando.
+    """
+    
+    __slots__ = ()
+    _fields = ()
+    _types = None
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+    
+    def keys(self):
+        return self._fields
+    
+    def _asdict(self):
+        """Convierte la fila en dict (para serializar)"""
+        return {field: getattr(self, field) for field in self._fields}
+    
+    def __iter__(self):
+        return iter(self._fields)
+    
+    def __len__(self):
+        return len(self._fields)
+    
+    def __contains__(self, key):
+        return key in self._fields
+    
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            other = other._asdict()
+        return self._asdict() == other
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        values = ', '.join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+    
+    @classmethod
+    def for_columns(cls, columns):
+        """
+        Obtiene la subclase del modelo para las columnas de una consulta
+        
+        Args:
+            columns: Nombres de columna en el orden del cursor
+        
+        Returns:
+            type: Subclase con __slots__ = columnas
+        Raises:
+            ValueError: Si algún nombre no es un identificador válido
+        """
+        columns = tuple(columns)
+        
+        # Caché propia de cada modelo (no heredada de Row)
+        if cls.__dict__.get('_types') is None:
+            cls._types = {}
+        
+        row_type = cls._types.get(columns)
+        if row_type is None:
+            row_type = cls._build_type(columns)
+            cls._types[columns] = row_type
+        
+        return row_type
+    
+    @classmethod
+    def _build_type(cls, columns):
+        """Crea la subclase con un __init__ que desempaqueta la tupla"""
+        for column in columns:
+            if not column.isidentifier() or keyword.iskeyword(column) or column.startswith('_'):
+                raise ValueError(f"Nombre de columna inválido para un modelo: {column}")
+        
+        # Igual que namedtuple: un __init__ generado asigna todas las
+        # columnas con un solo desempaquetado, sin ciclos por fila
+        targets = ''.join(f"self.{column}, " for column in columns)
+        source = f"def __init__(self, values):\n    {targets or '_'} = values\n"
+        namespace = {}
+        exec(source, namespace)
+        
+        return type(cls.__name__, (cls,), {
+            '__slots__': columns,
+            '_fields': columns,
+            '__init__': namespace['__init__'],
+            '__module__': cls.__module__
+        })
+    
+    @classmethod
+    def from_cursor(cls, cursor, rows):
+        """
+        Convierte filas de un cursor de tuplas en instancias del modelo
+        
+        Args:
+            cursor: Cursor ejecutado (se usa cursor.description)
+            rows: Tuplas obtenidas del cursor
+        
+        Returns:
+            list: Instancias del modelo
+        """
+        row_type = cls.for_columns(column[0] for column in cursor.description)
+        return list(map(row_type, rows))
+
+class CourseRow(Row):
+    """Fila de curso"""
+    __slots__ = ()
+
+class AssignmentRow(Row):
+    """Fila de asignación"""
+    __slots__ = ()
+
+class UserRow(Row):
+    """Fila de usuario"""
+    __slots__ = ()
+
+class EnrollmentRow(Row):
+    """Fila de inscripción"""
+    __slots__ = ()
+
+class RowJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON de Flask que serializa las filas como objetos"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, Row):
+            return o._asdict()
+        return DefaultJSONProvider.default(o)
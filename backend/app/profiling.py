@@ -0,0 +1,205 @@
+"""
+Perfilado de la aplicación
+- Bajo demanda: un administrador envía X-Profile: 1 y la petición se
+  perfila con cProfile (archivo .prof para pstats / snakeviz)
+- Continuo: un hilo muestrea las pilas de los hilos que atienden
+  peticiones con sys._current_frames y las agrega en formato "collapsed"
+  (.folded) listo para flamegraph.pl o speedscope
+"""
+
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+from app.auth import authenticate, get_token_from_header
+from logger import app_logger
+
+profile_logger = app_logger.getChild('profile')
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_FILE_HEADER = 'X-Profile-File'
+
+# cProfile es uno por intérprete (Python 3.12+) y además registra todos
+# los hilos: solo una petición se perfila a la vez
+_profile_lock = threading.Lock()
+
+def _safe_name(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', value or 'unmatched')
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def collapse_stack(frame):
+    """
+    Convierte una pila en una línea del formato collapsed (raíz primero)
+    
+    Args:
+        frame: Frame superior de la pila
+    
+    Returns:
+        str: p. ej. 'wsgi_app (app.py:1) ;...;sanitize_string (validators.py:10)'
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+class StackSampler:
+    """
+    Muestreador de pilas de bajo costo
+    
+    Solo se muestrean los hilos marcados con track() (los que están
+    atendiendo una petición), así los workers ociosos no llenan el perfil.
+    Cada flush_seconds las muestras acumuladas se escriben en un archivo
+    .folded nuevo y se reinician.
+    """
+    
+    def __init__(self, directory, interval=0.01, flush_seconds=60):
+        self.directory = directory
+        self.interval = interval
+        self.flush_seconds = flush_seconds
+        self.samples = Counter()
+        self.active = set()
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    def track(self, thread_id):
+        self.active.add(thread_id)
+    
+    def untrack(self, thread_id):
+        self.active.discard(thread_id)
+    
+    def start(self):
+        if self.thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self.thread.start()
+    
+    def sample(self):
+        """Toma una muestra de los hilos activos"""
+        active = self.active
+        if not active:
+            return
+        
+        frames = sys._current_frames()
+        with self.lock:
+            for thread_id in tuple(active):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[collapse_stack(frame)] += 1
+    
+    def flush(self):
+        """
+        Escribe las muestras acumuladas y las reinicia
+        
+        Returns:
+            str: Ruta del archivo o None si no había muestras
+        """
+        with self.lock:
+            samples, self.samples = self.samples, Counter()
+        
+        if not samples:
+            return None
+        
+        path = os.path.join(
+            self.directory,
+            f"stacks-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded"
+        )
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+    
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_seconds
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+                if time.monotonic() >= next_flush:
+                    next_flush = time.monotonic() + self.flush_seconds
+                    self.flush()
+            except Exception:
+                profile_logger.exception("Error en el muestreador de pilas")
+
+def _is_admin_request():
+    """Autentica el token de la petición y verifica que sea de un admin"""
+    if authenticate(get_token_from_header()) is not None:
+        return False
+    return g.current_user.get('role_name') == 'admin'
+
+def init_profiling(app):
+    """
+    Registra el perfilado bajo demanda y, si está habilitado, el muestreador
+    
+    Con X-Profile de un usuario que no es admin, o mientras se perfila
+    otra petición, la petición se atiende normalmente, sin perfilar.
+    """
+    directory = app.config['PROFILE_DIR']
+    profile_requests = app.config['PROFILING_ENABLED']
+    sampler = None
+    
+    if app.config['SAMPLING_PROFILER_ENABLED']:
+        sampler = StackSampler(
+            directory,
+            interval=app.config['SAMPLING_PROFILER_INTERVAL_MS'] / 1000,
+            flush_seconds=app.config['SAMPLING_PROFILER_FLUSH_SECONDS']
+        )
+        sampler.start()
+        app.extensions['stack_sampler'] = sampler
+    
+    def start_profile():
+        # Las conexiones SSE pasan casi todo el tiempo esperando eventos
+        if sampler is not None and request.headers.get('Accept') != 'text/event-stream':
+            sampler.track(threading.get_ident())
+        
+        if profile_requests and request.headers.get(PROFILE_HEADER) == '1' and _is_admin_request():
+            if not _profile_lock.acquire(blocking=False):
+                profile_logger.info("Perfil omitido: ya se está perfilando otra petición")
+                return
+            profiler = cProfile.Profile()
+            g._profiler = profiler
+            try:
+                profiler.enable()
+            except ValueError:
+                # Otra herramienta de perfilado ya está activa
+                g.pop('_profiler')
+                _profile_lock.release()
+    
+    def finish_profile(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+        
+        profiler.disable()
+        _profile_lock.release()
+        os.makedirs(directory, exist_ok=True)
+        filename = (
+            f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-"
+            f"{request.method}-{_safe_name(request.endpoint)}.prof"
+        )
+        profiler.dump_stats(os.path.join(directory, filename))
+        profile_logger.info(f"Perfil guardado: {filename}")
+        
+        response.headers[PROFILE_FILE_HEADER] = filename
+        return response
+    
+    def end_request(error=None):
+        profiler = g.pop('_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+        if sampler is not None:
+            sampler.untrack(threading.get_ident())
+    
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
+    app.teardown_request(end_request)
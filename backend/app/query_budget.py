@@ -0,0 +1,191 @@
+"""
+Presupuestos de consultas por endpoint y detección de N+1
+
+Cuenta las sentencias ejecutadas a través de app/database.py:
+- En los tests, assert_max_queries falla mostrando el SQL capturado
+- En producción (QUERY_BUDGET_MODE=log), se registran las peticiones que
+  superan el presupuesto de su endpoint o repiten la misma sentencia
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from app.config import Config
+from app.database import add_query_listener, remove_query_listener
+from logger import app_logger
+
+budget_logger = app_logger.getChild('query_budget')
+
+# Máximo de sentencias por endpoint, incluida la autenticación (1) y la
+# versión de los GET condicionales (1). Si un cambio necesita más, subir
+# el presupuesto aquí de forma explícita. La importación de usuarios no
+# tiene presupuesto: sus consultas crecen con la cantidad de lotes.
+QUERY_BUDGETS = {
+    'auth.login': 1,
+    'auth.register': 3,
+    'users.get_users': 3,
+    'users.get_user': 2,
+    'users.create_user': 5,
+    'users.update_user': 6,
+    'users.delete_user': 3,
+    'users.change_password': 3,
+    'courses.get_courses': 4,
+    'courses.get_course': 4,
+    'courses.create_course': 5,
+    'courses.update_course': 6,
+    'courses.delete_course': 6,
+    'courses.enroll_student': 5,
+    'courses.get_enrolled_students': 5,
+    'assignments.get_all_assignments': 4,
+    'assignments.get_course_assignments': 5,
+    'assignments.get_assignment': 4,
+    'assignments.create_assignment': 5,
+    'assignments.update_assignment': 5,
+    'assignments.delete_assignment': 5,
+    'assignments.bulk_create_assignments': 4,
+    'assignments.clone_course_assignments': 4,
+    'sync.sync': 6
+}
+
+def _normalize(query):
+    return ' '.join(query.split())
+
+def repeated_statements(statements, threshold=None):
+    """
+    Sentencias idénticas (mismo SQL, cualquier parámetro) repetidas
+    
+    Args:
+        statements: Sentencias normalizadas
+        threshold: Repeticiones que se marcan (default: Config.QUERY_REPEAT_THRESHOLD)
+    
+    Returns:
+        list: [(sentencia, veces)] con veces >= threshold
+    """
+    threshold = threshold or Config.QUERY_REPEAT_THRESHOLD
+    return [
+        (statement, count)
+        for statement, count in Counter(statements).most_common()
+        if count >= threshold
+    ]
+
+def format_statements(statements):
+    """Lista numerada de sentencias para mensajes de error y logs"""
+    return '\n'.join(f"  {index}. {statement}" for index, statement in enumerate(statements, 1))
+
+class QueryCapture:
+    """
+    Registra las sentencias ejecutadas mientras está activo
+    
+    El listener es global: en un servidor con hilos también vería las
+    consultas de otras peticiones, por eso en producción se usa el
+    registro por petición de init_query_budgets.
+    
+    Uso:
+        with QueryCapture() as capture:
+            client.get('/api/courses')
+        capture.statements
+    """
+    
+    def __init__(self):
+        self.statements = []
+    
+    def __enter__(self):
+        add_query_listener(self._record)
+        return self
+    
+    def __exit__(self, *exc_info):
+        remove_query_listener(self._record)
+        return False
+    
+    def _record(self, query, seconds):
+        self.statements.append(_normalize(query))
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def repeated(self, threshold=None):
+        return repeated_statements(self.statements, threshold)
+
+@contextmanager
+def assert_max_queries(limit, label='', repeat_threshold=None):
+    """
+    Falla si el bloque ejecuta más de limit sentencias
+    
+    Args:
+        limit: Máximo de sentencias permitidas
+        label: Descripción para el mensaje (p. ej. 'GET /api/courses')
+        repeat_threshold: Si se indica, también falla cuando una misma
+                          sentencia se repite esa cantidad de veces (N+1)
+    
+    Raises:
+        AssertionError: Con el SQL capturado
+    """
+    with QueryCapture() as capture:
+        yield capture
+    
+    problems = []
+    if capture.count > limit:
+        problems.append(f"{capture.count} consultas (presupuesto: {limit})")
+    if repeat_threshold:
+        for statement, count in capture.repeated(repeat_threshold):
+            problems.append(f"sentencia repetida {count} veces (posible N+1): {statement}")
+    
+    if problems:
+        raise AssertionError(
+            f"{label or 'Bloque'}: " + '; '.join(problems) +
+            "\nSQL capturado:\n" + format_statements(capture.statements)
+        )
+
+def _record_request_query(query, seconds):
+    if not has_request_context():
+        return
+    statements = g.get('_query_log')
+    if statements is not None:
+        statements.append(_normalize(query))
+
+def init_query_budgets(app, budgets=None):
+    """
+    Registra en el log las peticiones que superan su presupuesto o
+    repiten una sentencia QUERY_REPEAT_THRESHOLD veces o más
+    
+    Args:
+        app: Aplicación Flask
+        budgets: Presupuestos por endpoint (default: QUERY_BUDGETS)
+    """
+    budgets = QUERY_BUDGETS if budgets is None else budgets
+    threshold = app.config['QUERY_REPEAT_THRESHOLD']
+    add_query_listener(_record_request_query)
+    
+    def start_query_log():
+        g._query_log = []
+    
+    def check_query_log(response):
+        statements = g.pop('_query_log', None)
+        if not statements:
+            return response
+        
+        budget = budgets.get(request.endpoint)
+        if budget is not None and len(statements) > budget:
+            budget_logger.warning(
+                "%s %s: %d consultas (presupuesto: %d)\n%s",
+                request.method, request.path, len(statements), budget,
+                format_statements(statements),
+                extra={'fields': {
+                    'endpoint': request.endpoint,
+                    'queries': len(statements),
+                    'budget': budget
+                }}
+            )
+        
+        for statement, count in repeated_statements(statements, threshold):
+            budget_logger.warning(
+                "%s %s: sentencia repetida %d veces (posible N+1): %s",
+                request.method, request.path, count, statement,
+                extra={'fields': {'endpoint': request.endpoint, 'repeated': count}}
+            )
+        
+        return response
+    
+    app.before_request_funcs.setdefault(None, []).insert(0, start_query_log)
+    app.after_request(check_query_log)
@@ -6,10 +6,20 @@ from app.routes.auth_routes import auth_bp
 from app.routes.user_routes import user_bp
 from app.routes.course_routes import course_bp
 from app.routes.assignment_routes import assignment_bp
+from app.routes.export_routes import export_bp
+from app.routes.event_routes import event_bp
+from app.routes.sync_routes import sync_bp
+from app.routes.health_routes import health_bp
+from app.routes.metrics_routes import metrics_bp
 
 __all__ = [
     'auth_bp',
     'user_bp',
     'course_bp',
-    'assignment_bp'
+    'assignment_bp',
+    'export_bp',
+    'event_bp',
+    'sync_bp',
+    'health_bp',
+    'metrics_bp'
 ]
\ No newline at end of file
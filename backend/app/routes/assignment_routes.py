@@ -12,14 +12,18 @@ from app.utils.responses import (
     success_response, 
     error_response, 
     created_response,
-    not_found_response
+    not_found_response,
+    is_columnar_request
 )
+from app.utils.conditional import conditional
+from app.utils.pagination import parse_keyset_args
 from app.utils.validators import sanitize_string
 
 assignment_bp = Blueprint('assignments', __name__, url_prefix='/api')
 
 @assignment_bp.route('/assignments', methods=['GET'])
 @token_required
+@conditional(AssignmentService.get_assignments_version)
 def get_all_assignments():
     """
     GET /api/assignments
@@ -28,6 +32,7 @@ def get_all_assignments():
     Query params:
         - page: número de página (default: 1)
         - limit: asignaciones por página (default: 50)
+        - format: columns para la respuesta columnar (opcional)
     """
     try:
         page = int(request.args.get('page', 1))
@@ -42,7 +47,8 @@ def get_all_assignments():
             user_id=current_user['id'],
             role_name=current_user['role_name'],
             page=page,
-            limit=limit
+            limit=limit,
+            columnar=is_columnar_request()
         )
         
         return success_response(result, "Asignaciones obtenidas exitosamente")
@@ -52,24 +58,38 @@ def get_all_assignments():
 
 @assignment_bp.route('/courses/<int:course_id>/assignments', methods=['GET'])
 @token_required
+@conditional(AssignmentService.get_course_assignments_version)
 def get_course_assignments(course_id):
     """
     GET /api/courses/<id>/assignments
-    Lista asignaciones de un curso específico
+    Lista asignaciones de un curso específico, paginadas por cursor
+    
+    Query params:
+        - limit: asignaciones por página (default: 50, máximo: 500)
+        - sort: due_date | created_at | title (default: due_date)
+        - order: asc | desc (default: asc)
+        - cursor: next_cursor de la página anterior
+        - format: columns para la respuesta columnar (opcional)
     """
     try:
+        try:
+            page_args = parse_keyset_args(
+                request.args, AssignmentService.ASSIGNMENT_SORTS, 'due_date', 'asc'
+            )
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
         current_user = g.current_user
         
-        assignments = AssignmentService.get_assignments_by_course(
+        result = AssignmentService.get_assignments_by_course(
             course_id,
             user_id=current_user['id'],
-            role_name=current_user['role_name']
+            role_name=current_user['role_name'],
+            columnar=is_columnar_request(),
+            **page_args
         )
         
-        return success_response(
-            {'assignments': assignments},
-            "Asignaciones obtenidas exitosamente"
-        )
+        return success_response(result, "Asignaciones obtenidas exitosamente")
         
     except ValueError as e:
         return error_response(str(e), 403)
@@ -78,6 +98,7 @@ def get_course_assignments(course_id):
 
 @assignment_bp.route('/assignments/<int:assignment_id>', methods=['GET'])
 @token_required
+@conditional(AssignmentService.get_assignment_version, last_modified=True)
 def get_assignment(assignment_id):
     """
     GET /api/assignments/<id>
@@ -165,6 +186,102 @@ def create_assignment():
     except Exception as e:
         return error_response(f"Error al crear asignación: {str(e)}", 500)
 
+@assignment_bp.route('/assignments/bulk', methods=['POST'])
+@token_required
+@role_required('admin', 'teacher')
+def bulk_create_assignments():
+    """
+    POST /api/assignments/bulk
+    Crea varias asignaciones en una sola petición
+    
+    Body:
+        {
+            "assignments": [
+                {
+                    "title": "string",
+                    "course_id": int,
+                    "description": "string" (opcional),
+                    "due_date": "YYYY-MM-DD HH:MM:SS" (opcional),
+                    "max_score": float (opcional, default: 100.0)
+                },
+                ...
+            ]
+        }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('assignments'), list):
+            return error_response("Campo requerido: assignments (lista)", 400)
+        
+        assignments = []
+        for item in data['assignments']:
+            if isinstance(item, dict):
+                item = dict(item)
+                item['title'] = sanitize_string(item.get('title', ''))
+                item['description'] = sanitize_string(item.get('description', ''))
+            assignments.append(item)
+        
+        current_user = g.current_user
+        
+        result = AssignmentService.bulk_create_assignments(
+            assignments,
+            user_id=current_user['id'],
+            role_name=current_user['role_name']
+        )
+        
+        return created_response(result, "Asignaciones creadas exitosamente")
+    
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Error al crear asignaciones: {str(e)}", 500)
+
+@assignment_bp.route('/courses/<int:course_id>/assignments/clone', methods=['POST'])
+@token_required
+@role_required('admin', 'teacher')
+def clone_course_assignments(course_id):
+    """
+    POST /api/courses/<id>/assignments/clone
+    Copia las asignaciones del curso a otros cursos
+    
+    Body:
+        {
+            "target_course_ids": [int, ...],
+            "due_date_offset_days": int (opcional, default: 0)
+        }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('target_course_ids'), list):
+            return error_response("Campo requerido: target_course_ids (lista)", 400)
+        
+        offset_days = data.get('due_date_offset_days', 0)
+        if not isinstance(offset_days, int) or isinstance(offset_days, bool):
+            return error_response("due_date_offset_days debe ser un entero", 400)
+        
+        current_user = g.current_user
+        
+        result = AssignmentService.clone_course_assignments(
+            course_id,
+            data['target_course_ids'],
+            due_date_offset_days=offset_days,
+            user_id=current_user['id'],
+            role_name=current_user['role_name']
+        )
+        
+        return created_response(result, "Asignaciones copiadas exitosamente")
+    
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Error al copiar asignaciones: {str(e)}", 500)
+
 @assignment_bp.route('/assignments/<int:assignment_id>', methods=['PUT'])
 @token_required
 @role_required('admin', 'teacher')
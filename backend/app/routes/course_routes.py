@@ -11,14 +11,18 @@ from app.utils.responses import (
     success_response, 
     error_response, 
     created_response,
-    not_found_response
+    not_found_response,
+    is_columnar_request
 )
+from app.utils.conditional import conditional
+from app.utils.pagination import parse_keyset_args
 from app.utils.validators import sanitize_string
 
 course_bp = Blueprint('courses', __name__, url_prefix='/api/courses')
 
 @course_bp.route('', methods=['GET'])
 @token_required
+@conditional(CourseService.get_courses_version)
 def get_courses():
     """
     GET /api/courses
@@ -27,6 +31,7 @@ def get_courses():
     Query params:
         - page: número de página (default: 1)
         - limit: cursos por página (default: 50)
+        - format: columns para la respuesta columnar (opcional)
     """
     try:
         page = int(request.args.get('page', 1))
@@ -41,7 +46,8 @@ def get_courses():
             user_id=current_user['id'],
             role_name=current_user['role_name'],
             page=page,
-            limit=limit
+            limit=limit,
+            columnar=is_columnar_request()
         )
         
         return success_response(result, "Cursos obtenidos exitosamente")
@@ -51,6 +57,7 @@ def get_courses():
 
 @course_bp.route('/<int:course_id>', methods=['GET'])
 @token_required
+@conditional(CourseService.get_course_version, last_modified=True)
 def get_course(course_id):
     """
     GET /api/courses/<id>
@@ -235,12 +242,13 @@ def enroll_student(course_id):
         
         # Verificar permisos para teachers
         current_user = g.current_user
+        course = None
         if current_user['role_name'] == 'teacher':
             course = CourseService.get_course_by_id(course_id)
             if not course or course['teacher_id'] != current_user['id']:
                 return error_response("No tienes permiso para inscribir en este curso", 403)
         
-        CourseService.enroll_student(course_id, student_id)
+        CourseService.enroll_student(course_id, student_id, course=course)
         
         return success_response(None, "Estudiante inscrito exitosamente")
         
@@ -251,12 +259,27 @@ def enroll_student(course_id):
 
 @course_bp.route('/<int:course_id>/students', methods=['GET'])
 @token_required
+@conditional(CourseService.get_enrolled_students_version)
 def get_enrolled_students(course_id):
     """
     GET /api/courses/<id>/students
-    Lista estudiantes inscritos en el curso
+    Lista estudiantes inscritos en el curso, paginados por cursor
+    
+    Query params:
+        - limit: estudiantes por página (default: 50, máximo: 500)
+        - sort: enrolled_at | username (default: enrolled_at)
+        - order: asc | desc (default: desc)
+        - cursor: next_cursor de la página anterior
+        - format: columns para la respuesta columnar (opcional)
     """
     try:
+        try:
+            page_args = parse_keyset_args(
+                request.args, CourseService.STUDENT_SORTS, 'enrolled_at', 'desc'
+            )
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
         # Verificar que el curso existe
         course = CourseService.get_course_by_id(course_id)
         if not course:
@@ -268,12 +291,13 @@ def get_enrolled_students(course_id):
             if course['teacher_id'] != current_user['id']:
                 return error_response("No tienes acceso a este curso", 403)
         
-        students = CourseService.get_enrolled_students(course_id)
-        
-        return success_response(
-            {'students': students},
-            "Estudiantes obtenidos exitosamente"
+        result = CourseService.get_enrolled_students(
+            course_id,
+            columnar=is_columnar_request(),
+            **page_args
         )
         
+        return success_response(result, "Estudiantes obtenidos exitosamente")
+        
     except Exception as e:
         return error_response(f"Error al obtener estudiantes: {str(e)}", 500)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Rutas de eventos
+Endpoints: /api/events/*
+Server-Sent Events con los cambios de cursos, inscripciones y asignaciones
+"""
+
+import json
+from flask import Blueprint, Response, current_app, request, g
+from app.auth import stream_token_required
+from app.events import broker
+from app.services.course_service import CourseService
+from app.utils.responses import error_response
+
+event_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+# Campos internos usados para filtrar que no se envían al cliente
+PRIVATE_FIELDS = ('teacher_id', 'student_id')
+
+def format_sse(event=None, data=None, id_=None, retry=None):
+    """
+    Serializa un mensaje en formato text/event-stream
+    
+    Returns:
+        str: Mensaje terminado en línea vacía
+    """
+    lines = []
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if id_ is not None:
+        lines.append(f"id: {id_}")
+    if event:
+        lines.append(f"event: {event}")
+    if data is not None:
+        lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+class EventFilter:
+    """
+    Decide qué eventos puede ver un usuario según su rol
+    
+    Admin y administrative reciben todo; profesores los de sus cursos y
+    estudiantes los de los cursos en que están inscritos. El conjunto de
+    cursos se actualiza con los propios eventos (curso creado por el
+    profesor, inscripción del estudiante).
+    """
+    
+    def __init__(self, user_id, role_name):
+        self.user_id = user_id
+        self.role_name = role_name
+        self.course_ids = CourseService.get_visible_course_ids(user_id, role_name)
+    
+    def allows(self, event):
+        if self.course_ids is None:
+            return True
+        
+        if event['type'] == 'course' and event['action'] == 'created':
+            if event.get('teacher_id') == self.user_id:
+                self.course_ids.add(event['course_id'])
+        
+        if event['type'] == 'enrollment':
+            # Un estudiante solo ve sus propias inscripciones
+            if self.role_name == 'student':
+                if event.get('student_id') != self.user_id:
+                    return False
+                self.course_ids.add(event['course_id'])
+        
+        return event['course_id'] in self.course_ids
+
+def public_event(event):
+    """Copia del evento sin los campos internos"""
+    return {key: value for key, value in event.items() if key not in PRIVATE_FIELDS}
+
+def iter_events(subscription, event_filter, backlog, heartbeat):
+    """
+    Genera los mensajes SSE de un suscriptor
+    
+    Args:
+        subscription: Suscripción en el broker
+        event_filter: EventFilter del usuario
+        backlog: Eventos pendientes desde Last-Event-ID (None = perdidos)
+        heartbeat: Segundos entre comentarios de keep-alive
+    """
+    yield format_sse(retry=5000)
+    
+    replayed = set()
+    if backlog is None:
+        # La ventana de reanudación se perdió: el cliente recarga todo
+        yield format_sse(event='resync', data={})
+    else:
+        for event in backlog:
+            replayed.add(event['version'])
+            if event_filter.allows(event):
+                yield format_sse('change', public_event(event), event['version'])
+    
+    while True:
+        event = subscription.get(heartbeat)
+        
+        if subscription.overflowed:
+            yield format_sse(event='resync', data={})
+            return
+        
+        if event is None:
+            yield ': ping\n\n'
+        elif event['version'] not in replayed and event_filter.allows(event):
+            yield format_sse('change', public_event(event), event['version'])
+
+@event_bp.route('/stream', methods=['GET'])
+@stream_token_required
+def stream():
+    """
+    GET /api/events/stream
+    Eventos de cambios visibles para el usuario (text/event-stream)
+    
+    Query params:
+        - token: JWT (EventSource no puede enviar Authorization)
+    
+    Cada evento 'change' trae {type, action, id, course_id, version};
+    con Last-Event-ID se reenvían los eventos recientes perdidos.
+    Con EVENTS_MAX_STREAMS conexiones abiertas en el proceso responde 503.
+    """
+    try:
+        user = g.current_user
+        event_filter = EventFilter(user['id'], user['role_name'])
+        
+        # Suscribirse antes de leer el historial para no perder eventos
+        subscription = broker.subscribe(current_app.config['EVENTS_MAX_STREAMS'])
+        if subscription is None:
+            return error_response("Demasiadas conexiones de eventos abiertas", 503)
+        
+        backlog = []
+        last_event_id = request.headers.get('Last-Event-ID')
+        if last_event_id and last_event_id.isdigit():
+            backlog = broker.events_since(int(last_event_id))
+        
+        chunks = iter_events(
+            subscription,
+            event_filter,
+            backlog,
+            current_app.config['EVENTS_HEARTBEAT_SECONDS']
+        )
+        
+        response = Response(chunks, mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'
+        })
+        response.call_on_close(lambda: broker.unsubscribe(subscription))
+        
+        return response
+    
+    except Exception as e:
+        return error_response(f"Error al abrir el stream de eventos: {str(e)}", 500)
@@ -0,0 +1,140 @@
+"""
+Rutas de exportación
+Endpoints: /api/export/*
+Respuestas en streaming (CSV, NDJSON o JSON) con memoria constante
+"""
+
+from datetime import datetime
+from functools import partial
+from flask import Blueprint, Response, current_app, request, g, stream_with_context
+from app.auth import token_required, role_required
+from app.services.export_service import ExportService
+from app.utils.responses import error_response
+from app.utils.streaming import (
+    iter_csv_chunks, iter_ndjson_chunks, iter_json_envelope, iter_gzip, prefetch_first
+)
+from logger import app_logger
+
+export_bp = Blueprint('export', __name__, url_prefix='/api/export')
+
+export_logger = app_logger.getChild('export')
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json'
+}
+
+def abort_on_error(chunks, name):
+    """
+    Entrega los bloques y, si la lectura falla a mitad del archivo,
+    registra el error y lo vuelve a lanzar
+    
+    Con el código 200 ya enviado, propagar la excepción hace que el
+    servidor corte la conexión sin el bloque final (chunked) ni el cierre
+    del flujo gzip: el cliente ve una descarga incompleta en lugar de un
+    archivo truncado que parece terminado.
+    """
+    try:
+        yield from chunks
+    except Exception:
+        export_logger.exception(f"Exportación de {name} interrumpida")
+        raise
+
+def build_export_response(name, columns, rows):
+    """
+    Construye la respuesta en streaming según los query params
+    
+    Query params:
+        - format: csv | ndjson | json (default: csv)
+        - gzip: 1 para comprimir la transferencia (si el cliente acepta gzip)
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    
+    if export_format not in EXPORT_MIMETYPES:
+        return error_response("Formato inválido (usa csv, ndjson o json)", 400)
+    
+    # El primer registro se lee antes de responder: un error de BD
+    # se reporta como 500 y no dentro de una respuesta 200
+    rows = prefetch_first(rows)
+    
+    if export_format == 'csv':
+        chunks = iter_csv_chunks(columns, rows)
+    elif export_format == 'ndjson':
+        chunks = iter_ndjson_chunks(columns, rows)
+    else:
+        # Mismo formato {success, message, data} que los endpoints de listas
+        dumps = partial(current_app.json.dumps, separators=(',', ':'))
+        chunks = iter_json_envelope(rows, name, "Exportación generada exitosamente", dumps)
+    
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Cache-Control': 'no-store',
+        'X-Accel-Buffering': 'no'
+    }
+    
+    wants_gzip = request.args.get('gzip', '').lower() in ('1', 'true')
+    if wants_gzip and 'gzip' in request.accept_encodings:
+        chunks = iter_gzip(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    return Response(
+        stream_with_context(abort_on_error(chunks, name)),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers=headers
+    )
+
+@export_bp.route('/users', methods=['GET'])
+@token_required
+@role_required('admin', 'administrative')
+def export_users():
+    """
+    GET /api/export/users
+    Exporta todos los usuarios (solo admin/administrative)
+    """
+    try:
+        columns, rows = ExportService.export_users()
+        return build_export_response('users', columns, rows)
+    
+    except Exception as e:
+        return error_response(f"Error al exportar usuarios: {str(e)}", 500)
+
+@export_bp.route('/enrollments', methods=['GET'])
+@token_required
+def export_enrollments():
+    """
+    GET /api/export/enrollments
+    Exporta inscripciones según el rol del usuario
+    """
+    try:
+        current_user = g.current_user
+        
+        columns, rows = ExportService.export_enrollments(
+            user_id=current_user['id'],
+            role_name=current_user['role_name']
+        )
+        return build_export_response('enrollments', columns, rows)
+    
+    except Exception as e:
+        return error_response(f"Error al exportar inscripciones: {str(e)}", 500)
+
+@export_bp.route('/assignments', methods=['GET'])
+@token_required
+def export_assignments():
+    """
+    GET /api/export/assignments
+    Exporta asignaciones según el rol del usuario
+    """
+    try:
+        current_user = g.current_user
+        
+        columns, rows = ExportService.export_assignments(
+            user_id=current_user['id'],
+            role_name=current_user['role_name']
+        )
+        return build_export_response('assignments', columns, rows)
+    
+    except Exception as e:
+        return error_response(f"Error al exportar asignaciones: {str(e)}", 500)
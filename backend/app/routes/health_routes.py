@@ -0,0 +1,86 @@
+"""
+Rutas de salud
+Endpoints: /healthz, /readyz
+Sondas del balanceador de carga: baratas y sin autenticación
+"""
+
+import threading
+import time
+from flask import Blueprint, current_app
+from app.database import check_connection
+from app.utils.responses import success_response, error_response
+from logger import app_logger
+
+health_bp = Blueprint('health', __name__)
+health_logger = app_logger.getChild('health')
+
+class ReadinessCache:
+    """
+    Resultado de la última verificación de la BD, reutilizado durante
+    ttl segundos para que las sondas no consuman capacidad de la BD
+    
+    Si otra petición ya está verificando, se responde con el resultado
+    anterior en lugar de esperar (una BD colgada no acumula sondas).
+    """
+    
+    def __init__(self, check):
+        self.check = check
+        self.lock = threading.Lock()
+        self.checked_at = None
+        self.error = None
+    
+    def get(self, ttl):
+        """
+        Returns:
+            str: Error de la última verificación (None si la BD está lista)
+        """
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < ttl:
+            return self.error
+        
+        if not self.lock.acquire(blocking=self.checked_at is None):
+            return self.error
+        
+        try:
+            if self.checked_at is None or time.monotonic() - self.checked_at >= ttl:
+                previous = self.error
+                try:
+                    self.check()
+                    self.error = None
+                except Exception as e:
+                    self.error = str(e)
+                self.checked_at = time.monotonic()
+                
+                # Solo los cambios de estado, no cada sonda
+                if self.error and self.error != previous:
+                    health_logger.warning(f"Base de datos no disponible: {self.error}")
+                elif previous and not self.error:
+                    health_logger.info("Base de datos disponible")
+            return self.error
+        finally:
+            self.lock.release()
+
+readiness = ReadinessCache(lambda: check_connection())
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    GET /healthz
+    El proceso está vivo y atiende peticiones (no consulta la BD)
+    """
+    return success_response({'status': 'ok'}, "Servicio activo")
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    GET /readyz
+    El pool entrega una conexión sana; 503 si no (el balanceador deja
+    de enviar tráfico a este proceso). Resultado en caché durante
+    READINESS_CACHE_SECONDS.
+    """
+    error = readiness.get(current_app.config['READINESS_CACHE_SECONDS'])
+    
+    if error:
+        return error_response("Base de datos no disponible", 503)
+    
+    return success_response({'status': 'ready'}, "Servicio listo")
@@ -0,0 +1,30 @@
+"""
+Rutas de métricas
+Endpoints: /metrics
+Formato de exposición de Prometheus (todo el nodo si hay METRICS_DIR)
+"""
+
+import hmac
+from flask import Blueprint, current_app, request
+from app.metrics import registry, CONTENT_TYPE
+from app.utils.responses import error_response
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    GET /metrics
+    Latencias y códigos por ruta, peticiones en curso, pool de conexiones,
+    cachés, cola de bcrypt y rechazos del rate limiter
+    
+    Headers:
+        - Authorization: Bearer <METRICS_TOKEN> (si está configurado)
+    """
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        provided = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(provided.encode('utf-8'), f"Bearer {token}".encode('utf-8')):
+            return error_response("No autorizado", 401)
+    
+    return current_app.response_class(registry.render(), content_type=CONTENT_TYPE)
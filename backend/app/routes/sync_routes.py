@@ -0,0 +1,41 @@
+"""
+Rutas de sincronización
+Endpoints: /api/sync
+Cambios incrementales para refrescar clientes sin recargar listas
+"""
+
+from flask import Blueprint, request, g
+from app.auth import token_required
+from app.services.sync_service import SyncService
+from app.utils.responses import success_response, error_response
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+@sync_bp.route('', methods=['GET'])
+@token_required
+def sync():
+    """
+    GET /api/sync
+    Cursos, asignaciones e inscripciones visibles que cambiaron desde
+    el token, más las eliminaciones (deleted)
+    
+    Query params:
+        - since: token de la sincronización anterior (sin él solo se
+                 retorna el token inicial)
+    """
+    try:
+        current_user = g.current_user
+        
+        try:
+            changes = SyncService.get_changes(
+                current_user['id'],
+                current_user['role_name'],
+                request.args.get('since') or None
+            )
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        return success_response(changes, "Cambios obtenidos exitosamente")
+    
+    except Exception as e:
+        return error_response(f"Error al sincronizar: {str(e)}", 500)
@@ -11,9 +11,11 @@ from app.utils.responses import (
     success_response, 
     error_response, 
     created_response,
-    not_found_response
+    not_found_response,
+    is_columnar_request
 )
 from app.utils.validators import sanitize_string, safe_int
+from app.utils.streaming import detect_format, iter_records
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
@@ -28,12 +30,13 @@ def get_users():
     Query params:
         - page: número de página (default: 1)
         - limit: usuarios por página (default: 50)
+        - format: columns para la respuesta columnar (opcional)
     """
     try:
         page = safe_int(request.args.get('page', 1), default=1, min_value=1)
         limit = safe_int(request.args.get('limit', 50), default=50, min_value=1, max_value=100)
         
-        result = UserService.get_all_users(page, limit)
+        result = UserService.get_all_users(page, limit, columnar=is_columnar_request())
         
         return success_response(result, "Usuarios obtenidos exitosamente")
         
@@ -116,6 +119,49 @@ def create_user():
     except Exception as e:
         return error_response(f"Error al crear usuario: {str(e)}", 500)
 
+@user_bp.route('/import', methods=['POST'])
+@token_required
+@role_required('admin')
+def import_users():
+    """
+    POST /api/users/import
+    Importa usuarios desde un archivo CSV o NDJSON (solo admin)
+    
+    El archivo se envía como multipart (campo "file") o directamente
+    en el cuerpo con Content-Type text/csv o application/x-ndjson.
+    Columnas: username, email, password, role (opcional)
+    
+    Query params:
+        - format: csv | ndjson (opcional, se detecta por nombre/Content-Type)
+        - default_role: rol para filas sin columna role (default: student)
+    """
+    try:
+        upload = request.files.get('file')
+        
+        if upload:
+            stream = upload.stream
+            file_format = detect_format(upload.filename, upload.mimetype)
+        elif request.content_length:
+            stream = request.stream
+            file_format = detect_format(content_type=request.mimetype)
+        else:
+            return error_response("Archivo no proporcionado", 400)
+        
+        file_format = request.args.get('format', file_format)
+        default_role = sanitize_string(request.args.get('default_role', 'student'))
+        
+        result = UserService.import_users(
+            iter_records(stream, file_format),
+            default_role=default_role
+        )
+        
+        return success_response(result, "Importación finalizada")
+    
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Error al importar usuarios: {str(e)}", 500)
+
 @user_bp.route('/<int:user_id>', methods=['PUT'])
 @token_required
 def update_user(user_id):
@@ -6,10 +6,14 @@ from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 from app.services.course_service import CourseService
 from app.services.assignment_service import AssignmentService
+from app.services.export_service import ExportService
+from app.services.sync_service import SyncService
 
 __all__ = [
     'AuthService',
     'UserService',
     'CourseService',
-    'AssignmentService'
+    'AssignmentService',
+    'ExportService',
+    'SyncService'
 ]
\ No newline at end of file
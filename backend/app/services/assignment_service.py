@@ -3,26 +3,70 @@ Servicio de asignaciones
 Lógica de negocio para operaciones CRUD de asignaciones
 """
 
-from app.database import execute_query
-from app.utils.validators import validate_string_length, validate_positive_number
+from datetime import datetime, timedelta
+from flask import g, has_app_context
+from app.config import Config
+from app.database import get_db, execute_query, execute_query_columnar, execute_query_rows, execute_many
+from app.events import publish_event
+from app.models import AssignmentRow
+from app.services.course_service import CourseService
+from app.services.sync_service import SyncService
+from app.tracing import traced_service
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_condition, keyset_page
+from app.utils.validators import (
+    validate_string_length,
+    validate_positive_number,
+    validate_datetime_format
+)
 
+INSERT_ASSIGNMENT_QUERY = """
+    INSERT INTO assignments (title, description, course_id, due_date, max_score)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+@traced_service
 class AssignmentService:
     """Servicio para gestión de asignaciones"""
     
+    # Campos de ordenamiento permitidos: columna y si admite NULL
+    ASSIGNMENT_SORTS = {
+        'due_date': ('a.due_date', True),
+        'created_at': ('a.created_at', False),
+        'title': ('a.title', False)
+    }
+    
     @staticmethod
-    def get_assignments_by_course(course_id, user_id=None, role_name=None):
+    def _check_course_access(course_id, user_id=None, role_name=None):
         """
-        Obtiene asignaciones de un curso
+        Verifica que el usuario pueda ver las asignaciones del curso
+        
+        El resultado se guarda en g durante la petición: la versión para
+        el ETag (get_course_assignments_version) y la vista verifican el
+        mismo acceso y solo la primera consulta la BD.
+        
+        Raises:
+            ValueError: Si no tiene acceso
+        """
+        if role_name not in ('student', 'teacher'):
+            return
+        
+        key = (course_id, user_id, role_name)
+        cache = g.setdefault('_course_access', {}) if has_app_context() else {}
+        
+        if key not in cache:
+            cache[key] = AssignmentService._course_access_error(course_id, user_id, role_name)
+        
+        if cache[key]:
+            raise ValueError(cache[key])
+    
+    @staticmethod
+    def _course_access_error(course_id, user_id, role_name):
+        """
+        Consulta el acceso de un estudiante o profesor al curso
         
-        Args:
-            course_id: ID del curso
-            user_id: ID del usuario actual
-            role_name: Rol del usuario
-            
         Returns:
-            list: Asignaciones del curso
+            str: Mensaje de error, o None si tiene acceso
         """
-        # Verificar acceso al curso
         if role_name == 'student':
             # Verificar que el estudiante esté inscrito
             enrolled = execute_query(
@@ -32,9 +76,9 @@ class AssignmentService:
             )
             
             if not enrolled:
-                raise ValueError("No tienes acceso a este curso")
+                return "No tienes acceso a este curso"
         
-        elif role_name == 'teacher':
+        else:
             # Verificar que sea el profesor del curso
             course = execute_query(
                 "SELECT teacher_id FROM courses WHERE id = %s",
@@ -43,7 +87,63 @@ class AssignmentService:
             )
             
             if not course or course['teacher_id'] != user_id:
-                raise ValueError("No tienes acceso a este curso")
+                return "No tienes acceso a este curso"
+        
+        return None
+    
+    @staticmethod
+    def get_course_assignments_version(course_id, user_id=None, role_name=None):
+        """
+        Versión de las asignaciones de un curso (para ETag)
+        
+        Returns:
+            dict: Conteo, suma de IDs y últimas modificaciones, o None si
+                  el usuario no tiene acceso (la vista reporta el error)
+        """
+        try:
+            AssignmentService._check_course_access(course_id, user_id, role_name)
+        except ValueError:
+            return None
+        
+        return execute_query(
+            """SELECT COUNT(a.id) as total, SUM(a.id) as ids,
+                      MAX(a.updated_at) as updated_at,
+                      MAX(c.updated_at) as course_updated_at
+               FROM courses c
+               LEFT JOIN assignments a ON a.course_id = c.id
+               WHERE c.id = %s""",
+            (course_id,),
+            fetch_one=True
+        )
+    
+    @staticmethod
+    def get_assignments_by_course(course_id, user_id=None, role_name=None,
+                                  limit=DEFAULT_PAGE_SIZE, sort='due_date',
+                                  order='asc', after=None, columnar=False):
+        """
+        Obtiene una página de asignaciones de un curso
+        
+        Usa paginación por cursor (keyset) apoyada en el índice
+        assignments(course_id, due_date), sin OFFSET.
+        
+        Args:
+            course_id: ID del curso
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+            limit: Asignaciones por página
+            sort: Campo de ordenamiento (ver ASSIGNMENT_SORTS)
+            order: 'asc' o 'desc'
+            after: Tupla (valor, id) de la última fila entregada
+            columnar: Si es True, la lista se retorna como {columns, rows}
+            
+        Returns:
+            dict: Asignaciones del curso y metadatos de paginación
+        """
+        AssignmentService._check_course_access(course_id, user_id, role_name)
+        
+        column, nullable = AssignmentService.ASSIGNMENT_SORTS[sort]
+        descending = order == 'desc'
+        direction = 'DESC' if descending else 'ASC'
         
         # Obtener asignaciones
         query = """
@@ -53,10 +153,30 @@ class AssignmentService:
             FROM assignments a
             JOIN courses c ON a.course_id = c.id
             WHERE a.course_id = %s
-            ORDER BY a.due_date ASC
         """
+        params = [course_id]
+        
+        if after is not None:
+            condition, condition_params = keyset_condition(
+                column, 'a.id', after, descending, nullable
+            )
+            query += f" AND {condition}"
+            params.extend(condition_params)
+        
+        # Se pide una fila extra para saber si hay otra página
+        query += f" ORDER BY {column} {direction}, a.id {direction} LIMIT %s"
+        params.append(limit + 1)
+        
+        if columnar:
+            rows = execute_query_columnar(query, tuple(params))
+        else:
+            rows = execute_query_rows(query, tuple(params), AssignmentRow)
+        assignments, pagination = keyset_page(rows, limit, sort, order, sort_key=sort)
         
-        return execute_query(query, (course_id,))
+        return {
+            'assignments': assignments,
+            'pagination': pagination
+        }
     
     @staticmethod
     def get_assignment_by_id(assignment_id):
@@ -77,6 +197,38 @@ class AssignmentService:
         """
         return execute_query(query, (assignment_id,), fetch_one=True)
     
+    @staticmethod
+    def get_assignment_version(assignment_id, user_id=None, role_name=None):
+        """
+        Versión de una asignación (para ETag), sin ejecutar la consulta completa
+        
+        Returns:
+            dict: Últimas modificaciones de la asignación y su curso, o None
+                  si no existe o el usuario no tiene acceso
+        """
+        version = execute_query(
+            """SELECT a.updated_at, c.updated_at as course_updated_at,
+                      c.teacher_id,
+                      EXISTS(SELECT 1 FROM enrollments e
+                             WHERE e.course_id = c.id AND e.student_id = %s) as enrolled
+               FROM assignments a
+               JOIN courses c ON a.course_id = c.id
+               WHERE a.id = %s""",
+            (user_id, assignment_id),
+            fetch_one=True
+        )
+        
+        if not version:
+            return None
+        
+        if role_name == 'student' and not version['enrolled']:
+            return None
+        
+        if role_name == 'teacher' and version['teacher_id'] != user_id:
+            return None
+        
+        return version
+    
     @staticmethod
     def create_assignment(title, course_id, description=None, due_date=None, max_score=100.0):
         """
@@ -106,15 +258,209 @@ class AssignmentService:
         
         # Insertar asignación
         assignment_id = execute_query(
-            """INSERT INTO assignments (title, description, course_id, due_date, max_score)
-               VALUES (%s, %s, %s, %s, %s)""",
+            INSERT_ASSIGNMENT_QUERY,
             (title, description, course_id, due_date, max_score),
             fetch_all=False
         )
         
+        publish_event('assignment', 'created', assignment_id, course_id)
+        
         # Retornar asignación creada
         return AssignmentService.get_assignment_by_id(assignment_id)
     
+    @staticmethod
+    def _check_courses_access(course_ids, user_id=None, role_name=None):
+        """
+        Verifica en una sola consulta que los cursos existan y, para
+        profesores, que todos les pertenezcan
+        
+        Raises:
+            ValueError: Si algún curso no existe
+            PermissionError: Si el profesor no es dueño de algún curso
+        """
+        owners = CourseService.get_course_owners(course_ids)
+        
+        missing = [cid for cid in course_ids if cid not in owners]
+        if missing:
+            raise ValueError(
+                f"Cursos no encontrados: {', '.join(str(cid) for cid in missing)}"
+            )
+        
+        if role_name == 'teacher':
+            foreign = [cid for cid in course_ids if owners[cid] != user_id]
+            if foreign:
+                raise PermissionError(
+                    "No tienes permiso para crear asignaciones en los cursos: "
+                    f"{', '.join(str(cid) for cid in foreign)}"
+                )
+    
+    @staticmethod
+    def bulk_create_assignments(assignments, user_id=None, role_name=None):
+        """
+        Crea varias asignaciones con inserts multi-fila por lotes
+        
+        Args:
+            assignments: Lista de dicts con title, course_id y opcionalmente
+                         description, due_date y max_score
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+        
+        Returns:
+            dict: Resumen con el número de asignaciones creadas por curso
+        Raises:
+            ValueError: Si datos inválidos (incluye el índice del elemento)
+            PermissionError: Si el profesor no es dueño de algún curso
+        """
+        if not assignments:
+            raise ValueError("No hay asignaciones para crear")
+        
+        if len(assignments) > Config.BULK_MAX_ITEMS:
+            raise ValueError(
+                f"Máximo {Config.BULK_MAX_ITEMS} asignaciones por petición"
+            )
+        
+        rows = []
+        for index, item in enumerate(assignments):
+            if not isinstance(item, dict):
+                raise ValueError(f"Elemento {index}: formato inválido")
+            
+            title = item.get('title')
+            course_id = item.get('course_id')
+            due_date = item.get('due_date')
+            max_score = item.get('max_score', 100.0)
+            
+            if not validate_string_length(title, 3, 200):
+                raise ValueError(
+                    f"Elemento {index}: título debe tener entre 3 y 200 caracteres"
+                )
+            
+            if not isinstance(course_id, int) or isinstance(course_id, bool):
+                raise ValueError(f"Elemento {index}: course_id inválido")
+            
+            if due_date and not validate_datetime_format(due_date):
+                raise ValueError(
+                    f"Elemento {index}: due_date debe tener formato YYYY-MM-DD HH:MM:SS"
+                )
+            
+            if max_score and not validate_positive_number(max_score):
+                raise ValueError(f"Elemento {index}: puntaje máximo debe ser positivo")
+            
+            rows.append((
+                title,
+                item.get('description'),
+                course_id,
+                due_date or None,
+                max_score
+            ))
+        
+        course_ids = list(dict.fromkeys(row[2] for row in rows))
+        AssignmentService._check_courses_access(course_ids, user_id, role_name)
+        
+        created = execute_many(
+            INSERT_ASSIGNMENT_QUERY,
+            rows,
+            chunk_size=Config.BULK_INSERT_CHUNK_SIZE
+        )
+        
+        per_course = {}
+        for row in rows:
+            per_course[row[2]] = per_course.get(row[2], 0) + 1
+        
+        # Un evento por curso: los clientes recargan la lista del curso
+        for cid, count in per_course.items():
+            publish_event('assignment', 'created', None, cid, count=count)
+        
+        return {
+            'created': created,
+            'courses': [
+                {'course_id': cid, 'created': count}
+                for cid, count in per_course.items()
+            ]
+        }
+    
+    @staticmethod
+    def clone_course_assignments(source_course_id, target_course_ids,
+                                 due_date_offset_days=0, user_id=None, role_name=None):
+        """
+        Copia todas las asignaciones de un curso a otros cursos,
+        desplazando las fechas de entrega
+        
+        Args:
+            source_course_id: ID del curso origen
+            target_course_ids: IDs de los cursos destino
+            due_date_offset_days: Días a sumar a cada fecha de entrega
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+        
+        Returns:
+            dict: Resumen con el número de asignaciones copiadas
+        Raises:
+            ValueError: Si datos inválidos
+            PermissionError: Si el profesor no es dueño de algún curso
+        """
+        if not isinstance(target_course_ids, list) or any(
+                not isinstance(cid, int) or isinstance(cid, bool)
+                for cid in target_course_ids):
+            raise ValueError("target_course_ids debe ser una lista de enteros")
+        
+        target_course_ids = list(dict.fromkeys(target_course_ids))
+        
+        if not target_course_ids:
+            raise ValueError("Debe indicar al menos un curso destino")
+        
+        if source_course_id in target_course_ids:
+            raise ValueError("El curso origen no puede ser también destino")
+        
+        # Origen y destinos se verifican en una sola consulta
+        AssignmentService._check_courses_access(
+            [source_course_id] + target_course_ids, user_id, role_name
+        )
+        
+        source = execute_query(
+            """SELECT title, description, due_date, max_score
+               FROM assignments
+               WHERE course_id = %s
+               ORDER BY id ASC""",
+            (source_course_id,)
+        )
+        
+        if len(source) * len(target_course_ids) > Config.BULK_MAX_ITEMS:
+            raise ValueError(
+                f"La copia excede el máximo de {Config.BULK_MAX_ITEMS} asignaciones"
+            )
+        
+        offset = timedelta(days=due_date_offset_days)
+        rows = []
+        for course_id in target_course_ids:
+            for assignment in source:
+                due_date = assignment['due_date']
+                if isinstance(due_date, datetime):
+                    due_date = due_date + offset
+                rows.append((
+                    assignment['title'],
+                    assignment['description'],
+                    course_id,
+                    due_date,
+                    assignment['max_score']
+                ))
+        
+        created = execute_many(
+            INSERT_ASSIGNMENT_QUERY,
+            rows,
+            chunk_size=Config.BULK_INSERT_CHUNK_SIZE
+        )
+        
+        if source:
+            for course_id in target_course_ids:
+                publish_event('assignment', 'created', None, course_id, count=len(source))
+        
+        return {
+            'source_course_id': source_course_id,
+            'target_course_ids': target_course_ids,
+            'assignments_per_course': len(source),
+            'created': created
+        }
+    
     @staticmethod
     def update_assignment(assignment_id, **kwargs):
         """
@@ -168,6 +514,8 @@ class AssignmentService:
             query = f"UPDATE assignments SET {', '.join(updates)} WHERE id = %s"
             params.append(assignment_id)
             execute_query(query, tuple(params), fetch_all=False)
+            
+            publish_event('assignment', 'updated', assignment_id, assignment['course_id'])
         
         # Retornar asignación actualizada
         return AssignmentService.get_assignment_by_id(assignment_id)
@@ -186,19 +534,50 @@ class AssignmentService:
         if not assignment:
             raise ValueError("Asignación no encontrada")
         
-        execute_query(
-            "DELETE FROM assignments WHERE id = %s",
-            (assignment_id,),
-            fetch_all=False
-        )
+        # La eliminación queda en change_log en la misma transacción
+        with get_db() as (conn, cursor):
+            SyncService.log_assignment_deletion(cursor, assignment)
+            cursor.execute("DELETE FROM assignments WHERE id = %s", (assignment_id,))
+        
+        publish_event('assignment', 'deleted', assignment_id, assignment['course_id'])
         
         return True
     
     @staticmethod
-    def get_all_assignments(user_id, role_name, page=1, limit=50):
+    def get_assignments_version(user_id=None, role_name=None):
+        """
+        Versión de las asignaciones visibles para el usuario (para ETag)
+        
+        Returns:
+            dict: Conteo, suma de IDs y últimas modificaciones
+        """
+        query = """
+            SELECT COUNT(a.id) as total, SUM(a.id) as ids,
+                   MAX(a.updated_at) as updated_at,
+                   MAX(c.updated_at) as course_updated_at
+            FROM assignments a
+            JOIN courses c ON a.course_id = c.id
+        """
+        
+        if role_name == 'teacher':
+            query += " WHERE c.teacher_id = %s"
+            params = (user_id,)
+        elif role_name == 'student':
+            query += " JOIN enrollments e ON c.id = e.course_id WHERE e.student_id = %s"
+            params = (user_id,)
+        else:
+            params = ()
+        
+        return execute_query(query, params, fetch_one=True)
+    
+    @staticmethod
+    def get_all_assignments(user_id, role_name, page=1, limit=50, columnar=False):
         """
         Obtiene todas las asignaciones según el rol del usuario
         
+        Args:
+            columnar: Si es True, la lista se retorna como {columns, rows}
+        
         Returns:
             dict: Lista de asignaciones y metadatos
         """
@@ -243,7 +622,10 @@ class AssignmentService:
             count_params = ()
         
         query += " ORDER BY a.due_date ASC LIMIT %s OFFSET %s"
-        assignments = execute_query(query, params)
+        if columnar:
+            assignments = execute_query_columnar(query, params)
+        else:
+            assignments = execute_query_rows(query, params, AssignmentRow)
         
         # Contar total
         total = execute_query(count_query, count_params, fetch_one=True)['total']
@@ -5,11 +5,42 @@ Maneja registro, login y generación de tokens
 
 import jwt
 import bcrypt
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from itertools import repeat
 from app.config import Config
 from app.database import execute_query
+from app.metrics import PASSWORD_HASH_QUEUE
+from app.tracing import traced_service
 from app.utils.validators import validate_email, validate_password, validate_username
 
+# Pool de procesos para hashear contraseñas en lote (se crea bajo demanda)
+_hash_executor = None
+_hash_executor_lock = threading.Lock()
+
+def _hash_password_worker(password, rounds):
+    """Hashea una contraseña en un proceso del pool"""
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def _get_hash_executor():
+    """Retorna el pool de procesos compartido para hashing"""
+    global _hash_executor
+    
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            # fork copiaría los locks tomados por los hilos de fondo (logs,
+            # métricas, trazas, muestreador) y el hijo podría bloquearse
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=Config.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _hash_executor
+
+@traced_service
 class AuthService:
     """Servicio para operaciones de autenticación"""
     
@@ -19,6 +50,43 @@ class AuthService:
         salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
+    @staticmethod
+    def hash_passwords(passwords):
+        """
+        Hashea varias contraseñas repartiendo el trabajo en un pool de procesos
+        
+        Args:
+            passwords: Lista de contraseñas en texto plano
+        
+        Returns:
+            list: Hashes en el mismo orden que las contraseñas
+        """
+        passwords = list(passwords)
+        rounds = Config.BCRYPT_ROUNDS
+        workers = Config.PASSWORD_HASH_WORKERS
+        
+        if workers <= 1 or len(passwords) < 2:
+            return [_hash_password_worker(p, rounds) for p in passwords]
+        
+        chunksize = max(1, len(passwords) // (workers * 4))
+        results = _get_hash_executor().map(
+            _hash_password_worker,
+            passwords,
+            repeat(rounds),
+            chunksize=chunksize
+        )
+        
+        # Profundidad de la cola: contraseñas enviadas y aún sin hash
+        PASSWORD_HASH_QUEUE.inc(len(passwords))
+        hashes = []
+        try:
+            for password_hash in results:
+                hashes.append(password_hash)
+                PASSWORD_HASH_QUEUE.dec()
+        finally:
+            PASSWORD_HASH_QUEUE.dec(len(passwords) - len(hashes))
+        return hashes
+    
     @staticmethod
     def verify_password(password, password_hash):
         """Verifica si una contraseña coincide con su hash"""
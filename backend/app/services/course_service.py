@@ -3,14 +3,26 @@ Servicio de cursos
 Lógica de negocio para operaciones CRUD de cursos
 """
 
-from app.database import execute_query
+from app.database import get_db, execute_query, execute_query_columnar, execute_query_rows
+from app.events import publish_event
+from app.services.sync_service import SyncService
+from app.models import CourseRow, EnrollmentRow
+from app.tracing import traced_service
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_condition, keyset_page
 from app.utils.validators import validate_string_length
 
+@traced_service
 class CourseService:
     """Servicio para gestión de cursos"""
     
+    # Campos de ordenamiento permitidos para la lista de estudiantes
+    STUDENT_SORTS = {
+        'enrolled_at': 'e.enrolled_at',
+        'username': 'u.username'
+    }
+    
     @staticmethod
-    def get_all_courses(user_id=None, role_name=None, page=1, limit=50):
+    def get_all_courses(user_id=None, role_name=None, page=1, limit=50, columnar=False):
         """
         Obtiene lista de cursos según el rol del usuario
         
@@ -19,6 +31,7 @@ class CourseService:
             role_name: Rol del usuario (admin, teacher, student)
             page: Número de página
             limit: Cursos por página
+            columnar: Si es True, la lista se retorna como {columns, rows}
             
         Returns:
             dict: Lista de cursos y metadatos
@@ -65,7 +78,10 @@ class CourseService:
             count_params = ()
         
         query += " ORDER BY c.created_at DESC LIMIT %s OFFSET %s"
-        courses = execute_query(query, params)
+        if columnar:
+            courses = execute_query_columnar(query, params)
+        else:
+            courses = execute_query_rows(query, params, CourseRow)
         
         # Contar total
         total = execute_query(count_query, count_params, fetch_one=True)['total']
@@ -80,6 +96,33 @@ class CourseService:
             }
         }
     
+    @staticmethod
+    def get_courses_version(user_id=None, role_name=None):
+        """
+        Versión de los cursos visibles para el usuario (para ETag)
+        
+        Returns:
+            dict: Conteo, suma de IDs y últimas modificaciones
+        """
+        query = """
+            SELECT COUNT(c.id) as total, SUM(c.id) as ids,
+                   MAX(c.updated_at) as updated_at,
+                   MAX(u.updated_at) as teacher_updated_at
+            FROM courses c
+            JOIN users u ON c.teacher_id = u.id
+        """
+        
+        if role_name == 'teacher':
+            query += " WHERE c.teacher_id = %s"
+            params = (user_id,)
+        elif role_name == 'student':
+            query += " JOIN enrollments e ON c.id = e.course_id WHERE e.student_id = %s"
+            params = (user_id,)
+        else:
+            params = ()
+        
+        return execute_query(query, params, fetch_one=True)
+    
     @staticmethod
     def get_course_by_id(course_id):
         """
@@ -97,6 +140,79 @@ class CourseService:
         """
         return execute_query(query, (course_id,), fetch_one=True)
     
+    @staticmethod
+    def get_course_version(course_id, user_id=None, role_name=None):
+        """
+        Versión de un curso (para ETag), sin ejecutar la consulta completa
+        
+        Returns:
+            dict: Últimas modificaciones del curso y su profesor, o None si
+                  no existe o el estudiante no está inscrito
+        """
+        version = execute_query(
+            """SELECT c.updated_at, u.updated_at as teacher_updated_at,
+                      EXISTS(SELECT 1 FROM enrollments e
+                             WHERE e.course_id = c.id AND e.student_id = %s) as enrolled
+               FROM courses c
+               JOIN users u ON c.teacher_id = u.id
+               WHERE c.id = %s""",
+            (user_id, course_id),
+            fetch_one=True
+        )
+        
+        if not version:
+            return None
+        
+        if role_name == 'student' and not version['enrolled']:
+            return None
+        
+        return version
+    
+    @staticmethod
+    def get_course_owners(course_ids):
+        """
+        Obtiene el profesor de varios cursos en una sola consulta
+        
+        Args:
+            course_ids: IDs de los cursos
+        
+        Returns:
+            dict: {course_id: teacher_id} (solo cursos existentes)
+        """
+        course_ids = list(dict.fromkeys(course_ids))
+        
+        if not course_ids:
+            return {}
+        
+        placeholders = ', '.join(['%s'] * len(course_ids))
+        rows = execute_query(
+            f"SELECT id, teacher_id FROM courses WHERE id IN ({placeholders})",
+            tuple(course_ids)
+        )
+        
+        return {row['id']: row['teacher_id'] for row in rows}
+    
+    @staticmethod
+    def get_visible_course_ids(user_id=None, role_name=None):
+        """
+        IDs de los cursos que el usuario puede ver
+        
+        Returns:
+            set: IDs de cursos o None si el rol ve todos los cursos
+        """
+        if role_name == 'teacher':
+            rows = execute_query("SELECT id FROM courses WHERE teacher_id = %s", (user_id,))
+            return {row['id'] for row in rows}
+        
+        if role_name == 'student':
+            rows = execute_query(
+                "SELECT course_id FROM enrollments WHERE student_id = %s",
+                (user_id,)
+            )
+            return {row['course_id'] for row in rows}
+        
+        return None
+    
     @staticmethod
     def create_course(name, code, teacher_id, description=None):
         """
@@ -148,6 +264,8 @@ class CourseService:
             fetch_all=False
         )
         
+        publish_event('course', 'created', course_id, course_id, teacher_id=teacher_id)
+        
         # Retornar curso creado
         return CourseService.get_course_by_id(course_id)
     
@@ -209,6 +327,11 @@ class CourseService:
             query = f"UPDATE courses SET {', '.join(updates)} WHERE id = %s"
             params.append(course_id)
             execute_query(query, tuple(params), fetch_all=False)
+            
+            publish_event(
+                'course', 'updated', course_id, course_id,
+                teacher_id=course['teacher_id']
+            )
         
         # Retornar curso actualizado
         return CourseService.get_course_by_id(course_id)
@@ -227,25 +350,32 @@ class CourseService:
         if not course:
             raise ValueError("Curso no encontrado")
         
-        # Eliminar curso (las asignaciones se eliminan por CASCADE)
-        execute_query(
-            "DELETE FROM courses WHERE id = %s",
-            (course_id,),
-            fetch_all=False
-        )
+        # Eliminar curso (las asignaciones se eliminan por CASCADE);
+        # la eliminación queda en change_log en la misma transacción
+        with get_db() as (conn, cursor):
+            SyncService.log_course_deletion(cursor, course)
+            cursor.execute("DELETE FROM courses WHERE id = %s", (course_id,))
+        
+        publish_event('course', 'deleted', course_id, course_id, teacher_id=course['teacher_id'])
         
         return True
     
     @staticmethod
-    def enroll_student(course_id, student_id):
+    def enroll_student(course_id, student_id, course=None):
         """
         Inscribe un estudiante en un curso
         
+        Args:
+            course_id: ID del curso
+            student_id: ID del estudiante
+            course: Curso ya cargado por la vista (evita leerlo de nuevo)
+        
         Raises:
             ValueError: Si datos inválidos o ya inscrito
         """
         # Verificar que curso existe
-        course = CourseService.get_course_by_id(course_id)
+        if course is None:
+            course = CourseService.get_course_by_id(course_id)
         if not course:
             raise ValueError("Curso no encontrado")
         
@@ -276,27 +406,102 @@ class CourseService:
             raise ValueError("El estudiante ya está inscrito en este curso")
         
         # Inscribir
-        execute_query(
+        enrollment_id = execute_query(
             "INSERT INTO enrollments (student_id, course_id) VALUES (%s, %s)",
             (student_id, course_id),
             fetch_all=False
         )
         
+        publish_event(
+            'enrollment', 'created', enrollment_id, course_id,
+            student_id=student_id, teacher_id=course['teacher_id']
+        )
+        
         return True
     
     @staticmethod
-    def get_enrolled_students(course_id):
+    def get_enrolled_students_version(course_id, user_id=None, role_name=None):
+        """
+        Versión de la lista de estudiantes de un curso (para ETag)
+        
+        Returns:
+            dict: Conteo, suma de IDs y última modificación, o None si el
+                  curso no existe o el profesor no es su dueño
+        """
+        course = execute_query(
+            "SELECT teacher_id FROM courses WHERE id = %s",
+            (course_id,),
+            fetch_one=True
+        )
+        
+        if not course:
+            return None
+        
+        if role_name == 'teacher' and course['teacher_id'] != user_id:
+            return None
+        
+        return execute_query(
+            """SELECT COUNT(e.id) as total, SUM(e.id) as ids,
+                      MAX(u.updated_at) as updated_at
+               FROM enrollments e
+               JOIN users u ON e.student_id = u.id
+               WHERE e.course_id = %s""",
+            (course_id,),
+            fetch_one=True
+        )
+    
+    @staticmethod
+    def get_enrolled_students(course_id, limit=DEFAULT_PAGE_SIZE, sort='enrolled_at',
+                              order='desc', after=None, columnar=False):
         """
-        Obtiene lista de estudiantes inscritos en un curso
+        Obtiene una página de estudiantes inscritos en un curso
+        
+        Usa paginación por cursor (keyset) apoyada en el índice
+        enrollments(course_id, enrolled_at), sin OFFSET.
+        
+        Args:
+            course_id: ID del curso
+            limit: Estudiantes por página
+            sort: Campo de ordenamiento (ver STUDENT_SORTS)
+            order: 'asc' o 'desc'
+            after: Tupla (valor, enrollment_id) de la última fila entregada
+            columnar: Si es True, la lista se retorna como {columns, rows}
         
         Returns:
-            list: Estudiantes inscritos
+            dict: Estudiantes inscritos y metadatos de paginación
         """
+        column = CourseService.STUDENT_SORTS[sort]
+        descending = order == 'desc'
+        direction = 'DESC' if descending else 'ASC'
+        
         query = """
-            SELECT u.id, u.username, u.email, e.enrolled_at
+            SELECT u.id, u.username, u.email, e.enrolled_at, e.id as enrollment_id
             FROM users u
             JOIN enrollments e ON u.id = e.student_id
             WHERE e.course_id = %s
-            ORDER BY e.enrolled_at DESC
         """
-        return execute_query(query, (course_id,))
\ No newline at end of file
+        params = [course_id]
+        
+        if after is not None:
+            condition, condition_params = keyset_condition(
+                column, 'e.id', after, descending
+            )
+            query += f" AND {condition}"
+            params.extend(condition_params)
+        
+        # Se pide una fila extra para saber si hay otra página
+        query += f" ORDER BY {column} {direction}, e.id {direction} LIMIT %s"
+        params.append(limit + 1)
+        
+        if columnar:
+            rows = execute_query_columnar(query, tuple(params))
+        else:
+            rows = execute_query_rows(query, tuple(params), EnrollmentRow)
+        students, pagination = keyset_page(
+            rows, limit, sort, order, sort_key=sort, id_key='enrollment_id'
+        )
+        
+        return {
+            'students': students,
+            'pagination': pagination
+        }
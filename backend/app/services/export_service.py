@@ -0,0 +1,109 @@
+"""
+Servicio de exportación
+Consultas de exportación masiva leídas con cursor del lado del servidor
+"""
+
+from app.database import stream_query
+from app.models import AssignmentRow, EnrollmentRow, UserRow
+from app.tracing import traced_service
+
+@traced_service
+class ExportService:
+    """Servicio para exportar usuarios, inscripciones y asignaciones"""
+    
+    USER_COLUMNS = [
+        'id', 'username', 'email', 'role_name', 'is_active', 'created_at'
+    ]
+    
+    ENROLLMENT_COLUMNS = [
+        'id', 'course_id', 'course_code', 'course_name',
+        'student_id', 'student_username', 'student_email', 'enrolled_at'
+    ]
+    
+    ASSIGNMENT_COLUMNS = [
+        'id', 'course_id', 'course_code', 'title', 'description',
+        'due_date', 'max_score', 'created_at'
+    ]
+    
+    @staticmethod
+    def export_users():
+        """
+        Exporta todos los usuarios (sin datos sensibles)
+        
+        Returns:
+            tuple: (columnas, generador de filas)
+        """
+        query = """
+            SELECT u.id, u.username, u.email, r.name as role_name,
+                   u.is_active, u.created_at
+            FROM users u
+            JOIN roles r ON u.role_id = r.id
+            ORDER BY u.id ASC
+        """
+        return ExportService.USER_COLUMNS, stream_query(query, model=UserRow)
+    
+    @staticmethod
+    def export_enrollments(user_id, role_name):
+        """
+        Exporta inscripciones visibles para el usuario
+        
+        Args:
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+        
+        Returns:
+            tuple: (columnas, generador de filas)
+        """
+        query = """
+            SELECT e.id, e.course_id, c.code as course_code, c.name as course_name,
+                   e.student_id, u.username as student_username,
+                   u.email as student_email, e.enrolled_at
+            FROM enrollments e
+            JOIN courses c ON e.course_id = c.id
+            JOIN users u ON e.student_id = u.id
+        """
+        
+        if role_name == 'teacher':
+            # Profesores exportan las inscripciones de sus cursos
+            query += " WHERE c.teacher_id = %s"
+            params = (user_id,)
+        elif role_name == 'student':
+            # Estudiantes exportan solo sus inscripciones
+            query += " WHERE e.student_id = %s"
+            params = (user_id,)
+        else:
+            params = ()
+        
+        query += " ORDER BY e.id ASC"
+        return ExportService.ENROLLMENT_COLUMNS, stream_query(query, params, model=EnrollmentRow)
+    
+    @staticmethod
+    def export_assignments(user_id, role_name):
+        """
+        Exporta asignaciones visibles para el usuario
+        
+        Args:
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+        
+        Returns:
+            tuple: (columnas, generador de filas)
+        """
+        query = """
+            SELECT a.id, a.course_id, c.code as course_code, a.title,
+                   a.description, a.due_date, a.max_score, a.created_at
+            FROM assignments a
+            JOIN courses c ON a.course_id = c.id
+        """
+        
+        if role_name == 'teacher':
+            query += " WHERE c.teacher_id = %s"
+            params = (user_id,)
+        elif role_name == 'student':
+            query += " JOIN enrollments e ON c.id = e.course_id WHERE e.student_id = %s"
+            params = (user_id,)
+        else:
+            params = ()
+        
+        query += " ORDER BY a.id ASC"
+        return ExportService.ASSIGNMENT_COLUMNS, stream_query(query, params, model=AssignmentRow)
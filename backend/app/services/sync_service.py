@@ -0,0 +1,252 @@
+"""
+Servicio de sincronización incremental
+Cambios desde un token: filas creadas o modificadas (por updated_at)
+y eliminaciones (por la tabla change_log)
+"""
+
+from datetime import datetime, timedelta
+from app.database import execute_query, execute_query_rows
+from app.models import AssignmentRow, CourseRow, EnrollmentRow
+from app.tracing import traced_service
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Margen para transacciones que confirmaron con un updated_at anterior
+# al token; las filas repetidas se aplican de nuevo sin efecto
+SYNC_OVERLAP = timedelta(seconds=2)
+
+@traced_service
+class SyncService:
+    """Servicio para sincronizar cursos, asignaciones e inscripciones"""
+    
+    @staticmethod
+    def encode_token(since, last_change):
+        """
+        Genera el token opaco de sincronización
+        
+        Args:
+            since: Momento (hora de la BD) desde el que se buscan cambios
+            last_change: Último ID de change_log ya entregado
+        """
+        return encode_cursor([since.isoformat(sep=' '), last_change])
+    
+    @staticmethod
+    def decode_token(token):
+        """
+        Decodifica un token generado por encode_token
+        
+        Returns:
+            tuple: (datetime, último ID de change_log)
+        Raises:
+            ValueError: Si el token es inválido
+        """
+        try:
+            since, last_change = decode_cursor(token)
+            return datetime.fromisoformat(since), int(last_change)
+        except (ValueError, TypeError):
+            raise ValueError("Token de sincronización inválido")
+    
+    @staticmethod
+    def log_course_deletion(cursor, course):
+        """
+        Registra la eliminación de un curso y de sus inscripciones y
+        asignaciones (que se eliminan en cascada) dentro de la
+        transacción del DELETE
+        
+        Args:
+            cursor: Cursor de la transacción
+            course: Curso a eliminar (id, teacher_id)
+        """
+        cursor.execute(
+            """INSERT INTO change_log (entity, entity_id, action, course_id, teacher_id, student_id)
+               SELECT 'enrollment', id, 'deleted', course_id, %s, student_id
+               FROM enrollments WHERE course_id = %s""",
+            (course['teacher_id'], course['id'])
+        )
+        cursor.execute(
+            """INSERT INTO change_log (entity, entity_id, action, course_id, teacher_id)
+               SELECT 'assignment', id, 'deleted', course_id, %s
+               FROM assignments WHERE course_id = %s""",
+            (course['teacher_id'], course['id'])
+        )
+        cursor.execute(
+            """INSERT INTO change_log (entity, entity_id, action, course_id, teacher_id)
+               VALUES ('course', %s, 'deleted', %s, %s)""",
+            (course['id'], course['id'], course['teacher_id'])
+        )
+    
+    @staticmethod
+    def log_assignment_deletion(cursor, assignment):
+        """
+        Registra la eliminación de una asignación dentro de la
+        transacción del DELETE
+        
+        Args:
+            cursor: Cursor de la transacción
+            assignment: Asignación a eliminar (id, course_id, teacher_id)
+        """
+        cursor.execute(
+            """INSERT INTO change_log (entity, entity_id, action, course_id, teacher_id)
+               VALUES ('assignment', %s, 'deleted', %s, %s)""",
+            (assignment['id'], assignment['course_id'], assignment['teacher_id'])
+        )
+    
+    @staticmethod
+    def get_changes(user_id, role_name, token=None):
+        """
+        Obtiene los cambios visibles para el usuario desde un token
+        
+        Sin token solo se retorna el token inicial: el cliente lo guarda
+        antes de cargar las listas completas y después pide los cambios.
+        
+        Args:
+            user_id: ID del usuario actual
+            role_name: Rol del usuario
+            token: Token de la sincronización anterior
+        
+        Returns:
+            dict: courses, assignments, enrollments, deleted y el nuevo token
+        Raises:
+            ValueError: Si el token es inválido
+        """
+        # Se toman antes de las consultas: lo que cambie durante la
+        # sincronización se volverá a entregar en la siguiente
+        state = execute_query(
+            "SELECT NOW(6) AS now, COALESCE(MAX(id), 0) AS last_change FROM change_log",
+            fetch_one=True
+        )
+        
+        changes = {
+            'courses': [],
+            'assignments': [],
+            'enrollments': [],
+            'deleted': [],
+            'token': SyncService.encode_token(state['now'], state['last_change'])
+        }
+        
+        if token is None:
+            return changes
+        
+        since, last_change = SyncService.decode_token(token)
+        since -= SYNC_OVERLAP
+        
+        changes['courses'] = SyncService._changed_courses(user_id, role_name, since)
+        changes['assignments'] = SyncService._changed_assignments(user_id, role_name, since)
+        changes['enrollments'] = SyncService._changed_enrollments(user_id, role_name, since)
+        changes['deleted'] = SyncService._deletions(
+            user_id, role_name, last_change, state['last_change']
+        )
+        
+        return changes
+    
+    @staticmethod
+    def _changed_courses(user_id, role_name, since):
+        query = """
+            SELECT c.id, c.name, c.description, c.code, c.teacher_id,
+                   u.username as teacher_name, c.created_at, c.updated_at
+            FROM courses c
+            JOIN users u ON c.teacher_id = u.id
+        """
+        
+        if role_name == 'teacher':
+            query += " WHERE c.teacher_id = %s AND c.updated_at > %s"
+            params = (user_id, since)
+        elif role_name == 'student':
+            # Un curso recién inscrito es nuevo para el estudiante
+            query += """
+                JOIN enrollments e ON e.course_id = c.id AND e.student_id = %s
+                WHERE (c.updated_at > %s OR e.enrolled_at > %s)
+            """
+            params = (user_id, since, since)
+        else:
+            query += " WHERE c.updated_at > %s"
+            params = (since,)
+        
+        return execute_query_rows(query + " ORDER BY c.id", params, CourseRow)
+    
+    @staticmethod
+    def _changed_assignments(user_id, role_name, since):
+        query = """
+            SELECT a.id, a.title, a.description, a.course_id, a.due_date,
+                   a.max_score, a.created_at, a.updated_at
+            FROM assignments a
+        """
+        
+        if role_name == 'teacher':
+            query += """
+                JOIN courses c ON a.course_id = c.id
+                WHERE c.teacher_id = %s AND a.updated_at > %s
+            """
+            params = (user_id, since)
+        elif role_name == 'student':
+            # Al inscribirse llegan todas las asignaciones del curso
+            query += """
+                JOIN enrollments e ON e.course_id = a.course_id AND e.student_id = %s
+                WHERE (a.updated_at > %s OR e.enrolled_at > %s)
+            """
+            params = (user_id, since, since)
+        else:
+            query += " WHERE a.updated_at > %s"
+            params = (since,)
+        
+        return execute_query_rows(query + " ORDER BY a.id", params, AssignmentRow)
+    
+    @staticmethod
+    def _changed_enrollments(user_id, role_name, since):
+        query = """
+            SELECT e.id, e.course_id, e.student_id,
+                   u.username as student_username, e.enrolled_at
+            FROM enrollments e
+            JOIN users u ON e.student_id = u.id
+        """
+        
+        if role_name == 'teacher':
+            query += """
+                JOIN courses c ON e.course_id = c.id
+                WHERE c.teacher_id = %s AND e.enrolled_at > %s
+            """
+            params = (user_id, since)
+        elif role_name == 'student':
+            # Estudiantes solo ven sus propias inscripciones
+            query += " WHERE e.student_id = %s AND e.enrolled_at > %s"
+            params = (user_id, since)
+        else:
+            query += " WHERE e.enrolled_at > %s"
+            params = (since,)
+        
+        return execute_query_rows(query + " ORDER BY e.id", params, EnrollmentRow)
+    
+    @staticmethod
+    def _deletions(user_id, role_name, after, until):
+        query = """
+            SELECT entity, entity_id, course_id
+            FROM change_log
+            WHERE id > %s AND id <= %s
+        """
+        params = [after, until]
+        
+        if role_name == 'teacher':
+            query += " AND teacher_id = %s"
+            params.append(user_id)
+        elif role_name == 'student':
+            # Inscripciones propias, asignaciones de sus cursos, y cursos
+            # eliminados en los que estaba inscrito con sus asignaciones
+            query += """
+                AND (
+                    student_id = %s
+                    OR (entity = 'assignment' AND course_id IN (
+                        SELECT course_id FROM enrollments WHERE student_id = %s
+                    ))
+                    OR (entity IN ('course', 'assignment') AND course_id IN (
+                        SELECT course_id FROM change_log
+                        WHERE entity = 'enrollment' AND student_id = %s AND id > %s
+                    ))
+                )
+            """
+            params.extend([user_id, user_id, user_id, after])
+        
+        rows = execute_query(query + " ORDER BY id", tuple(params))
+        
+        return [
+            {'type': row['entity'], 'id': row['entity_id'], 'course_id': row['course_id']}
+            for row in rows
+        ]
@@ -3,26 +3,38 @@ Servicio de usuarios
 Lógica de negocio para operaciones CRUD de usuarios
 """
 
-from app.database import execute_query
+import pymysql
+from app.config import Config
+from app.database import execute_query, execute_query_columnar, execute_query_rows, execute_many
+from app.models import UserRow
 from app.services.auth_service import AuthService
+from app.tracing import traced_service
 from app.utils.validators import (
     validate_email, 
     validate_username, 
     validate_password,
-    validate_role
+    validate_role,
+    sanitize_string
 )
 
+INSERT_USER_QUERY = """
+    INSERT INTO users (username, email, password_hash, role_id)
+    VALUES (%s, %s, %s, %s)
+"""
+
+@traced_service
 class UserService:
     """Servicio para gestión de usuarios"""
     
     @staticmethod
-    def get_all_users(page=1, limit=50):
+    def get_all_users(page=1, limit=50, columnar=False):
         """
         Obtiene lista de usuarios con paginación
         
         Args:
             page: Número de página
             limit: Usuarios por página
+            columnar: Si es True, la lista se retorna como {columns, rows}
             
         Returns:
             dict: Lista de usuarios y metadatos
@@ -38,7 +50,10 @@ class UserService:
             ORDER BY u.created_at DESC
             LIMIT %s OFFSET %s
         """
-        users = execute_query(query, (limit, offset))
+        if columnar:
+            users = execute_query_columnar(query, (limit, offset))
+        else:
+            users = execute_query_rows(query, (limit, offset), UserRow)
         
         # Contar total
         count_query = "SELECT COUNT(*) as total FROM users"
@@ -119,8 +134,7 @@ class UserService:
         
         # Insertar
         user_id = execute_query(
-            """INSERT INTO users (username, email, password_hash, role_id)
-               VALUES (%s, %s, %s, %s)""",
+            INSERT_USER_QUERY,
             (username, email, password_hash, role['id']),
             fetch_all=False
         )
@@ -274,4 +288,146 @@ class UserService:
             fetch_all=False
         )
         
-        return True
\ No newline at end of file
+        return True
+    
+    @staticmethod
+    def import_users(records, default_role='student', batch_size=None):
+        """
+        Importa usuarios desde un iterable de registros, por lotes
+        
+        Cada lote verifica duplicados con consultas IN, hashea las
+        contraseñas en paralelo e inserta con inserts multi-fila. Los
+        registros inválidos se reportan sin detener la importación.
+        
+        Args:
+            records: Iterable de (número de fila, dict) o (número de fila, ValueError)
+            default_role: Rol para registros sin columna role
+            batch_size: Registros por lote (default: Config.IMPORT_BATCH_SIZE)
+        
+        Returns:
+            dict: Resumen con procesados, creados, fallidos y errores por fila
+        """
+        batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+        
+        roles = {
+            row['name']: row['id']
+            for row in execute_query("SELECT id, name FROM roles")
+        }
+        
+        summary = {'processed': 0, 'created': 0, 'failed': 0, 'errors': []}
+        seen_usernames = set()
+        seen_emails = set()
+        batch = []
+        
+        def fail(row_number, message, username=None):
+            summary['failed'] += 1
+            summary['errors'].append({
+                'row': row_number,
+                'username': username,
+                'error': message
+            })
+        
+        for row_number, record in records:
+            summary['processed'] += 1
+            
+            if isinstance(record, Exception):
+                fail(row_number, str(record))
+                continue
+            
+            username = sanitize_string(record.get('username', ''))
+            email = sanitize_string(record.get('email', ''))
+            password = record.get('password') or ''
+            role_name = sanitize_string(record.get('role', '')) or default_role
+            
+            if not validate_username(username):
+                fail(row_number, "Nombre de usuario inválido", username)
+                continue
+            
+            if not validate_email(email):
+                fail(row_number, "Email inválido", username)
+                continue
+            
+            if not validate_password(password):
+                fail(row_number, "Contraseña inválida", username)
+                continue
+            
+            if not validate_role(role_name) or role_name not in roles:
+                fail(row_number, "Rol inválido", username)
+                continue
+            
+            # Duplicados dentro del mismo archivo
+            username_key = username.lower()
+            email_key = email.lower()
+            if username_key in seen_usernames or email_key in seen_emails:
+                fail(row_number, "Usuario o email duplicado en el archivo", username)
+                continue
+            
+            seen_usernames.add(username_key)
+            seen_emails.add(email_key)
+            batch.append((row_number, username, email, password, roles[role_name]))
+            
+            if len(batch) >= batch_size:
+                UserService._import_batch(batch, summary, fail)
+                batch = []
+        
+        if batch:
+            UserService._import_batch(batch, summary, fail)
+        
+        return summary
+    
+    @staticmethod
+    def _import_batch(batch, summary, fail):
+        """
+        Procesa un lote de la importación: duplicados, hashing e inserción
+        
+        Args:
+            batch: Lista de (fila, username, email, password, role_id) ya validados
+            summary: Resumen acumulado de la importación
+            fail: Función para registrar errores por fila
+        """
+        # Duplicados contra la BD en una sola consulta
+        usernames = [item[1] for item in batch]
+        emails = [item[2] for item in batch]
+        username_marks = ', '.join(['%s'] * len(usernames))
+        email_marks = ', '.join(['%s'] * len(emails))
+        
+        existing = execute_query(
+            f"""SELECT username, email FROM users
+                WHERE username IN ({username_marks}) OR email IN ({email_marks})""",
+            tuple(usernames) + tuple(emails)
+        )
+        
+        taken_usernames = {row['username'].lower() for row in existing}
+        taken_emails = {row['email'].lower() for row in existing}
+        
+        pending = []
+        for item in batch:
+            if item[1].lower() in taken_usernames or item[2].lower() in taken_emails:
+                fail(item[0], "Usuario o email ya existe", item[1])
+            else:
+                pending.append(item)
+        
+        if not pending:
+            return
+        
+        hashes = AuthService.hash_passwords([item[3] for item in pending])
+        rows = [
+            (item[1], item[2], password_hash, item[4])
+            for item, password_hash in zip(pending, hashes)
+        ]
+        
+        try:
+            summary['created'] += execute_many(
+                INSERT_USER_QUERY,
+                rows,
+                chunk_size=Config.BULK_INSERT_CHUNK_SIZE
+            )
+        except pymysql.err.IntegrityError:
+            # Otro proceso insertó un duplicado entre la verificación y el insert:
+            # se reintenta fila por fila para atribuir el error
+            for item, row in zip(pending, rows):
+                try:
+                    execute_query(INSERT_USER_QUERY, row, fetch_all=False)
+                    summary['created'] += 1
+                except pymysql.err.IntegrityError:
+                    fail(item[0], "Usuario o email ya existe", item[1])
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Medición de tiempos por petición
+Desglose de fases (rate limit, auth, BD, serialización, total) en el
+header Server-Timing y en el log de accesos
+"""
+
+import time
+from contextlib import contextmanager
+from flask import g, has_app_context, request
+from app.database import add_query_listener
+from logger import app_logger
+
+access_logger = app_logger.getChild('access')
+
+class RequestTiming:
+    """Tiempos acumulados de una petición (segundos)"""
+    
+    __slots__ = ('started', 'phases', 'db_time', 'db_count')
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.db_time = 0.0
+        self.db_count = 0
+    
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+    
+    def server_timing(self, total):
+        """
+        Valor del header Server-Timing (milisegundos)
+        
+        Returns:
+            str: p. ej. 'auth;dur=1.2, db;dur=3.4;desc="2 queries", total;dur=9.0'
+        """
+        metrics = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+        metrics.append(f'db;dur={self.db_time * 1000:.1f};desc="{self.db_count} queries"')
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ', '.join(metrics)
+    
+    def fields(self, total):
+        """Campos estructurados para el log de accesos (milisegundos)"""
+        fields = {f"{name}_ms": round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        fields['db_ms'] = round(self.db_time * 1000, 2)
+        fields['db_queries'] = self.db_count
+        fields['total_ms'] = round(total * 1000, 2)
+        return fields
+
+def current_timing():
+    """
+    Tiempos de la petición en curso
+    
+    Returns:
+        RequestTiming: o None fuera de una petición o sin medición activa
+    """
+    if not has_app_context():
+        return None
+    return g.get('_timing')
+
+@contextmanager
+def timed(name):
+    """
+    Suma la duración del bloque a la fase indicada de la petición
+    
+    Uso: with timed('auth'): ...
+    """
+    timing = current_timing()
+    if timing is None:
+        yield
+        return
+    
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+def _record_query(query, seconds):
+    timing = current_timing()
+    if timing is not None:
+        timing.db_time += seconds
+        timing.db_count += 1
+
+def init_timing(app):
+    """
+    Registra la medición en la aplicación
+    
+    Debe llamarse después de crear el Limiter: el inicio se inserta antes
+    de todos los before_request y la marca de fin después, así 'limit'
+    mide los before_request (el rate limiter).
+    """
+    add_query_listener(_record_query)
+    
+    header_enabled = app.config['SERVER_TIMING_ENABLED']
+    slow_ms = app.config['ACCESS_LOG_SLOW_MS']
+    
+    def start_timing():
+        g._timing = RequestTiming()
+    
+    def end_before_request():
+        timing = g.get('_timing')
+        if timing is not None:
+            timing.add('limit', time.perf_counter() - timing.started)
+    
+    def finish_timing(response):
+        timing = g.pop('_timing', None)
+        if timing is None:
+            return response
+        
+        total = time.perf_counter() - timing.started
+        
+        if header_enabled:
+            response.headers['Server-Timing'] = timing.server_timing(total)
+        
+        # Las peticiones lentas o con error se registran siempre; las
+        # exitosas con muestreo (LOG_SUCCESS_SAMPLE_RATE, ver logger.py)
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            **timing.fields(total)
+        }
+        access_logger.info(
+            '%s %s %s',
+            request.method, request.path, response.status_code,
+            extra={
+                'fields': fields,
+                'sampled': total * 1000 < slow_ms and response.status_code < 400
+            }
+        )
+        
+        return response
+    
+    app.before_request_funcs.setdefault(None, []).insert(0, start_timing)
+    app.before_request(end_before_request)
+    app.after_request(finish_timing)
@@ -0,0 +1,376 @@
+"""
+Trazas de peticiones (spans) exportadas a archivos locales
+
+Cada petición muestreada abre un span raíz; dentro se abren spans para
+la autenticación (token_required), cada método de los servicios y cada
+consulta a la BD. Los spans terminados se escriben por lotes, en un hilo
+aparte, como líneas JSON compatibles con OTLP (ExportTraceServiceRequest).
+
+El trace id se toma del header traceparent (W3C) o se genera.
+Ver scripts/trace_report.py para reconstruir el camino crítico.
+"""
+
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode
+from flask import g, has_app_context, request
+from app.database import add_query_listener, backend
+from logger import app_logger
+
+tracing_logger = app_logger.getChild('tracing')
+
+# Valores de SpanKind y StatusCode de OTLP
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+SERVICE_NAME = 'academic-system'
+TRACEPARENT_HEADER = 'traceparent'
+_TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# Largo máximo de db.statement en los spans de consultas
+MAX_STATEMENT_LENGTH = 1000
+
+# Query params con credenciales que no se escriben en http.target
+REDACTED_PARAMS = ('token',)
+
+def _new_id(size):
+    return os.urandom(size).hex()
+
+class Span:
+    """Operación con inicio, fin, atributos y span padre"""
+    
+    __slots__ = ('span_id', 'parent_id', 'name', 'kind', 'start_ns', 'end_ns', 'attributes', 'status')
+    
+    def __init__(self, name, parent_id=None, kind=SPAN_KIND_INTERNAL, attributes=None, start_ns=None):
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.status = STATUS_UNSET
+    
+    def set_error(self, error):
+        self.status = STATUS_ERROR
+        self.attributes['exception.type'] = type(error).__name__
+        self.attributes['exception.message'] = str(error)
+    
+    def to_otlp(self, trace_id):
+        """Representación JSON de OTLP"""
+        span = {
+            'traceId': trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {'boolValue': value}
+    elif isinstance(value, int):
+        typed = {'intValue': str(value)}
+    elif isinstance(value, float):
+        typed = {'doubleValue': value}
+    else:
+        typed = {'stringValue': str(value)}
+    return {'key': key, 'value': typed}
+
+class Trace:
+    """Spans de una petición; la pila indica el span activo"""
+    
+    def __init__(self, trace_id, parent_id=None):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.spans = []
+        self.stack = []
+        self.finished = False
+    
+    def start(self, name, kind=SPAN_KIND_INTERNAL, attributes=None):
+        parent_id = self.stack[-1].span_id if self.stack else self.parent_id
+        span = Span(name, parent_id, kind, attributes)
+        self.spans.append(span)
+        self.stack.append(span)
+        return span
+    
+    def end(self, span):
+        span.end_ns = time.time_ns()
+        if self.stack and self.stack[-1] is span:
+            self.stack.pop()
+        elif span in self.stack:
+            self.stack.remove(span)
+    
+    def record(self, name, start_ns, end_ns, kind=SPAN_KIND_INTERNAL, attributes=None):
+        """Agrega un span ya terminado como hijo del span activo"""
+        if self.finished:
+            return
+        parent_id = self.stack[-1].span_id if self.stack else self.parent_id
+        span = Span(name, parent_id, kind, attributes, start_ns)
+        span.end_ns = end_ns
+        self.spans.append(span)
+
+class SpanExporter:
+    """
+    Escribe los spans terminados por lotes en un hilo aparte
+    
+    Cada lote es una línea JSON con el formato de ExportTraceServiceRequest
+    (el mismo que escribe el file exporter del OpenTelemetry Collector).
+    Al terminar el proceso se escriben los spans pendientes.
+    """
+    
+    def __init__(self, path, batch_size=512, flush_seconds=5):
+        self.path = path.replace('{pid}', str(os.getpid()))
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = queue.SimpleQueue()
+        self.pending = []
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    def start(self):
+        if self.thread is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+    
+    def export(self, trace):
+        """Encola los spans de una traza terminada"""
+        for span in trace.spans:
+            if span.end_ns is not None:
+                self.queue.put(span.to_otlp(trace.trace_id))
+    
+    def flush(self, spans):
+        """Escribe un lote de spans (una línea)"""
+        if not spans:
+            return
+        batch = {
+            'resourceSpans': [{
+                'resource': {'attributes': [
+                    _otlp_attribute('service.name', SERVICE_NAME),
+                    _otlp_attribute('process.pid', os.getpid())
+                ]},
+                'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}]
+            }]
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(batch, separators=(',', ':')) + '\n')
+    
+    def close(self):
+        """Vacía la cola y escribe los spans pendientes (atexit)"""
+        with self.lock:
+            while True:
+                try:
+                    self.pending.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush_pending()
+    
+    def _flush_pending(self):
+        """Escribe los spans pendientes en lotes de batch_size (con self.lock)"""
+        pending, self.pending = self.pending, []
+        for start in range(0, len(pending), self.batch_size):
+            try:
+                self.flush(pending[start:start + self.batch_size])
+            except Exception:
+                tracing_logger.exception("Error al exportar spans")
+    
+    def _run(self):
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            timeout = max(0, deadline - time.monotonic())
+            try:
+                span = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                span = None
+            
+            with self.lock:
+                if span is not None:
+                    self.pending.append(span)
+                # Con tráfico constante la cola nunca se vacía: el plazo
+                # se revisa después de cada span, no solo al agotar get()
+                if len(self.pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+                self._flush_pending()
+            deadline = time.monotonic() + self.flush_seconds
+
+def current_trace():
+    """
+    Traza de la petición en curso
+    
+    Returns:
+        Trace: o None fuera de una petición o si no se muestreó
+    """
+    if not has_app_context():
+        return None
+    return g.get('_trace')
+
+@contextmanager
+def span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    """
+    Abre un span hijo del span activo (no hace nada sin traza)
+    
+    Uso: with span('auth.token_required'): ...
+    """
+    trace = current_trace()
+    if trace is None or trace.finished:
+        yield None
+        return
+    
+    active = trace.start(name, kind, attributes)
+    try:
+        yield active
+    except Exception as e:
+        active.set_error(e)
+        raise
+    finally:
+        trace.end(active)
+
+def traced_service(cls):
+    """
+    Decorador de clase: abre un span por cada método estático del servicio
+    
+    El span se llama Clase.método (p. ej. CourseService.update_course).
+    """
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, staticmethod) and not attr.startswith('__'):
+            wrapped = _traced_function(f"{cls.__name__}.{attr}", value.__func__)
+            setattr(cls, attr, staticmethod(wrapped))
+    return cls
+
+def _traced_function(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if current_trace() is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def _record_query(query, seconds):
+    trace = current_trace()
+    if trace is None:
+        return
+    
+    end_ns = time.time_ns()
+    statement = ' '.join(query.split())
+    operation = statement.split(' ', 1)[0].upper() if statement else 'QUERY'
+    trace.record(
+        operation,
+        end_ns - int(seconds * 1e9),
+        end_ns,
+        SPAN_KIND_CLIENT,
+        {
+            'db.system': backend.NAME,
+            'db.operation': operation,
+            'db.statement': statement[:MAX_STATEMENT_LENGTH]
+        }
+    )
+
+def _http_target():
+    """Ruta y query string de la petición sin credenciales (?token= de SSE)"""
+    if not request.args:
+        return request.path
+    
+    args = [
+        (key, 'REDACTED' if key in REDACTED_PARAMS else value)
+        for key, value in request.args.items(multi=True)
+    ]
+    return f"{request.path}?{urlencode(args)}"
+
+def _parse_traceparent(value):
+    """
+    Returns:
+        tuple: (trace_id, parent_id, sampled) o None si el header es inválido
+    """
+    match = _TRACEPARENT_PATTERN.match((value or '').strip().lower())
+    if not match or match.group(1) == '0' * 32:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    return trace_id, parent_id, int(flags, 16) & 1 == 1
+
+def init_tracing(app):
+    """
+    Registra las trazas en la aplicación
+    
+    Debe llamarse después de init_timing e init_metrics y antes de
+    init_request_id: el span raíz cubre también el rate limiter y lleva
+    el request_id de la petición.
+    """
+    exporter = SpanExporter(
+        app.config['TRACING_FILE'],
+        batch_size=app.config['TRACING_BATCH_SIZE'],
+        flush_seconds=app.config['TRACING_FLUSH_SECONDS']
+    )
+    exporter.start()
+    app.extensions['span_exporter'] = exporter
+    add_query_listener(_record_query)
+    
+    sample_rate = app.config['TRACING_SAMPLE_RATE']
+    
+    def start_trace():
+        incoming = _parse_traceparent(request.headers.get(TRACEPARENT_HEADER))
+        if incoming:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id, sampled = _new_id(16), None, random.random() < sample_rate
+        
+        if not sampled:
+            return
+        
+        trace = Trace(trace_id, parent_id)
+        trace.start(f"{request.method} {request.path}", SPAN_KIND_SERVER, {
+            'http.method': request.method,
+            'http.target': _http_target(),
+            'request_id': g.get('request_id', '')
+        })
+        g._trace = trace
+    
+    def annotate_trace(response):
+        trace = g.get('_trace')
+        if trace is not None:
+            root = trace.spans[0]
+            # Nombre con la regla de la ruta: agrupa /api/courses/1 y /api/courses/2
+            if request.url_rule is not None:
+                root.name = f"{request.method} {request.url_rule.rule}"
+                root.attributes['http.route'] = request.url_rule.rule
+            root.attributes['http.status_code'] = response.status_code
+            if response.status_code >= 500:
+                root.status = STATUS_ERROR
+        return response
+    
+    def finish_trace(error=None):
+        trace = g.pop('_trace', None)
+        if trace is None:
+            return
+        root = trace.spans[0]
+        if error is not None:
+            root.set_error(error)
+        trace.end(root)
+        trace.finished = True
+        exporter.export(trace)
+    
+    app.before_request_funcs.setdefault(None, []).insert(0, start_trace)
+    app.after_request(annotate_trace)
+    app.teardown_request(finish_trace)
@@ -17,6 +17,7 @@ from .validators import (
 
 from .responses import (
     success_response,
+    is_columnar_request,
     error_response,
     created_response,
     not_found_response,
@@ -39,6 +40,7 @@ __all__ = [
     'validate_role',
     # Responses
     'success_response',
+    'is_columnar_request',
     'error_response',
     'created_response',
     'not_found_response',
@@ -0,0 +1,125 @@
+"""
+Peticiones GET condicionales (ETag / Last-Modified / 304)
+La versión del recurso se obtiene con una consulta ligera antes de la vista
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, g, current_app
+from app.database import get_db_utc_offset
+from app.metrics import cache_result
+
+CACHE_CONTROL = 'private, no-cache'
+
+def compute_etag(version):
+    """
+    Calcula un ETag fuerte a partir de la versión y el alcance de la petición
+    
+    El alcance incluye la ruta, los query params y el usuario, porque el
+    contenido de las listas depende del rol y de la paginación.
+    
+    Args:
+        version: Dict retornado por la función de versión
+    
+    Returns:
+        str: ETag sin comillas
+    """
+    current_user = g.current_user
+    scope = [
+        request.path,
+        sorted(request.args.items(multi=True)),
+        current_user['id'],
+        current_user['role_name'],
+        sorted((key, str(value)) for key, value in version.items())
+    ]
+    return hashlib.sha256(repr(scope).encode('utf-8')).hexdigest()[:32]
+
+def _last_modified(version):
+    """
+    Fecha de modificación más reciente de la versión en UTC (o None)
+    
+    Las fechas de la BD son naive, en la zona horaria de la sesión.
+    """
+    dates = [value for value in version.values() if isinstance(value, datetime)]
+    
+    if not dates:
+        return None
+    
+    utc = max(dates) - get_db_utc_offset()
+    return utc.replace(microsecond=0, tzinfo=timezone.utc)
+
+def _not_modified(etag, last_modified):
+    """Determina si el cliente ya tiene la versión actual"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    
+    if last_modified and request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    
+    return False
+
+def conditional(version_func, last_modified=False):
+    """
+    Decorador para responder 304 cuando el cliente tiene la versión actual
+    
+    Debe usarse después de @token_required. La función de versión recibe
+    los argumentos de la ruta más user_id y role_name, y retorna None si
+    la vista debe resolver la petición (recurso inexistente o sin acceso).
+    
+    Args:
+        version_func: Función que retorna la versión del recurso
+        last_modified: Si es True, también usa Last-Modified / If-Modified-Since
+                       (solo para recursos individuales: en las listas una
+                       eliminación no cambia la fecha máxima)
+    
+    Uso:
+        @conditional(CourseService.get_course_version, last_modified=True)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            current_user = g.current_user
+            
+            # La versión se consulta también sin headers condicionales: el
+            # ETag (y Last-Modified) de cada 200 es lo que el cliente
+            # envía después para revalidar
+            try:
+                version = version_func(
+                    user_id=current_user['id'],
+                    role_name=current_user['role_name'],
+                    **kwargs
+                )
+                modified = _last_modified(version) if version and last_modified else None
+            except Exception:
+                # Sin versión se responde normalmente, sin ETag
+                version = None
+            
+            if version is None:
+                return f(*args, **kwargs)
+            
+            etag = compute_etag(version)
+            
+            not_modified = _not_modified(etag, modified)
+            
+            # Ratio de revalidaciones resueltas con 304 (cachés de los clientes)
+            if request.if_none_match or request.if_modified_since:
+                cache_result('http_conditional', not_modified)
+            
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = CACHE_CONTROL
+            response.vary.add('Authorization')
+            if modified:
+                response.last_modified = modified
+            
+            return response
+        
+        return decorated
+    return decorator
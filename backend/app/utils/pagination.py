@@ -0,0 +1,184 @@
+"""
+Utilidades de paginación por cursor (keyset)
+Evitan OFFSET: cada página continúa desde la última fila entregada
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(values):
+    """
+    Codifica los valores de posición en un cursor opaco
+    
+    Returns:
+        str: Cursor en base64 url-safe
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decodifica un cursor generado por encode_cursor
+    
+    Returns:
+        list: Valores de posición
+    Raises:
+        ValueError: Si el cursor es inválido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Cursor inválido")
+    
+    if not isinstance(values, list):
+        raise ValueError("Cursor inválido")
+    
+    return values
+
+def _cursor_value(value):
+    """Convierte un valor de la BD en un valor serializable para el cursor"""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    
+    if isinstance(value, date):
+        return value.isoformat()
+    
+    if isinstance(value, Decimal):
+        return str(value)
+    
+    return value
+
+def parse_keyset_args(args, sorts, default_sort, default_order):
+    """
+    Valida los query params de paginación por cursor
+    
+    Args:
+        args: request.args
+        sorts: Campos de ordenamiento permitidos
+        default_sort: Campo por defecto
+        default_order: 'asc' o 'desc'
+    
+    Returns:
+        dict: limit, sort, order y after (tupla (valor, id) o None)
+    Raises:
+        ValueError: Si algún parámetro es inválido
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except (ValueError, TypeError):
+        raise ValueError("Parámetros de paginación inválidos")
+    
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+    
+    sort = args.get('sort', default_sort)
+    if sort not in sorts:
+        raise ValueError(f"sort debe ser uno de: {', '.join(sorts)}")
+    
+    order = args.get('order', default_order).lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError("order debe ser asc o desc")
+    
+    after = None
+    cursor = args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor)
+        # El cursor solo es válido para el mismo ordenamiento
+        if len(values) != 4 or values[0] != sort or values[1] != order:
+            raise ValueError("El cursor no corresponde al ordenamiento solicitado")
+        
+        # Los valores terminan como parámetros de la consulta
+        value, last_id = values[2], values[3]
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValueError("Cursor inválido")
+        if value is not None and (not isinstance(value, (str, int, float))
+                                  or isinstance(value, bool)):
+            raise ValueError("Cursor inválido")
+        after = (value, last_id)
+    
+    return {'limit': limit, 'sort': sort, 'order': order, 'after': after}
+
+def keyset_condition(column, id_column, after, descending=False, nullable=False):
+    """
+    Construye la condición SQL para continuar después de (valor, id)
+    
+    Considera el orden de NULL de MySQL: primero en ASC y al final en DESC.
+    
+    Args:
+        column: Columna de ordenamiento
+        id_column: Columna única de desempate
+        after: Tupla (valor, id) de la última fila entregada
+        descending: Si el orden es descendente
+        nullable: Si la columna admite NULL
+    
+    Returns:
+        tuple: (sql, params)
+    """
+    value, last_id = after
+    op = '<' if descending else '>'
+    
+    if value is None:
+        if descending:
+            return f"({column} IS NULL AND {id_column} {op} %s)", [last_id]
+        return (
+            f"(({column} IS NULL AND {id_column} {op} %s) OR {column} IS NOT NULL)",
+            [last_id]
+        )
+    
+    condition = f"({column}, {id_column}) {op} (%s, %s)"
+    if nullable and descending:
+        condition = f"({condition} OR {column} IS NULL)"
+    
+    return condition, [value, last_id]
+
+def keyset_page(result, limit, sort, order, sort_key, id_key='id'):
+    """
+    Recorta el resultado de una consulta con LIMIT limit + 1 y calcula
+    los metadatos de la página
+    
+    Args:
+        result: Filas obtenidas (a lo más limit + 1), como lista de dicts o
+                en formato columnar {'columns', 'rows'}
+        limit: Tamaño de página
+        sort: Campo de ordenamiento solicitado
+        order: 'asc' o 'desc'
+        sort_key: Columna con el valor de ordenamiento
+        id_key: Columna con el ID de desempate
+    
+    Returns:
+        tuple: (filas de la página en el mismo formato, dict de paginación)
+    """
+    columnar = isinstance(result, dict)
+    rows = result['rows'] if columnar else result
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        # La fila extra solo indica que hay más páginas
+        last = rows[-1]
+        if columnar:
+            value = last[result['columns'].index(sort_key)]
+            last_id = last[result['columns'].index(id_key)]
+        else:
+            value, last_id = last[sort_key], last[id_key]
+        
+        next_cursor = encode_cursor([sort, order, _cursor_value(value), last_id])
+    
+    if columnar:
+        rows = {'columns': result['columns'], 'rows': rows}
+    
+    return rows, {
+        'limit': limit,
+        'sort': sort,
+        'order': order,
+        'has_more': has_more,
+        'next_cursor': next_cursor
+    }
@@ -2,7 +2,8 @@
 Utilidades para respuestas HTTP estandarizadas
 """
 
-from flask import jsonify
+from flask import jsonify, request
+from app.timing import timed
 
 def success_response(data=None, message="Operación exitosa", status=200):
     """
@@ -24,7 +25,19 @@ def success_response(data=None, message="Operación exitosa", status=200):
     if data is not None:
         response['data'] = data
     
-    return jsonify(response), status
+    with timed('serialize'):
+        return jsonify(response), status
+
+def is_columnar_request():
+    """
+    Indica si el cliente pidió las listas en formato columnar
+    (?format=columns): {columns: [...], rows: [[...], ...]} en lugar de
+    una lista de objetos que repite los nombres de columna en cada fila
+    
+    Returns:
+        bool: True si format=columns
+    """
+    return request.args.get('format') == 'columns'
 
 def error_response(message="Error en la operación", status=400, errors=None):
     """
@@ -46,7 +59,8 @@ def error_response(message="Error en la operación", status=400, errors=None):
     if errors:
         response['errors'] = errors
     
-    return jsonify(response), status
+    with timed('serialize'):
+        return jsonify(response), status
 
 def created_response(data, message="Recurso creado exitosamente"):
     """Respuesta para recurso creado (201)"""
@@ -0,0 +1,276 @@
+"""
+Utilidades de streaming
+Lectura y escritura incremental de CSV y NDJSON sin cargar todo en memoria
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain
+
+SUPPORTED_FORMATS = ('csv', 'ndjson')
+
+def detect_format(filename=None, content_type=None, default='csv'):
+    """
+    Determina el formato de un archivo por su extensión o Content-Type
+    
+    Returns:
+        str: 'csv' o 'ndjson'
+    """
+    name = (filename or '').lower()
+    mimetype = (content_type or '').lower()
+    
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in mimetype or 'jsonl' in mimetype:
+        return 'ndjson'
+    
+    if name.endswith('.csv') or 'csv' in mimetype:
+        return 'csv'
+    
+    return default
+
+def iter_text_lines(stream, encoding='utf-8-sig'):
+    """
+    Decodifica un stream binario línea por línea
+    
+    Args:
+        stream: Objeto tipo archivo en modo binario
+        encoding: Codificación del contenido (por defecto tolera BOM)
+    
+    Yields:
+        str: Cada línea decodificada (incluye el salto de línea)
+    """
+    first = True
+    for raw_line in stream:
+        if isinstance(raw_line, bytes):
+            line = raw_line.decode(encoding if first else 'utf-8')
+        else:
+            line = raw_line.lstrip('\ufeff') if first else raw_line
+        first = False
+        yield line
+
+def iter_csv_records(stream):
+    """
+    Lee registros de un CSV con encabezado
+    
+    Un error de formato se entrega como ValueError en la fila donde
+    ocurre (igual que las líneas inválidas de NDJSON) y termina la
+    lectura: el consumidor reporta lo ya importado en lugar de fallar.
+    
+    Yields:
+        tuple: (número de fila, dict con los valores o ValueError)
+    """
+    reader = csv.DictReader(iter_text_lines(stream))
+    row_number = 0
+    
+    try:
+        for row_number, record in enumerate(reader, start=1):
+            # Columnas sobrantes quedan bajo la llave None
+            record.pop(None, None)
+            yield row_number, record
+    except csv.Error as e:
+        yield row_number + 1, ValueError(f"CSV inválido, lectura detenida: {str(e)}")
+    except UnicodeDecodeError:
+        yield row_number + 1, ValueError("Texto no es UTF-8 válido, lectura detenida")
+
+def iter_ndjson_records(stream):
+    """
+    Lee registros de un archivo NDJSON (un objeto JSON por línea)
+    
+    Las líneas inválidas se entregan como ValueError para que el
+    consumidor las reporte sin detener la lectura. Una línea que no es
+    UTF-8 válido también se entrega como ValueError, pero termina la
+    lectura (el decodificador no puede continuar).
+    
+    Yields:
+        tuple: (número de fila, dict o ValueError)
+    """
+    row_number = 0
+    lines = iter_text_lines(stream)
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            yield row_number + 1, ValueError("Texto no es UTF-8 válido, lectura detenida")
+            return
+        
+        line = line.strip()
+        if not line:
+            continue
+        
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, ValueError("JSON inválido")
+            continue
+        
+        if not isinstance(record, dict):
+            yield row_number, ValueError("Cada línea debe ser un objeto JSON")
+            continue
+        
+        yield row_number, record
+
+def iter_records(stream, file_format):
+    """
+    Lee registros en el formato indicado
+    
+    Raises:
+        ValueError: Si el formato no está soportado
+    """
+    if file_format == 'csv':
+        return iter_csv_records(stream)
+    
+    if file_format == 'ndjson':
+        return iter_ndjson_records(stream)
+    
+    raise ValueError(
+        f"Formato no soportado: {file_format} (usa {', '.join(SUPPORTED_FORMATS)})"
+    )
+
+def json_default(value):
+    """Serializa tipos de la BD que json no soporta de forma nativa"""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    
+    if isinstance(value, date):
+        return value.isoformat()
+    
+    if isinstance(value, Decimal):
+        return float(value)
+    
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+def prefetch_first(items):
+    """
+    Obtiene el primer elemento de un iterable antes de consumirlo
+    
+    Con generadores de BD (stream_query) la consulta se ejecuta en este
+    momento: un error se propaga antes de enviar el código HTTP en lugar
+    de aparecer a mitad de una respuesta 200.
+    
+    Returns:
+        iterator: Los mismos elementos, empezando por el ya obtenido
+    """
+    items = iter(items)
+    
+    for first in items:
+        return chain([first], items)
+    
+    return iter(())
+
+def iter_csv_chunks(columns, rows, chunk_rows=500):
+    """
+    Convierte filas (dicts) en bloques de texto CSV con encabezado
+    
+    Args:
+        columns: Columnas a escribir, en orden
+        rows: Iterable de dicts
+        chunk_rows: Filas por bloque entregado
+    
+    Yields:
+        str: Bloques de CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    
+    for row in rows:
+        writer.writerow([
+            '' if row[column] is None else row[column]
+            for column in columns
+        ])
+        pending += 1
+        
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    yield buffer.getvalue()
+
+def iter_ndjson_chunks(columns, rows, chunk_rows=500):
+    """
+    Convierte filas (dicts) en bloques NDJSON, un objeto por línea
+    
+    Yields:
+        str: Bloques de NDJSON
+    """
+    lines = []
+    
+    for row in rows:
+        record = {column: row[column] for column in columns}
+        lines.append(json.dumps(record, default=json_default, ensure_ascii=False))
+        
+        if len(lines) >= chunk_rows:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def iter_gzip(chunks, level=6):
+    """
+    Comprime incrementalmente un iterable de bloques de texto o bytes
+    
+    Yields:
+        bytes: Bloques del flujo gzip
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    
+    yield compressor.flush()
+
+def iter_json_envelope(items, key, message, dumps, chunk_size=16384):
+    """
+    Genera incrementalmente la respuesta estándar {success, message, data}
+    con la lista de elementos en data[key]
+    
+    Args:
+        items: Iterable de elementos de la lista
+        key: Llave de la lista dentro de data
+        message: Mensaje descriptivo
+        dumps: Función de serialización JSON por elemento
+        chunk_size: Tamaño aproximado en caracteres de cada bloque
+    
+    Yields:
+        str: Bloques del documento JSON
+    """
+    parts = [
+        '{"success":true,"message":', dumps(message),
+        ',"data":{', dumps(key), ':['
+    ]
+    size = 0
+    first = True
+    
+    for item in items:
+        encoded = dumps(item)
+        if first:
+            first = False
+        else:
+            parts.append(',')
+        parts.append(encoded)
+        size += len(encoded)
+        
+        if size >= chunk_size:
+            yield ''.join(parts)
+            parts = []
+            size = 0
+    
+    parts.append(']}}')
+    yield ''.join(parts)
\ No newline at end of file
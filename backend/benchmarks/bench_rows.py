@@ -0,0 +1,125 @@
+"""
+Benchmark de representación de filas
+Compara memoria y velocidad de las filas del DictCursor (un dict por fila)
+contra el cursor de tuplas con modelos de app.models
+
+Uso: python benchmarks/bench_rows.py [--rows 100000] [--db]
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import CourseRow, RowJSONProvider
+
+# Mismas columnas que CourseService.get_all_courses
+COLUMNS = ('id', 'name', 'description', 'code', 'created_at', 'teacher_name', 'teacher_id')
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark de DictCursor vs modelos con __slots__")
+    parser.add_argument('--rows', type=int, default=100000, help="Filas sintéticas")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por medición")
+    parser.add_argument('--db', action='store_true', help="Medir también contra la BD configurada")
+    return parser.parse_args()
+
+def make_rows(count):
+    """Genera tuplas como las que entrega un cursor de tuplas"""
+    created_at = datetime(2026, 1, 1)
+    return [
+        (i, f"Curso {i}", "Descripción del curso", f"C{i:06d}", created_at, f"teacher{i % 50}", i % 50)
+        for i in range(count)
+    ]
+
+def as_dicts(rows):
+    """Conversión que hace DictCursor: dict(zip(columnas, fila))"""
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+def as_models(rows):
+    """Conversión a modelos con el mapeo de columnas en caché"""
+    row_type = CourseRow.for_columns(COLUMNS)
+    return list(map(row_type, rows))
+
+def best_time(func, *args, repeat=5):
+    """Mejor tiempo (segundos) de varias ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def peak_memory(func, *args):
+    """Memoria retenida (bytes) por el resultado de func"""
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def report(name, rows, seconds, memory):
+    print(f"  {name:<12} {seconds * 1000:9.1f} ms  {rows / seconds:12,.0f} filas/s  "
+          f"{memory / 1024 / 1024:8.2f} MiB  ({memory / rows:.0f} B/fila)")
+
+def bench_synthetic(count, repeat):
+    """Mide la conversión de filas y su serialización a JSON"""
+    rows = make_rows(count)
+    dumps = RowJSONProvider.default
+    
+    print(f"\n📊 Conversión de {count:,} filas (sin BD)")
+    for name, func in (('dict', as_dicts), ('modelo', as_models)):
+        report(name, count, best_time(func, rows, repeat=repeat), peak_memory(func, rows))
+    
+    print(f"\n📊 Serialización JSON de {count:,} filas")
+    dicts, models = as_dicts(rows), as_models(rows)
+    for name, items in (('dict', dicts), ('modelo', models)):
+        seconds = best_time(lambda: json.dumps(items, default=dumps), repeat=repeat)
+        print(f"  {name:<12} {seconds * 1000:9.1f} ms")
+
+def bench_database(repeat):
+    """Mide el listado de cursos real con ambos cursores"""
+    from pymysql.cursors import DictCursor
+    from app.database import get_db, execute_query_rows
+    
+    query = """
+        SELECT c.id, c.name, c.description, c.code, c.created_at,
+               u.username as teacher_name, u.id as teacher_id
+        FROM courses c
+        JOIN users u ON c.teacher_id = u.id
+    """
+    
+    def fetch_dicts():
+        with get_db(DictCursor) as (conn, cursor):
+            cursor.execute(query)
+            return cursor.fetchall()
+    
+    def fetch_models():
+        return execute_query_rows(query, model=CourseRow)
+    
+    count = len(fetch_dicts())
+    if not count:
+        print("\n⚠️  No hay cursos en la BD (ejecuta scripts/seed_data.py)")
+        return
+    
+    print(f"\n📊 Listado de cursos desde la BD ({count:,} filas)")
+    for name, func in (('DictCursor', fetch_dicts), ('Cursor+modelo', fetch_models)):
+        report(name, count, best_time(func, repeat=repeat), peak_memory(func))
+
+if __name__ == '__main__':
+    args = parse_args()
+    
+    print("=" * 50)
+    print("  Benchmark de filas: DictCursor vs __slots__")
+    print("=" * 50)
+    
+    bench_synthetic(args.rows, args.repeat)
+    
+    if args.db:
+        bench_database(args.repeat)
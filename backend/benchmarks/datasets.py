@@ -0,0 +1,191 @@
+"""
+Datasets de benchmark a distintas escalas
+
+Los datos se insertan con SQL directo (inserts multi-fila) en la BD
+configurada y se identifican por prefijo, para poder borrarlos sin tocar
+el resto: usuarios bench_* y cursos BENCH*. Todos los usuarios comparten
+la contraseña BENCH_PASSWORD (un único hash bcrypt).
+
+Los objetos que crean los benchmarks de escritura usan el prefijo
+benchx_ / BENCHX y se borran con drop_scratch().
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+from app.database import execute_many, execute_query
+from app.services.auth_service import AuthService
+
+Scale = namedtuple('Scale', 'enrollments students teachers courses assignments_per_course')
+
+# Cada estudiante se inscribe en enrollments / students cursos
+SCALES = {
+    '1k': Scale(1_000, 200, 10, 20, 5),
+    '100k': Scale(100_000, 10_000, 200, 1_000, 5),
+    '1m': Scale(1_000_000, 50_000, 1_000, 5_000, 5)
+}
+
+BENCH_PASSWORD = 'Bench123!'
+USER_PREFIX = 'bench_'
+COURSE_PREFIX = 'BENCH'
+SCRATCH_USER_PREFIX = 'benchx_'
+SCRATCH_COURSE_PREFIX = 'BENCHX'
+
+INSERT_CHUNK = 5000
+
+def _like(prefix):
+    """Patrón LIKE con los _ escapados"""
+    return prefix.replace('_', '\\_') + '%'
+
+def _insert_in_chunks(query, rows):
+    total = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, INSERT_CHUNK))
+        if not chunk:
+            return total
+        total += execute_many(query, chunk)
+
+def _role_ids():
+    roles = {row['name']: row['id'] for row in execute_query("SELECT id, name FROM roles")}
+    missing = {'admin', 'teacher', 'student'} - set(roles)
+    if missing:
+        raise ValueError(f"Faltan roles en la BD ({', '.join(sorted(missing))}): ejecuta scripts/init_db.py")
+    return roles
+
+def _user_ids(prefix):
+    rows = execute_query(
+        "SELECT id, username FROM users WHERE username LIKE %s",
+        (_like(prefix),)
+    )
+    return {row['username']: row['id'] for row in rows}
+
+def _course_ids():
+    rows = execute_query(
+        "SELECT id, code FROM courses WHERE code LIKE %s AND code NOT LIKE %s",
+        (_like(COURSE_PREFIX), _like(SCRATCH_COURSE_PREFIX))
+    )
+    return {row['code']: row['id'] for row in rows}
+
+def course_indexes(student, scale):
+    """
+    Cursos (índices) en los que se inscribe el estudiante: repartidos con
+    un paso fijo para que todos los cursos tengan inscritos y no se repitan
+    """
+    per_student = scale.enrollments // scale.students
+    stride = scale.courses // per_student
+    return [(student + j * stride) % scale.courses for j in range(per_student)]
+
+def drop_scratch():
+    """Borra los objetos creados por los benchmarks de escritura"""
+    execute_query("DELETE FROM courses WHERE code LIKE %s", (_like(SCRATCH_COURSE_PREFIX),), fetch_all=False)
+    execute_query("DELETE FROM users WHERE username LIKE %s", (_like(SCRATCH_USER_PREFIX),), fetch_all=False)
+
+def drop_dataset():
+    """Borra el dataset de benchmark (las inscripciones y asignaciones caen en cascada)"""
+    drop_scratch()
+    execute_query("DELETE FROM courses WHERE code LIKE %s", (_like(COURSE_PREFIX),), fetch_all=False)
+    execute_query("DELETE FROM users WHERE username LIKE %s", (_like(USER_PREFIX),), fetch_all=False)
+
+def seed_dataset(scale_name, reseed=False):
+    """
+    Crea el dataset de la escala indicada (si no existe ya)
+    
+    Args:
+        scale_name: Clave de SCALES ('1k', '100k', '1m')
+        reseed: Si es True, borra y vuelve a crear el dataset
+    
+    Returns:
+        dict: IDs de muestra (ver load_dataset)
+    Raises:
+        ValueError: Si la escala no existe o faltan roles
+    """
+    if scale_name not in SCALES:
+        raise ValueError(f"Escala inválida: {scale_name} (opciones: {', '.join(SCALES)})")
+    scale = SCALES[scale_name]
+    
+    if not reseed:
+        users = _user_ids(USER_PREFIX)
+        if len(users) == scale.students + scale.teachers + 1 and len(_course_ids()) == scale.courses:
+            return load_dataset(scale_name)
+    
+    drop_dataset()
+    roles = _role_ids()
+    password_hash = AuthService.hash_password(BENCH_PASSWORD)
+    
+    teachers = [f"{USER_PREFIX}t{i}" for i in range(scale.teachers)]
+    students = [f"{USER_PREFIX}s{i}" for i in range(scale.students)]
+    users = (
+        [(f"{USER_PREFIX}admin", roles['admin'])] +
+        [(name, roles['teacher']) for name in teachers] +
+        [(name, roles['student']) for name in students]
+    )
+    _insert_in_chunks(
+        "INSERT INTO users (username, email, password_hash, role_id) VALUES (%s, %s, %s, %s)",
+        ((name, f"{name}@bench.local", password_hash, role_id) for name, role_id in users)
+    )
+    user_ids = _user_ids(USER_PREFIX)
+    
+    _insert_in_chunks(
+        "INSERT INTO courses (name, code, description, teacher_id) VALUES (%s, %s, %s, %s)",
+        (
+            (f"Curso de benchmark {i}", f"{COURSE_PREFIX}{i:06d}", "Curso generado para benchmarks",
+             user_ids[teachers[i % scale.teachers]])
+            for i in range(scale.courses)
+        )
+    )
+    course_ids = _course_ids()
+    courses = [course_ids[f"{COURSE_PREFIX}{i:06d}"] for i in range(scale.courses)]
+    
+    due = datetime.now().replace(microsecond=0) + timedelta(days=7)
+    _insert_in_chunks(
+        "INSERT INTO assignments (title, description, course_id, due_date, max_score) VALUES (%s, %s, %s, %s, %s)",
+        (
+            (f"Tarea {n}", "Tarea generada para benchmarks", course_id, due + timedelta(days=n), 100)
+            for course_id in courses
+            for n in range(scale.assignments_per_course)
+        )
+    )
+    
+    _insert_in_chunks(
+        "INSERT INTO enrollments (student_id, course_id) VALUES (%s, %s)",
+        (
+            (user_ids[name], courses[index])
+            for i, name in enumerate(students)
+            for index in course_indexes(i, scale)
+        )
+    )
+    
+    return load_dataset(scale_name)
+
+def load_dataset(scale_name):
+    """
+    IDs de muestra del dataset ya creado
+    
+    bench_s0 está inscrito en el curso 0, que dicta bench_t0.
+    
+    Returns:
+        dict: scale, admin, teacher, student ({id, username}), course_id,
+              assignment_id y conteos
+    """
+    users = _user_ids(USER_PREFIX)
+    course_id = _course_ids()[f"{COURSE_PREFIX}{0:06d}"]
+    assignment = execute_query(
+        "SELECT MIN(id) as id FROM assignments WHERE course_id = %s",
+        (course_id,),
+        fetch_one=True
+    )
+    
+    def user(name):
+        username = f"{USER_PREFIX}{name}"
+        return {'id': users[username], 'username': username}
+    
+    return {
+        'scale': scale_name,
+        'admin': user('admin'),
+        'teacher': user('t0'),
+        'student': user('s0'),
+        'course_id': course_id,
+        'assignment_id': assignment['id'],
+        'counts': SCALES[scale_name]._asdict()
+    }
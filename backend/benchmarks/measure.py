@@ -0,0 +1,127 @@
+"""
+Medición de latencia y memoria, y comparación contra un baseline
+"""
+
+import json
+import math
+import time
+import tracemalloc
+
+# Métricas que se comparan por defecto contra el baseline
+DEFAULT_METRICS = ('p95_ms', 'alloc_peak_kib')
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano (values no vacío)"""
+    values = sorted(values)
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def summarize(durations):
+    """
+    Args:
+        durations: Duraciones en segundos
+    
+    Returns:
+        dict: iterations, mean_ms, p50_ms, p95_ms, p99_ms y max_ms
+    """
+    ms = [duration * 1000 for duration in durations]
+    return {
+        'iterations': len(ms),
+        'mean_ms': round(sum(ms) / len(ms), 4),
+        'p50_ms': round(percentile(ms, 0.50), 4),
+        'p95_ms': round(percentile(ms, 0.95), 4),
+        'p99_ms': round(percentile(ms, 0.99), 4),
+        'max_ms': round(max(ms), 4)
+    }
+
+def measure(func, iterations=50, warmup=3, setup=None, alloc_iterations=3):
+    """
+    Ejecuta func repetidas veces y resume su latencia y memoria
+    
+    La memoria se mide aparte, con tracemalloc activo, para no inflar las
+    latencias: alloc_peak_kib es el pico asignado durante una llamada y
+    alloc_net_kib lo que queda retenido al terminar.
+    
+    Args:
+        func: Función a medir
+        iterations: Llamadas medidas
+        warmup: Llamadas previas descartadas
+        setup: Función sin medir que retorna los argumentos de cada llamada
+        alloc_iterations: Llamadas medidas con tracemalloc
+    
+    Returns:
+        dict: Resumen (ver summarize) más alloc_peak_kib y alloc_net_kib
+    """
+    def call():
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    
+    for _ in range(warmup):
+        call()
+    
+    result = summarize([call() for _ in range(iterations)])
+    
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            args = setup() if setup else ()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+            retained.append(current - base)
+    finally:
+        tracemalloc.stop()
+    
+    if peaks:
+        result['alloc_peak_kib'] = round(max(peaks) / 1024, 2)
+        result['alloc_net_kib'] = round(max(retained) / 1024, 2)
+    return result
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_results(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(current, baseline, threshold=0.2, metrics=DEFAULT_METRICS, min_delta_ms=0.5):
+    """
+    Busca regresiones de current respecto de baseline
+    
+    Una métrica regresa si supera al baseline en más de threshold (0.2 =
+    20%). En las métricas de tiempo se ignoran diferencias menores a
+    min_delta_ms, que en operaciones de microsegundos son solo ruido.
+    
+    Args:
+        current: {benchmark: resumen} de esta ejecución
+        baseline: {benchmark: resumen} guardado
+        threshold: Aumento relativo tolerado
+        metrics: Métricas a comparar
+        min_delta_ms: Diferencia absoluta mínima en métricas *_ms
+    
+    Returns:
+        list: [(benchmark, métrica, baseline, actual, cambio relativo)]
+    """
+    regressions = []
+    
+    for name, stats in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in metrics:
+            before, after = reference.get(metric), stats.get(metric)
+            if before is None or after is None:
+                continue
+            if metric.endswith('_ms') and after - before < min_delta_ms:
+                continue
+            change = (after - before) / before if before else float('inf')
+            if after > before and change > threshold:
+                regressions.append((name, metric, before, after, change))
+    
+    return regressions
@@ -0,0 +1,348 @@
+"""
+Suite de benchmarks de servicios y endpoints con control de regresiones
+
+Crea (o reutiliza) un dataset de la escala indicada en la BD configurada,
+mide cada método de CourseService, AssignmentService, UserService y
+AuthService, y los endpoints principales a través de app.test_client().
+Guarda p50/p95/p99 y memoria en JSON y compara contra el baseline de la
+escala: termina con código 1 si alguna métrica empeora más del umbral.
+
+Uso: python benchmarks/run_benchmarks.py [--scale 1k|100k|1m] [--iterations 50]
+                                         [--filter Course] [--threshold 0.2]
+                                         [--update-baseline] [--reseed] [--drop]
+"""
+
+import sys
+import os
+import argparse
+import itertools
+import logging
+import platform
+from collections import namedtuple
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.auth import decode_token
+from app.database import backend, execute_query
+from app.services.assignment_service import AssignmentService
+from app.services.auth_service import AuthService
+from app.services.course_service import CourseService
+from app.services.user_service import UserService
+from app.timing import access_logger
+from benchmarks.datasets import (
+    SCALES, BENCH_PASSWORD, SCRATCH_COURSE_PREFIX, SCRATCH_USER_PREFIX,
+    seed_dataset, drop_dataset, drop_scratch
+)
+from benchmarks.measure import DEFAULT_METRICS, measure, compare, load_results, save_results
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Las operaciones con bcrypt tardan cientos de ms: se limitan sus iteraciones
+SLOW_ITERATIONS = 10
+
+# max_iterations: tope de iteraciones (None = las de --iterations)
+Case = namedtuple('Case', 'name func setup max_iterations', defaults=(None, None))
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks de servicios y endpoints")
+    parser.add_argument('--scale', choices=list(SCALES), default='1k', help="Tamaño del dataset (inscripciones)")
+    parser.add_argument('--iterations', type=int, default=50, help="Iteraciones medidas por benchmark")
+    parser.add_argument('--warmup', type=int, default=3, help="Iteraciones descartadas por benchmark")
+    parser.add_argument('--filter', default=None, help="Solo benchmarks cuyo nombre contenga este texto")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Aumento tolerado respecto al baseline (0.2 = 20%%)")
+    parser.add_argument('--metrics', default=','.join(DEFAULT_METRICS), help="Métricas a comparar, separadas por coma")
+    parser.add_argument('--baseline', default=None, help="Archivo baseline (default: benchmarks/baselines/<escala>[-sqlite].json)")
+    parser.add_argument('--output', default=None, help="Archivo de resultados (default: benchmarks/results/<escala>-<fecha>.json)")
+    parser.add_argument('--update-baseline', action='store_true', help="Guardar los resultados como nuevo baseline")
+    parser.add_argument('--reseed', action='store_true', help="Volver a crear el dataset")
+    parser.add_argument('--drop', action='store_true', help="Borrar el dataset de benchmark y salir")
+    parser.add_argument('--config', default='default', help="Configuración de la app (development, production...)")
+    return parser.parse_args()
+
+class Scratch:
+    """Objetos desechables para los benchmarks de escritura (prefijo benchx_/BENCHX)"""
+    
+    def __init__(self, data):
+        self.data = data
+        self.counter = itertools.count()
+        self.password_hash = AuthService.hash_password(BENCH_PASSWORD)
+        self.course_id = self.course()
+        self.student_ids = [row['id'] for row in execute_query(
+            "SELECT id FROM users WHERE username LIKE %s ORDER BY id",
+            ('bench\\_s%',)
+        )]
+        self.enrollments = iter(())
+    
+    def name(self):
+        return f"{next(self.counter):06d}"
+    
+    def course(self):
+        """Curso vacío del profesor de muestra"""
+        return CourseService.create_course(
+            f"Curso temporal {self.name()}",
+            f"{SCRATCH_COURSE_PREFIX}{self.name()}",
+            self.data['teacher']['id']
+        )['id']
+    
+    def assignment(self):
+        return AssignmentService.create_assignment(f"Tarea temporal {self.name()}", self.course_id)['id']
+    
+    def user(self):
+        """Usuario insertado con SQL directo (sin pagar bcrypt en el setup)"""
+        username = f"{SCRATCH_USER_PREFIX}{self.name()}"
+        return execute_query(
+            """INSERT INTO users (username, email, password_hash, role_id)
+               SELECT %s, %s, %s, id FROM roles WHERE name = 'student'""",
+            (username, f"{username}@bench.local", self.password_hash),
+            fetch_all=False
+        )
+    
+    def next_enrollment(self):
+        """(curso, estudiante) aún no inscrito; al agotar los estudiantes usa otro curso"""
+        pair = next(self.enrollments, None)
+        if pair is None:
+            course_id = self.course()
+            self.enrollments = ((course_id, student_id) for student_id in self.student_ids)
+            pair = next(self.enrollments)
+        return pair
+
+def service_cases(data, scratch):
+    """Benchmarks de los métodos de los servicios"""
+    admin, teacher, student = data['admin']['id'], data['teacher']['id'], data['student']['id']
+    course_id, assignment_id = data['course_id'], data['assignment_id']
+    update_course_id = scratch.course()
+    update_assignment_id = scratch.assignment()
+    update_user_id = scratch.user()
+    password_user_id = scratch.user()
+    passwords = itertools.cycle([(BENCH_PASSWORD, 'Bench456!'), ('Bench456!', BENCH_PASSWORD)])
+    token = AuthService.generate_token(student, data['student']['username'], 'student')
+    password_hash = scratch.password_hash
+    
+    cases = []
+    for role, user_id in (('admin', admin), ('teacher', teacher), ('student', student)):
+        cases += [
+            Case(f"CourseService.get_all_courses[{role}]",
+                 lambda user_id=user_id, role=role: CourseService.get_all_courses(user_id, role)),
+            Case(f"CourseService.get_courses_version[{role}]",
+                 lambda user_id=user_id, role=role: CourseService.get_courses_version(user_id, role)),
+            Case(f"AssignmentService.get_all_assignments[{role}]",
+                 lambda user_id=user_id, role=role: AssignmentService.get_all_assignments(user_id, role)),
+            Case(f"AssignmentService.get_assignments_version[{role}]",
+                 lambda user_id=user_id, role=role: AssignmentService.get_assignments_version(user_id, role))
+        ]
+    
+    cases += [
+        Case("CourseService.get_course_by_id", lambda: CourseService.get_course_by_id(course_id)),
+        Case("CourseService.get_course_version[student]",
+             lambda: CourseService.get_course_version(course_id, student, 'student')),
+        Case("CourseService.get_course_owners", lambda: CourseService.get_course_owners([course_id])),
+        Case("CourseService.get_visible_course_ids[student]",
+             lambda: CourseService.get_visible_course_ids(student, 'student')),
+        Case("CourseService.get_enrolled_students", lambda: CourseService.get_enrolled_students(course_id)),
+        Case("CourseService.get_enrolled_students_version[teacher]",
+             lambda: CourseService.get_enrolled_students_version(course_id, teacher, 'teacher')),
+        Case("CourseService.create_course", CourseService.create_course,
+             lambda: (f"Curso temporal {scratch.name()}", f"{SCRATCH_COURSE_PREFIX}{scratch.name()}", teacher)),
+        Case("CourseService.update_course", lambda name: CourseService.update_course(update_course_id, name=name),
+             lambda: (f"Curso actualizado {scratch.name()}",)),
+        Case("CourseService.delete_course", CourseService.delete_course, lambda: (scratch.course(),)),
+        Case("CourseService.enroll_student", CourseService.enroll_student, scratch.next_enrollment),
+        
+        Case("AssignmentService.get_assignments_by_course[student]",
+             lambda: AssignmentService.get_assignments_by_course(course_id, student, 'student')),
+        Case("AssignmentService.get_course_assignments_version[student]",
+             lambda: AssignmentService.get_course_assignments_version(course_id, student, 'student')),
+        Case("AssignmentService.get_assignment_by_id", lambda: AssignmentService.get_assignment_by_id(assignment_id)),
+        Case("AssignmentService.get_assignment_version[student]",
+             lambda: AssignmentService.get_assignment_version(assignment_id, student, 'student')),
+        Case("AssignmentService.create_assignment", AssignmentService.create_assignment,
+             lambda: (f"Tarea temporal {scratch.name()}", scratch.course_id)),
+        Case("AssignmentService.update_assignment",
+             lambda title: AssignmentService.update_assignment(update_assignment_id, title=title),
+             lambda: (f"Tarea actualizada {scratch.name()}",)),
+        Case("AssignmentService.delete_assignment", AssignmentService.delete_assignment,
+             lambda: (scratch.assignment(),)),
+        Case("AssignmentService.bulk_create_assignments[50]",
+             lambda rows: AssignmentService.bulk_create_assignments(rows, admin, 'admin'),
+             lambda: ([{'title': f"Tarea en lote {n}", 'course_id': scratch.course_id} for n in range(50)],)),
+        Case("AssignmentService.clone_course_assignments",
+             lambda target: AssignmentService.clone_course_assignments(course_id, [target], 7, admin, 'admin'),
+             lambda: (scratch.course(),)),
+        
+        Case("UserService.get_all_users", lambda: UserService.get_all_users()),
+        Case("UserService.get_user_by_id", lambda: UserService.get_user_by_id(student)),
+        Case("UserService.create_user", UserService.create_user,
+             lambda: (f"{SCRATCH_USER_PREFIX}{scratch.name()}", f"benchx{scratch.name()}@bench.local", BENCH_PASSWORD),
+             SLOW_ITERATIONS),
+        Case("UserService.update_user", lambda email: UserService.update_user(update_user_id, email=email),
+             lambda: (f"benchx{scratch.name()}@bench.local",)),
+        Case("UserService.delete_user", UserService.delete_user, lambda: (scratch.user(),)),
+        Case("UserService.change_password", lambda old, new: UserService.change_password(password_user_id, old, new),
+             lambda: next(passwords), SLOW_ITERATIONS),
+        
+        Case("AuthService.hash_password", AuthService.hash_password, lambda: (BENCH_PASSWORD,), SLOW_ITERATIONS),
+        Case("AuthService.verify_password", AuthService.verify_password,
+             lambda: (BENCH_PASSWORD, password_hash), SLOW_ITERATIONS),
+        Case("AuthService.generate_token",
+             lambda: AuthService.generate_token(student, data['student']['username'], 'student')),
+        Case("AuthService.login", lambda: AuthService.login(data['student']['username'], BENCH_PASSWORD),
+             max_iterations=SLOW_ITERATIONS),
+        Case("AuthService.register", AuthService.register,
+             lambda: (f"{SCRATCH_USER_PREFIX}{scratch.name()}", f"benchx{scratch.name()}@bench.local", BENCH_PASSWORD),
+             SLOW_ITERATIONS)
+    ]
+    
+    # El token se decodifica en cada petición autenticada
+    cases.append(Case("auth.decode_token", lambda: decode_token(token)))
+    return cases
+
+def endpoint_cases(client, data, scratch):
+    """Benchmarks de punta a punta a través del cliente de prueba"""
+    headers = {
+        role: {
+            'Authorization': f"Bearer {AuthService.generate_token(data[role]['id'], data[role]['username'], role)}",
+            'Content-Type': 'application/json'
+        }
+        for role in ('admin', 'teacher', 'student')
+    }
+    course_id, assignment_id = data['course_id'], data['assignment_id']
+    update_course_id = scratch.course()
+    
+    def call(method, url, role, json=None):
+        def request():
+            response = client.open(url, method=method, headers=headers.get(role), json=json)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {url} respondió {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return request
+    
+    def login():
+        response = client.post('/api/auth/login', json={
+            'username': data['student']['username'],
+            'password': BENCH_PASSWORD
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"POST /api/auth/login respondió {response.status_code}")
+    
+    cases = [
+        Case(f"GET /api/courses[{role}]", call('GET', '/api/courses', role))
+        for role in ('admin', 'teacher', 'student')
+    ]
+    cases += [
+        Case("GET /api/courses/<id>[student]", call('GET', f"/api/courses/{course_id}", 'student')),
+        Case("GET /api/courses/<id>/students[teacher]", call('GET', f"/api/courses/{course_id}/students", 'teacher')),
+        Case("GET /api/courses/<id>/assignments[student]",
+             call('GET', f"/api/courses/{course_id}/assignments", 'student')),
+        Case("GET /api/assignments[student]", call('GET', '/api/assignments', 'student')),
+        Case("GET /api/assignments[teacher]", call('GET', '/api/assignments', 'teacher')),
+        Case("GET /api/assignments/<id>[student]", call('GET', f"/api/assignments/{assignment_id}", 'student')),
+        Case("GET /api/users?page=2[admin]", call('GET', '/api/users?page=2', 'admin')),
+        Case("GET /api/sync[student]", call('GET', '/api/sync', 'student')),
+        Case("PUT /api/courses/<id>[teacher]",
+             lambda name: call('PUT', f"/api/courses/{update_course_id}", 'teacher', {'name': name})(),
+             lambda: (f"Curso actualizado {scratch.name()}",)),
+        Case("POST /api/assignments[teacher]",
+             lambda title: call('POST', '/api/assignments', 'teacher',
+                                {'title': title, 'course_id': scratch.course_id})(),
+             lambda: (f"Tarea temporal {scratch.name()}",)),
+        Case("POST /api/auth/login", login, max_iterations=SLOW_ITERATIONS)
+    ]
+    return cases
+
+def run(cases, iterations, warmup, name_filter=None):
+    """
+    Returns:
+        dict: {benchmark: resumen}
+    """
+    results = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        count = min(iterations, case.max_iterations or iterations)
+        stats = measure(case.func, iterations=count, warmup=min(warmup, count), setup=case.setup)
+        results[case.name] = stats
+        print(f"  {case.name:<58} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} "
+              f"{stats['p99_ms']:9.3f} {stats.get('alloc_peak_kib', 0):10.1f}")
+    return results
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print(f"\n✅ Sin regresiones (umbral {threshold:.0%})")
+        return
+    print(f"\n❌ {len(regressions)} regresiones (umbral {threshold:.0%}):")
+    for name, metric, before, after, change in regressions:
+        print(f"  {name:<58} {metric:<15} {before:10.3f} → {after:10.3f}  (+{change:.0%})")
+
+if __name__ == '__main__':
+    args = parse_args()
+    
+    if args.drop:
+        drop_dataset()
+        print("✅ Dataset de benchmark eliminado")
+        sys.exit(0)
+    
+    print("=" * 50)
+    print(f"  Benchmarks (escala {args.scale})")
+    print("=" * 50)
+    
+    data = seed_dataset(args.scale, reseed=args.reseed)
+    drop_scratch()
+    
+    app = create_app(args.config)
+    # Los benchmarks hacen cientos de peticiones desde la misma IP
+    for limiter in app.extensions.get('limiter', ()):
+        limiter.enabled = False
+    access_logger.setLevel(logging.WARNING)
+    
+    print(f"\n  {'Benchmark':<58} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'pico KiB':>10}")
+    try:
+        with app.app_context():
+            scratch = Scratch(data)
+            results = run(service_cases(data, scratch), args.iterations, args.warmup, args.filter)
+            results.update(run(
+                endpoint_cases(app.test_client(), data, scratch),
+                args.iterations, args.warmup, args.filter
+            ))
+    finally:
+        drop_scratch()
+    
+    document = {
+        'scale': args.scale,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'backend': backend.NAME,
+        'iterations': args.iterations,
+        'results': results
+    }
+    
+    # Cada backend tiene su propio baseline (los tiempos no son comparables)
+    baseline_name = args.scale if backend.NAME == 'mysql' else f"{args.scale}-{backend.NAME}"
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{baseline_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    save_results(output, document)
+    print(f"\n💾 Resultados: {output}")
+    
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{baseline_name}.json")
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        save_results(baseline_path, document)
+        print(f"📌 Baseline actualizado: {baseline_path}")
+        sys.exit(0)
+    
+    if not os.path.exists(baseline_path):
+        print(f"⚠️  No hay baseline en {baseline_path} (usa --update-baseline)")
+        sys.exit(0)
+    
+    regressions = compare(
+        results,
+        load_results(baseline_path)['results'],
+        threshold=args.threshold,
+        metrics=[metric.strip() for metric in args.metrics.split(',') if metric.strip()]
+    )
+    print_regressions(regressions, args.threshold)
+    sys.exit(1 if regressions else 0)
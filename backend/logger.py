@@ -1,22 +1,167 @@
 """
 Sistema de logging centralizado
+
+Los registros se encolan en el hilo que los emite (QueueHandler) y un
+hilo aparte (QueueListener) los escribe en consola y en archivo, así la
+E/S de disco queda fuera del camino de las peticiones.
 """
 
+import atexit
+import copy
+import gzip
+import json
 import logging
 import os
-from datetime import datetime
-from app.config import Config
+import random
+import re
+import shutil
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from queue import SimpleQueue
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s [%(request_id)s]: %(message)s'
+
+class RequestContextFilter(logging.Filter):
+    """Agrega request_id a los registros emitidos durante una petición"""
+    
+    def filter(self, record):
+        request_id = None
+        if has_request_context():
+            request_id = g.get('request_id')
+        record.request_id = request_id or '-'
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Muestreo de registros de alto volumen
+    
+    Solo afecta a los registros emitidos con extra={'sampled': True}
+    (p. ej. el log de accesos de peticiones exitosas); el resto pasa siempre.
+    """
+    
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record):
+        if getattr(record, 'sampled', False):
+            return random.random() < self.rate
+        return True
+
+class TextFormatter(logging.Formatter):
+    """Formato de texto; los campos de extra={'fields': ...} se agregan como clave=valor"""
+    
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+    
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea; los campos de extra={'fields': ...} se incluyen"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage()
+        }
+        
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler para un listener del mismo proceso
+    
+    El prepare() estándar formatea el registro y agrega el traceback al
+    mensaje (quitando exc_info) para poder enviarlo a otro proceso; aquí
+    solo se resuelven los argumentos del mensaje y exc_info llega intacto
+    a los formatters, que lo escriben en su propio campo.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+def _gzip_rotator(source, dest):
+    """Comprime el archivo rotado y elimina el original"""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+def create_file_handler(filename, when='midnight', backup_count=14):
+    """
+    Handler de archivo con rotación por tiempo y compresión gzip
+    
+    La rotación es por proceso: con varios workers, LOG_FILE debe incluir
+    {pid} (como el valor por defecto) para que cada uno escriba y rote su
+    propio archivo.
+    
+    Args:
+        filename: Ruta del archivo ({pid} se reemplaza por el PID)
+        when: Intervalo de rotación (ver TimedRotatingFileHandler)
+        backup_count: Archivos rotados que se conservan
+    
+    Returns:
+        TimedRotatingFileHandler: Con formato JSON
+    """
+    filename = filename.replace('{pid}', str(os.getpid()))
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    handler = TimedRotatingFileHandler(
+        filename,
+        when=when,
+        backupCount=backup_count,
+        encoding='utf-8',
+        delay=True
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(JsonFormatter())
+    return handler
 
 def setup_logger(name):
     """
     Configura y retorna un logger
     
+    La configuración se lee al llamarla (create_app) y no al importar
+    este módulo: app.config ejecuta app/__init__, cuyos módulos importan
+    app_logger desde aquí.
+    
     Args:
         name: Nombre del módulo
-        
+    
     Returns:
         Logger configurado
     """
+    from app.config import Config
+    
     logger = logging.getLogger(name)
     
     # Evitar duplicación de handlers
@@ -25,34 +170,54 @@ def setup_logger(name):
     
     logger.setLevel(logging.DEBUG if Config.DEBUG else logging.INFO)
     
-    # Formato
-    formatter = logging.Formatter(
-        '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-    )
-    
-    # Handler para consola
+    # Handler para consola (texto o JSON según LOG_FORMAT)
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    if Config.LOG_FORMAT == 'json':
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(TextFormatter())
+    handlers = [console_handler]
     
     # Handler para archivo (solo en producción)
-    if not Config.DEBUG:
-        # Crear directorio de logs si no existe
-        log_dir = 'logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        # Archivo con fecha
-        log_file = os.path.join(
-            log_dir, 
-            f'app_{datetime.now().strftime("%Y%m%d")}.log'
-        )
-        
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    if not Config.DEBUG and Config.LOG_FILE:
+        handlers.append(create_file_handler(
+            Config.LOG_FILE,
+            when=Config.LOG_ROTATE_WHEN,
+            backup_count=Config.LOG_BACKUP_COUNT
+        ))
+    
+    # Los filtros se aplican en el hilo que emite (necesitan la petición)
+    queue = SimpleQueue()
+    queue_handler = LocalQueueHandler(queue)
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(SamplingFilter(Config.LOG_SUCCESS_SAMPLE_RATE))
+    logger.addHandler(queue_handler)
+    
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     return logger
 
-# Logger global
-app_logger = setup_logger('academic_system')
\ No newline at end of file
+def init_request_id(app):
+    """
+    Asigna un ID a cada petición (g.request_id) y lo retorna en X-Request-ID
+    
+    Se respeta el X-Request-ID entrante (p. ej. del proxy) si es válido.
+    """
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = incoming if _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+    
+    def add_request_id_header(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    
+    app.before_request_funcs.setdefault(None, []).insert(0, assign_request_id)
+    app.after_request(add_request_id_header)
+
+# Logger global (create_app le agrega los handlers con setup_logger)
+APP_LOGGER_NAME = 'academic_system'
+app_logger = logging.getLogger(APP_LOGGER_NAME)
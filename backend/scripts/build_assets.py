@@ -0,0 +1,224 @@
+"""
+Script para compilar los archivos estáticos del frontend
+Minifica JS y CSS, agrega un hash de contenido al nombre, reescribe las
+referencias en los HTML y genera versiones .gz precomprimidas
+
+Uso: python scripts/build_assets.py [--out ../frontend/dist]
+"""
+
+import sys
+import os
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import re
+import shutil
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.assets import MANIFEST_NAME
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'frontend'))
+
+# Referencias a assets dentro de los HTML: src="js/..." o href="css/..."
+ASSET_REFERENCE = re.compile(r'(src|href)="((?:js|css)/[^"]+)"')
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Compila los archivos estáticos del frontend")
+    parser.add_argument('--src', default=FRONTEND_DIR, help="Carpeta del frontend")
+    parser.add_argument('--out', default=None, help="Carpeta de salida (default: <src>/dist)")
+    parser.add_argument('--no-minify', action='store_true', help="Solo agrega hash y comprime")
+    return parser.parse_args()
+
+def _scan_templates(line, stack):
+    """
+    Actualiza la pila de template literals abiertos al final de la línea
+    
+    La pila tiene '`' por cada template abierto y '{' / '${' por cada
+    llave abierta dentro de una interpolación. Se saltan strings y
+    comentarios para no confundir sus comillas invertidas.
+    
+    Returns:
+        list: La misma pila, actualizada
+    """
+    i = 0
+    while i < len(line):
+        char = line[i]
+        
+        if stack and stack[-1] == '`':
+            if char == '\\':
+                i += 2
+                continue
+            if char == '`':
+                stack.pop()
+            elif line.startswith('${', i):
+                stack.append('${')
+                i += 2
+                continue
+            i += 1
+            continue
+        
+        if line.startswith('//', i):
+            break
+        if line.startswith('/*', i):
+            end = line.find('*/', i + 2)
+            if end == -1:
+                break
+            i = end + 2
+            continue
+        
+        if char in '\'"':
+            i += 1
+            while i < len(line) and line[i] != char:
+                i += 2 if line[i] == '\\' else 1
+        elif char == '`':
+            stack.append('`')
+        elif char == '{' and stack:
+            stack.append('{')
+        elif char == '}' and stack:
+            stack.pop()
+        i += 1
+    
+    return stack
+
+def minify_js(source):
+    """
+    Minificación conservadora de JS basada en líneas
+    
+    Quita comentarios de bloque al inicio de línea (conservando el código
+    que sigue al cierre */), comentarios de línea completos, indentación y
+    líneas vacías. Conserva los saltos de línea para no depender de la
+    inserción automática de punto y coma. Las líneas que empiezan dentro
+    de un template literal (`...`) se copian sin cambios.
+    """
+    lines = []
+    in_comment = False
+    templates = []
+    
+    for line in source.splitlines():
+        if templates and templates[-1] == '`':
+            lines.append(line)
+            _scan_templates(line, templates)
+            continue
+        
+        stripped = line.strip()
+        
+        if in_comment:
+            end = stripped.find('*/')
+            if end == -1:
+                continue
+            stripped = stripped[end + 2:].strip()
+            in_comment = False
+        
+        while stripped.startswith('/*'):
+            end = stripped.find('*/', 2)
+            if end == -1:
+                in_comment = True
+                stripped = ''
+            else:
+                stripped = stripped[end + 2:].strip()
+        
+        if not stripped or stripped.startswith('//'):
+            continue
+        
+        lines.append(stripped)
+        _scan_templates(stripped, templates)
+    
+    return '\n'.join(lines) + '\n'
+
+def minify_css(source):
+    """Minifica CSS: quita comentarios y espacios innecesarios"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    return source.strip() + '\n'
+
+def fingerprint(name, content):
+    """
+    Agrega el hash del contenido al nombre del archivo
+    
+    Returns:
+        str: p. ej. js/auth.3f2a9c1b7d.js
+    """
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+def write_file(out_dir, name, content):
+    """Escribe el archivo y su versión .gz"""
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    with open(path, 'wb') as f:
+        f.write(content)
+    
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+
+def build(src_dir, out_dir, minify=True):
+    """
+    Genera la carpeta de distribución y su manifiesto
+    
+    Returns:
+        dict: Manifiesto (assets originales -> con hash, páginas)
+    """
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    
+    assets = {}
+    sources = sorted(glob.glob(os.path.join(src_dir, 'js', '*.js')))
+    sources += sorted(glob.glob(os.path.join(src_dir, 'css', '*.css')))
+    
+    for path in sources:
+        name = os.path.relpath(path, src_dir).replace(os.sep, '/')
+        
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        
+        if minify:
+            source = minify_js(source) if name.endswith('.js') else minify_css(source)
+        
+        content = source.encode('utf-8')
+        hashed_name = fingerprint(name, content)
+        write_file(out_dir, hashed_name, content)
+        assets[name] = hashed_name
+        
+        original_size = os.path.getsize(path)
+        print(f"✅ {name} -> {hashed_name} ({original_size} -> {len(content)} bytes)")
+    
+    pages = []
+    for path in sorted(glob.glob(os.path.join(src_dir, '*.html'))):
+        name = os.path.basename(path)
+        
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        
+        def replace(match):
+            return f'{match.group(1)}="{assets.get(match.group(2), match.group(2))}"'
+        
+        write_file(out_dir, name, ASSET_REFERENCE.sub(replace, html).encode('utf-8'))
+        pages.append(name)
+        print(f"✅ {name} (referencias reescritas)")
+    
+    manifest = {'assets': assets, 'pages': pages}
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    
+    return manifest
+
+if __name__ == '__main__':
+    args = parse_args()
+    out_dir = args.out or os.path.join(args.src, 'dist')
+    
+    print("=" * 50)
+    print("  Compilación de archivos estáticos")
+    print("=" * 50 + "\n")
+    
+    manifest = build(args.src, out_dir, minify=not args.no_minify)
+    
+    print(f"\n✨ {len(manifest['assets'])} assets y {len(manifest['pages'])} páginas en {out_dir}")
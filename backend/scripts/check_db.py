@@ -1,14 +1,88 @@
 """
 Script de diagnóstico para verificar el estado de la base de datos
+
+Rápido también con tablas de producción: las filas salen de las
+estimaciones del motor (information_schema), los roles y usuarios de
+prueba se buscan por su índice único, y se verifica que existan las
+columnas e índices que espera scripts/init_db.py. Los conteos exactos y
+la búsqueda de filas huérfanas recorren tablas completas: solo con --full.
+
+Uso: python scripts/check_db.py [--full]
 """
 
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import get_db_connection
+from app.config import Config
+from app.database import get_db_connection, backend
+from scripts.init_db import TABLES, EXPECTED_COLUMNS, EXPECTED_INDEXES
+
+EXPECTED_ROLES = ['admin', 'teacher', 'student', 'administrative']
+TEST_USERS = ['admin', 'teacher1', 'student1', 'admin_staff']
+
+# (descripción, consulta que cuenta filas sin referencia válida)
+ORPHAN_CHECKS = [
+    ('usuarios sin rol válido', """
+        SELECT COUNT(*) as total FROM users u
+        LEFT JOIN roles r ON u.role_id = r.id
+        WHERE r.id IS NULL
+    """),
+    ('cursos sin profesor válido', """
+        SELECT COUNT(*) as total FROM courses c
+        LEFT JOIN users u ON c.teacher_id = u.id
+        WHERE u.id IS NULL
+    """),
+    ('asignaciones sin curso válido', """
+        SELECT COUNT(*) as total FROM assignments a
+        LEFT JOIN courses c ON a.course_id = c.id
+        WHERE c.id IS NULL
+    """),
+]
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Diagnóstico de la base de datos")
+    parser.add_argument('--full', action='store_true',
+                        help="Conteos exactos y filas huérfanas (recorre tablas completas)")
+    return parser.parse_args()
+
+def find_existing(cursor, table, column, values):
+    """
+    Busca los valores en una columna con índice único
+    
+    Returns:
+        set: Valores que existen
+    """
+    marks = ', '.join(['%s'] * len(values))
+    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({marks})", tuple(values))
+    return {row[column] for row in cursor.fetchall()}
 
-def check_database():
+def check_schema(cursor):
+    """
+    Verifica las columnas e índices de EXPECTED_COLUMNS y EXPECTED_INDEXES
+    
+    Returns:
+        bool: True si no falta ninguno
+    """
+    schema_ok = True
+    
+    for table, column, _ in EXPECTED_COLUMNS:
+        if not backend.has_column(cursor, table, column):
+            print(f"  ❌ Columna '{table}.{column}' NO EXISTE")
+            schema_ok = False
+    
+    for table, name, columns in EXPECTED_INDEXES:
+        if backend.has_index(cursor, table, name):
+            print(f"  ✅ Índice '{name}' en {table} ({', '.join(columns)})")
+        else:
+            print(f"  ❌ Índice '{name}' en {table} NO EXISTE")
+            schema_ok = False
+    
+    return schema_ok
+
+def check_database(full=False):
     """Verifica el estado de la base de datos"""
     
     print("=" * 70)
@@ -19,24 +93,18 @@ def check_database():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        print("✅ Conexión a base de datos: OK\n")
+        print(f"✅ Conexión a base de datos ({backend.NAME}): OK\n")
         
-        # Verificar que las tablas existen
+        # Existencia y tamaño aproximado en una sola consulta de metadatos
         print("📋 Verificando tablas...")
-        tables = ['roles', 'users', 'courses', 'assignments', 'enrollments']
+        estimates = backend.table_estimates(cursor, TABLES)
         tables_ok = True
         
-        for table in tables:
-            try:
-                cursor.execute(f"SHOW TABLES LIKE '{table}'")
-                result = cursor.fetchone()
-                if result:
-                    print(f"  ✅ Tabla '{table}' existe")
-                else:
-                    print(f"  ❌ Tabla '{table}' NO EXISTE")
-                    tables_ok = False
-            except Exception as e:
-                print(f"  ❌ Error verificando tabla '{table}': {str(e)}")
+        for table in TABLES:
+            if table in estimates:
+                print(f"  ✅ Tabla '{table}' existe (~{estimates[table]:,} registros estimados)")
+            else:
+                print(f"  ❌ Tabla '{table}' NO EXISTE")
                 tables_ok = False
         
         if not tables_ok:
@@ -45,23 +113,23 @@ def check_database():
         
         print("\n✅ Todas las tablas existen\n")
         
-        # Contar registros en cada tabla
-        print("📊 Contando registros...")
+        print("🗂️  Verificando columnas e índices...")
+        schema_ok = check_schema(cursor)
         
-        counts = {}
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) as total FROM {table}")
-            count = cursor.fetchone()['total']
-            counts[table] = count
-            print(f"  • {table}: {count} registros")
+        counts = estimates
+        if full:
+            print("\n📊 Contando registros...")
+            counts = {}
+            for table in TABLES:
+                cursor.execute(f"SELECT COUNT(*) as total FROM {table}")
+                counts[table] = cursor.fetchone()['total']
+                print(f"  • {table}: {counts[table]:,} registros")
         
         # Verificar roles específicos
         print("\n🔍 Verificando roles...")
-        expected_roles = ['admin', 'teacher', 'student', 'administrative']
-        cursor.execute("SELECT name FROM roles")
-        existing_roles = [row['name'] for row in cursor.fetchall()]
+        existing_roles = find_existing(cursor, 'roles', 'name', EXPECTED_ROLES)
         
-        for role in expected_roles:
+        for role in EXPECTED_ROLES:
             if role in existing_roles:
                 print(f"  ✅ Rol '{role}' existe")
             else:
@@ -69,66 +137,38 @@ def check_database():
         
         # Verificar usuarios de prueba
         print("\n👥 Verificando usuarios de prueba...")
-        test_users = ['admin', 'teacher1', 'student1', 'admin_staff']
-        cursor.execute("SELECT username FROM users")
-        existing_users = [row['username'] for row in cursor.fetchall()]
+        existing_users = find_existing(cursor, 'users', 'username', TEST_USERS)
         
-        for user in test_users:
+        for user in TEST_USERS:
             if user in existing_users:
                 print(f"  ✅ Usuario '{user}' existe")
             else:
                 print(f"  ⚠️  Usuario '{user}' NO EXISTE")
         
-        # Verificar integridad referencial
-        print("\n🔗 Verificando integridad referencial...")
-        
-        # Usuarios con roles válidos
-        cursor.execute("""
-            SELECT COUNT(*) as total FROM users u
-            LEFT JOIN roles r ON u.role_id = r.id
-            WHERE r.id IS NULL
-        """)
-        orphan_users = cursor.fetchone()['total']
-        
-        if orphan_users == 0:
-            print(f"  ✅ Todos los usuarios tienen rol válido")
-        else:
-            print(f"  ❌ {orphan_users} usuarios sin rol válido")
-        
-        # Cursos con profesores válidos
-        cursor.execute("""
-            SELECT COUNT(*) as total FROM courses c
-            LEFT JOIN users u ON c.teacher_id = u.id
-            WHERE u.id IS NULL
-        """)
-        orphan_courses = cursor.fetchone()['total']
-        
-        if orphan_courses == 0:
-            print(f"  ✅ Todos los cursos tienen profesor válido")
-        else:
-            print(f"  ❌ {orphan_courses} cursos sin profesor válido")
-        
-        # Asignaciones con cursos válidos
-        cursor.execute("""
-            SELECT COUNT(*) as total FROM assignments a
-            LEFT JOIN courses c ON a.course_id = c.id
-            WHERE c.id IS NULL
-        """)
-        orphan_assignments = cursor.fetchone()['total']
-        
-        if orphan_assignments == 0:
-            print(f"  ✅ Todas las asignaciones tienen curso válido")
+        # Verificar integridad referencial (las claves foráneas la garantizan
+        # salvo cargas con foreign_key_checks=0: snapshot_db, generate_data)
+        orphans = 0
+        if full:
+            print("\n🔗 Verificando integridad referencial...")
+            for description, query in ORPHAN_CHECKS:
+                cursor.execute(query)
+                total = cursor.fetchone()['total']
+                orphans += total
+                
+                if total == 0:
+                    print(f"  ✅ Sin {description}")
+                else:
+                    print(f"  ❌ {total} {description}")
         else:
-            print(f"  ❌ {orphan_assignments} asignaciones sin curso válido")
+            print("\n💡 Conteos exactos e integridad referencial: python scripts/check_db.py --full")
         
         # Resumen final
         print("\n" + "=" * 70)
         
-        all_ok = (tables_ok and 
-                  len(existing_roles) == 4 and 
-                  orphan_users == 0 and 
-                  orphan_courses == 0 and 
-                  orphan_assignments == 0)
+        all_ok = (tables_ok and
+                  schema_ok and
+                  len(existing_roles) == len(EXPECTED_ROLES) and
+                  orphans == 0)
         
         if all_ok:
             print("✅ BASE DE DATOS EN BUEN ESTADO")
@@ -138,7 +178,7 @@ def check_database():
         else:
             print("⚠️  SE ENCONTRARON PROBLEMAS")
             print("\n💡 Sugerencias:")
-            if not tables_ok:
+            if not schema_ok:
                 print("  1. Ejecuta: python scripts/init_db.py")
             if counts['users'] == 0:
                 print("  2. Ejecuta: python scripts/seed_data.py")
@@ -149,20 +189,24 @@ def check_database():
         conn.close()
         
         return all_ok
-        
+    
     except Exception as e:
         print(f"\n❌ Error al verificar base de datos: {str(e)}")
         import traceback
         traceback.print_exc()
         
         print("\n💡 Verifica:")
-        print("  1. MySQL está corriendo")
-        print("  2. Credenciales en .env son correctas")
-        print("  3. Base de datos 'academic_system' existe")
+        if backend.NAME == 'sqlite':
+            print(f"  1. El archivo {Config.SQLITE_PATH} existe (python scripts/init_db.py)")
+        else:
+            print("  1. MySQL está corriendo")
+            print("  2. Credenciales en .env son correctas")
+            print(f"  3. Base de datos '{Config.DATABASE_NAME}' existe")
         print()
         
         return False
 
 if __name__ == '__main__':
-    success = check_database()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    args = parse_args()
+    success = check_database(full=args.full)
+    sys.exit(0 if success else 1)
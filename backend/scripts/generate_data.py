@@ -0,0 +1,444 @@
+"""
+Script para generar datasets sintéticos de gran volumen
+A diferencia de seed_data.py (datos de demostración, fila por fila), genera
+cientos de miles o millones de filas con distribuciones realistas:
+- Cursos por profesor y asignaciones por curso con cola larga (lognormal)
+- Popularidad de cursos tipo Zipf: pocos cursos muy concurridos
+- Inscripciones por estudiante alrededor de la media, sin repetir curso
+- Fechas de inscripción antes del inicio del semestre y entregas repartidas
+
+Los IDs se asignan a partir del máximo actual de cada tabla, por lo que se
+agrega a los datos existentes. Con la misma semilla y fecha de referencia
+el dataset es idéntico. Todos los usuarios generados usan la contraseña
+GENERATED_PASSWORD (un pool pequeño de hashes bcrypt precalculados).
+
+Uso: python scripts/generate_data.py [--preset large] [--students 100000] [--enrollments 2000000]
+                                     [--method insert|load-data] [--seed 42]
+"""
+
+import sys
+import os
+import argparse
+import csv
+import random
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pymysql
+from app.config import Config
+from app.database import get_db_connection, backend
+from app.services.auth_service import AuthService
+from logger import APP_LOGGER_NAME, setup_logger
+
+Params = namedtuple('Params', 'students teachers admins courses enrollments assignments')
+
+PRESETS = {
+    'small': Params(1_000, 50, 2, 200, 20_000, 5_000),
+    'medium': Params(10_000, 500, 3, 2_000, 200_000, 50_000),
+    'large': Params(100_000, 5_000, 5, 20_000, 2_000_000, 500_000)
+}
+
+GENERATED_PASSWORD = 'Generated123!'
+
+# Columnas en el orden en que se generan las filas
+TABLE_COLUMNS = {
+    'users': ('id', 'username', 'email', 'password_hash', 'role_id', 'is_active', 'created_at'),
+    'courses': ('id', 'name', 'description', 'code', 'teacher_id', 'created_at'),
+    'assignments': ('id', 'title', 'description', 'course_id', 'due_date', 'max_score', 'created_at'),
+    'enrollments': ('student_id', 'course_id', 'enrolled_at')
+}
+
+FIRST_NAMES = (
+    'ana', 'luis', 'maria', 'jose', 'carmen', 'juan', 'laura', 'carlos', 'sofia', 'diego',
+    'valentina', 'miguel', 'lucia', 'pedro', 'camila', 'jorge', 'isabel', 'andres', 'paula', 'david',
+    'elena', 'pablo', 'daniela', 'mateo', 'sara', 'tomas', 'julia', 'martin', 'andrea', 'nicolas'
+)
+LAST_NAMES = (
+    'garcia', 'rodriguez', 'gonzalez', 'fernandez', 'lopez', 'martinez', 'sanchez', 'perez',
+    'gomez', 'martin', 'jimenez', 'ruiz', 'hernandez', 'diaz', 'moreno', 'alvarez', 'romero',
+    'torres', 'navarro', 'ramos', 'vargas', 'castro', 'ortiz', 'rubio', 'molina', 'delgado'
+)
+SUBJECTS = (
+    ('MAT', 'Matemáticas'), ('FIS', 'Física'), ('QUI', 'Química'), ('BIO', 'Biología'),
+    ('HIS', 'Historia'), ('LIT', 'Literatura'), ('PRG', 'Programación'), ('BDD', 'Bases de Datos'),
+    ('EST', 'Estadística'), ('ECO', 'Economía'), ('ING', 'Inglés'), ('FIL', 'Filosofía'),
+    ('ART', 'Arte'), ('RED', 'Redes'), ('ALG', 'Algoritmos'), ('CON', 'Contabilidad')
+)
+LEVELS = ('I', 'II', 'III', 'Avanzado', 'Aplicado', 'Introductorio')
+ASSIGNMENT_KINDS = (
+    ('Tarea', 50), ('Quiz', 20), ('Laboratorio', 12), ('Proyecto', 8), ('Ensayo', 6), ('Examen parcial', 4)
+)
+MAX_SCORES = ((100, 60), (50, 15), (20, 15), (10, 10))
+
+# Exponente de la popularidad tipo Zipf de los cursos (0 = uniforme)
+COURSE_POPULARITY_EXPONENT = 0.6
+# Fracción de estudiantes activos
+ACTIVE_STUDENTS = 0.97
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Generador de datasets sintéticos")
+    parser.add_argument('--preset', choices=list(PRESETS), default='small', help="Tamaño base del dataset")
+    for field in Params._fields:
+        parser.add_argument(f"--{field}", type=int, default=None, help=f"Cantidad de {field} (reemplaza el preset)")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla (misma semilla y fecha = mismo dataset)")
+    parser.add_argument('--reference-date', default=None, help="Inicio del semestre YYYY-MM-DD (default: hoy)")
+    parser.add_argument('--method', choices=['insert', 'load-data'], default='insert',
+                        help="Inserts multi-fila o LOAD DATA LOCAL INFILE desde CSV")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Filas por lote (insert)")
+    parser.add_argument('--hash-pool', type=int, default=8, help="Hashes bcrypt distintos a repartir")
+    parser.add_argument('--csv-dir', default=None, help="Conservar los CSV en esta carpeta (load-data)")
+    return parser.parse_args()
+
+def build_params(preset, **overrides):
+    """
+    Parámetros del preset con los valores indicados reemplazados
+    
+    Raises:
+        ValueError: Si las cantidades no son consistentes
+    """
+    params = PRESETS[preset]._replace(**{key: value for key, value in overrides.items() if value is not None})
+    
+    if min(params) < 0 or params.teachers < 1 or params.courses < 1 or params.students < 1:
+        raise ValueError("Se necesita al menos un profesor, un curso y un estudiante")
+    if params.enrollments > params.students * max(1, params.courses // 2):
+        raise ValueError(
+            f"Demasiadas inscripciones: como máximo {params.students * max(1, params.courses // 2)} "
+            f"(cada estudiante en hasta la mitad de los cursos)"
+        )
+    return params
+
+class DatasetGenerator:
+    """
+    Genera las filas de cada tabla como tuplas (ver TABLE_COLUMNS)
+    
+    Cada tabla usa su propio generador aleatorio derivado de la semilla,
+    así el resultado no depende del orden en que se consuman.
+    """
+    
+    def __init__(self, params, seed, start_ids, role_ids, password_hashes, reference_date):
+        """
+        Args:
+            params: Params con las cantidades
+            seed: Semilla
+            start_ids: {tabla: último id existente}
+            role_ids: {nombre de rol: id}
+            password_hashes: Pool de hashes bcrypt
+            reference_date: Inicio del semestre (datetime)
+        """
+        self.params = params
+        self.seed = seed
+        self.role_ids = role_ids
+        self.password_hashes = password_hashes
+        self.semester_start = reference_date
+        
+        first_user = start_ids['users'] + 1
+        self.admin_ids = range(first_user, first_user + params.admins)
+        self.teacher_ids = range(self.admin_ids.stop, self.admin_ids.stop + params.teachers)
+        self.student_ids = range(self.teacher_ids.stop, self.teacher_ids.stop + params.students)
+        self.course_ids = range(start_ids['courses'] + 1, start_ids['courses'] + 1 + params.courses)
+        self.first_assignment_id = start_ids['assignments'] + 1
+    
+    def _random(self, table):
+        return random.Random(f"{self.seed}-{table}")
+    
+    def _timestamp(self, rng, days_before, max_days):
+        """Fecha entre days_before y days_before + max_days días antes del semestre"""
+        seconds = rng.uniform(days_before * 86400, (days_before + max_days) * 86400)
+        return self.semester_start - timedelta(seconds=int(seconds))
+    
+    def users(self):
+        rng = self._random('users')
+        groups = (
+            (self.admin_ids, 'admin', 'academic.edu'),
+            (self.teacher_ids, 'teacher', 'academic.edu'),
+            (self.student_ids, 'student', 'alumnos.academic.edu')
+        )
+        for ids, role, domain in groups:
+            role_id = self.role_ids[role]
+            for user_id in ids:
+                username = f"{rng.choice(FIRST_NAMES)}_{rng.choice(LAST_NAMES)}{user_id}"
+                is_active = role != 'student' or rng.random() < ACTIVE_STUDENTS
+                yield (
+                    user_id, username, f"{username}@{domain}",
+                    self.password_hashes[user_id % len(self.password_hashes)],
+                    role_id, int(is_active), self._timestamp(rng, 0, 730)
+                )
+    
+    def courses(self):
+        rng = self._random('courses')
+        # Cola larga: la mayoría de los profesores dicta pocos cursos
+        weights = [rng.lognormvariate(0, 0.8) for _ in self.teacher_ids]
+        teachers = rng.choices(self.teacher_ids, weights=weights, k=len(self.course_ids))
+        
+        for course_id, teacher_id in zip(self.course_ids, teachers):
+            prefix, subject = rng.choice(SUBJECTS)
+            yield (
+                course_id,
+                f"{subject} {rng.choice(LEVELS)} - Sección {course_id}",
+                f"Curso de {subject.lower()} generado para pruebas de volumen",
+                f"{prefix}{course_id:07d}",
+                teacher_id,
+                self._timestamp(rng, 30, 365)
+            )
+    
+    def assignments(self):
+        rng = self._random('assignments')
+        weights = [rng.lognormvariate(0, 0.6) for _ in self.course_ids]
+        courses = sorted(rng.choices(self.course_ids, weights=weights, k=self.params.assignments))
+        kinds, kind_weights = zip(*ASSIGNMENT_KINDS)
+        kinds = rng.choices(kinds, weights=kind_weights, k=len(courses))
+        scores, score_weights = zip(*MAX_SCORES)
+        scores = rng.choices(scores, weights=score_weights, k=len(courses))
+        
+        number, previous = 0, None
+        for offset, (course_id, kind, max_score) in enumerate(zip(courses, kinds, scores)):
+            number = number + 1 if course_id == previous else 1
+            previous = course_id
+            due_date = (self.semester_start + timedelta(days=rng.randint(7, 120))).replace(
+                hour=rng.choice((9, 12, 18, 23)), minute=59, second=0, microsecond=0
+            )
+            yield (
+                self.first_assignment_id + offset,
+                f"{kind} {number}",
+                None if rng.random() < 0.3 else f"{kind} del curso, entrega individual",
+                course_id,
+                due_date,
+                max_score,
+                due_date - timedelta(days=rng.randint(7, 30))
+            )
+    
+    def enrollment_counts(self, rng):
+        """Inscripciones por estudiante: normal alrededor de la media, suma exacta"""
+        students, total = self.params.students, self.params.enrollments
+        cap = max(1, self.params.courses // 2)
+        mean = total / students
+        counts = [min(cap, max(1, round(rng.gauss(mean, mean * 0.35)))) for _ in range(students)]
+        
+        difference = total - sum(counts)
+        while difference:
+            index = rng.randrange(students)
+            if difference > 0 and counts[index] < cap:
+                counts[index] += 1
+                difference -= 1
+            elif difference < 0 and counts[index] > (1 if total >= students else 0):
+                counts[index] -= 1
+                difference += 1
+        return counts
+    
+    def enrollments(self):
+        rng = self._random('enrollments')
+        courses = list(self.course_ids)
+        rng.shuffle(courses)
+        popularity = [1 / (rank + 1) ** COURSE_POPULARITY_EXPONENT for rank in range(len(courses))]
+        cum_weights, running = [], 0
+        for weight in popularity:
+            running += weight
+            cum_weights.append(running)
+        
+        for student_id, count in zip(self.student_ids, self.enrollment_counts(rng)):
+            chosen = set()
+            while len(chosen) < count:
+                chosen.update(rng.choices(courses, cum_weights=cum_weights, k=count - len(chosen)))
+            for course_id in sorted(chosen):
+                yield (student_id, course_id, self._timestamp(rng, 0, 21))
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _insert_sql(table):
+    columns = TABLE_COLUMNS[table]
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+
+def load_with_inserts(conn, table, rows, chunk_size):
+    """
+    Inserta con sentencias multi-fila (executemany de PyMySQL), un commit por lote
+    
+    Returns:
+        int: Filas insertadas
+    """
+    query = _insert_sql(table)
+    cursor = conn.cursor()
+    total = 0
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            cursor.executemany(query, chunk)
+            conn.commit()
+            total += len(chunk)
+    finally:
+        cursor.close()
+    return total
+
+def _csv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+def write_csv(path, rows):
+    """
+    Escribe las filas en el formato que lee LOAD DATA (\\N = NULL)
+    
+    Returns:
+        int: Filas escritas
+    """
+    total = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            total += 1
+    return total
+
+def load_with_load_data(conn, table, path):
+    """Carga un CSV con LOAD DATA LOCAL INFILE (requiere local_infile en el servidor)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"""LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(TABLE_COLUMNS[table])})""",
+            (path,)
+        )
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+def current_state(conn):
+    """
+    Returns:
+        tuple: ({tabla: MAX(id)}, {rol: id})
+    Raises:
+        ValueError: Si faltan roles
+    """
+    cursor = conn.cursor()
+    try:
+        start_ids = {}
+        for table in ('users', 'courses', 'assignments'):
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) as last_id FROM {table}")
+            start_ids[table] = cursor.fetchone()['last_id']
+        
+        cursor.execute("SELECT id, name FROM roles")
+        role_ids = {row['name']: row['id'] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+    
+    missing = {'admin', 'teacher', 'student'} - set(role_ids)
+    if missing:
+        raise ValueError(f"Faltan roles ({', '.join(sorted(missing))}): ejecuta scripts/init_db.py")
+    return start_ids, role_ids
+
+def generate_data(args):
+    """
+    Genera y carga el dataset; imprime filas y velocidad por tabla
+    
+    Raises:
+        ValueError: Si el backend activo no es MySQL
+    """
+    # La carga usa SET SESSION, LOAD DATA y ANALYZE TABLE de MySQL
+    if backend.NAME != 'mysql':
+        raise ValueError(
+            f"generate_data.py solo funciona con MySQL (backend actual: {backend.NAME}); "
+            "con SQLite usa scripts/seed_data.py"
+        )
+    
+    params = build_params(args.preset, **{field: getattr(args, field) for field in Params._fields})
+    reference_date = (
+        datetime.strptime(args.reference_date, '%Y-%m-%d') if args.reference_date
+        else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    
+    print(f"🔐 Precalculando {args.hash_pool} hashes bcrypt...")
+    password_hashes = AuthService.hash_passwords([GENERATED_PASSWORD] * max(1, args.hash_pool))
+    
+    if args.method == 'load-data':
+        conn = pymysql.connect(
+            **Config.get_database_uri(),
+            cursorclass=pymysql.cursors.DictCursor,
+            local_infile=True
+        )
+    else:
+        conn = get_db_connection()
+    
+    csv_dir = args.csv_dir or tempfile.mkdtemp(prefix='academic-data-')
+    os.makedirs(csv_dir, exist_ok=True)
+    cursor = conn.cursor()
+    
+    try:
+        start_ids, role_ids = current_state(conn)
+        generator = DatasetGenerator(params, args.seed, start_ids, role_ids, password_hashes, reference_date)
+        
+        # Las filas llegan en orden de dependencias y con IDs explícitos:
+        # no hace falta validar cada clave foránea ni unicidad durante la carga
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        
+        started = time.perf_counter()
+        total = 0
+        print(f"\n📦 Generando {params} (semilla {args.seed}, método {args.method})\n")
+        
+        for table in TABLE_COLUMNS:
+            table_started = time.perf_counter()
+            rows = getattr(generator, table)()
+            if args.method == 'load-data':
+                path = os.path.join(csv_dir, f"{table}.csv")
+                write_csv(path, rows)
+                count = load_with_load_data(conn, table, path)
+            else:
+                count = load_with_inserts(conn, table, rows, args.chunk_size)
+            seconds = time.perf_counter() - table_started
+            total += count
+            print(f"  ✅ {table:<12} {count:>10,} filas  {seconds:7.1f} s  {count / max(seconds, 1e-9):>10,.0f} filas/s")
+        
+        cursor.execute(f"ANALYZE TABLE {', '.join(TABLE_COLUMNS)}")
+        cursor.fetchall()
+        
+        seconds = time.perf_counter() - started
+        print(f"\n📊 Total: {total:,} filas en {seconds:.1f} s ({total / max(seconds, 1e-9):,.0f} filas/s)")
+        print(f"🔐 Contraseña de los usuarios generados: {GENERATED_PASSWORD}")
+    finally:
+        try:
+            cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        finally:
+            cursor.close()
+            conn.close()
+            if not args.csv_dir:
+                shutil.rmtree(csv_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    # Sin create_app: los registros de la aplicación van a la consola
+    setup_logger(APP_LOGGER_NAME)
+    
+    print("=" * 60)
+    print("  Generador de Datos Sintéticos")
+    print("=" * 60 + "\n")
+    
+    try:
+        generate_data(parse_args())
+        print("\n✅ Proceso completado exitosamente\n")
+    except ValueError as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {str(e)}")
+        print("\n💡 Sugerencias:")
+        print("  1. Ejecuta primero: python scripts/init_db.py")
+        print("  2. Con --method load-data, el servidor necesita local_infile=ON")
+        print("  3. Revisa el error detallado arriba\n")
+        sys.exit(1)
@@ -0,0 +1,74 @@
+"""
+Script para importar usuarios masivamente desde CSV o NDJSON
+Uso: python scripts/import_users.py usuarios.csv [--format csv|ndjson] [--role student]
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.user_service import UserService
+from app.utils.streaming import detect_format, iter_records
+from logger import APP_LOGGER_NAME, setup_logger
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Importa usuarios desde CSV o NDJSON")
+    parser.add_argument('path', help="Archivo a importar (columnas: username, email, password, role)")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help="Formato del archivo (por defecto se detecta por extensión)")
+    parser.add_argument('--role', default='student', help="Rol para filas sin columna role (default: student)")
+    parser.add_argument('--batch-size', type=int, default=None, help="Registros por lote")
+    parser.add_argument('--max-errors', type=int, default=20, help="Errores a mostrar en pantalla")
+    return parser.parse_args()
+
+def import_users(args):
+    """Importa el archivo y muestra el resumen"""
+    file_format = args.format or detect_format(args.path)
+    
+    print(f"📥 Importando '{args.path}' (formato: {file_format})...\n")
+    
+    started = time.perf_counter()
+    
+    with open(args.path, 'rb') as stream:
+        summary = UserService.import_users(
+            iter_records(stream, file_format),
+            default_role=args.role,
+            batch_size=args.batch_size
+        )
+    
+    elapsed = time.perf_counter() - started
+    
+    print(f"  • Filas procesadas: {summary['processed']}")
+    print(f"  ✅ Usuarios creados: {summary['created']}")
+    print(f"  ❌ Filas con error: {summary['failed']}")
+    print(f"  ⏱️  Tiempo: {elapsed:.1f}s")
+    
+    if summary['errors']:
+        print("\n⚠️  Errores:")
+        for error in summary['errors'][:args.max_errors]:
+            username = f" ({error['username']})" if error['username'] else ''
+            print(f"  • Fila {error['row']}{username}: {error['error']}")
+        
+        remaining = len(summary['errors']) - args.max_errors
+        if remaining > 0:
+            print(f"  ... y {remaining} errores más")
+    
+    return summary['failed'] == 0
+
+if __name__ == '__main__':
+    # Sin create_app: los registros de la aplicación van a la consola
+    setup_logger(APP_LOGGER_NAME)
+    
+    print("=" * 60)
+    print("  Importación de Usuarios")
+    print("=" * 60 + "\n")
+    
+    try:
+        success = import_users(parse_args())
+        print("\n✅ Proceso completado\n" if success else "\n⚠️  Proceso completado con errores\n")
+        sys.exit(0 if success else 1)
+    except Exception as e:
+        print(f"\n❌ Error fatal: {str(e)}")
+        sys.exit(1)
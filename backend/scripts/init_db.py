@@ -1,13 +1,69 @@
 """
 Script para inicializar la base de datos
 Crea todas las tablas necesarias para el sistema
+
+El esquema está escrito en dialecto MySQL; con DATABASE_BACKEND=sqlite
+cada sentencia se traduce (app/backends/sqlite.py)
 """
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import get_db_connection
+from app.database import get_db_connection, backend
+
+# Tablas del sistema en orden de dependencias
+TABLES = ['roles', 'users', 'courses', 'assignments', 'enrollments', 'change_log']
+
+# Columnas agregadas después de la creación inicial del esquema
+# (tabla, columna, definición). updated_at alimenta los ETag de la API.
+UPDATED_AT_DEFINITION = (
+    "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+)
+
+EXPECTED_COLUMNS = [
+    ('users', 'updated_at', UPDATED_AT_DEFINITION),
+    ('courses', 'updated_at', UPDATED_AT_DEFINITION),
+    ('assignments', 'updated_at', UPDATED_AT_DEFINITION),
+]
+
+# Índices agregados después de la creación inicial del esquema
+# (tabla, nombre, columnas). Soportan la paginación por cursor y los
+# MAX(updated_at) de las versiones (ETag) y los filtros de /api/sync
+# del administrador (updated_at / enrolled_at > token) sobre tablas completas.
+EXPECTED_INDEXES = [
+    ('assignments', 'idx_course_due', ('course_id', 'due_date')),
+    ('enrollments', 'idx_course_enrolled', ('course_id', 'enrolled_at')),
+    ('users', 'idx_users_updated', ('updated_at',)),
+    ('courses', 'idx_courses_updated', ('updated_at',)),
+    ('assignments', 'idx_assignments_updated', ('updated_at',)),
+    ('enrollments', 'idx_enrollments_enrolled', ('enrolled_at',)),
+]
+
+def execute_ddl(cursor, statement):
+    """Ejecuta una sentencia del esquema traducida al dialecto del backend"""
+    for translated in backend.translate_ddl(statement):
+        cursor.execute(translated)
+
+def add_missing_columns(cursor):
+    """
+    Crea las columnas de EXPECTED_COLUMNS que no existan
+    (bases de datos creadas con una versión anterior de este script)
+    """
+    for table, column, definition in EXPECTED_COLUMNS:
+        if not backend.has_column(cursor, table, column):
+            execute_ddl(cursor, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            print(f"✅ Columna '{column}' agregada a '{table}'")
+
+def add_missing_indexes(cursor):
+    """
+    Crea los índices de EXPECTED_INDEXES que no existan
+    (bases de datos creadas con una versión anterior de este script)
+    """
+    for table, name, columns in EXPECTED_INDEXES:
+        if not backend.has_index(cursor, table, name):
+            execute_ddl(cursor, f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)})")
+            print(f"✅ Índice '{name}' agregado a '{table}'")
 
 def create_tables():
     """Crea todas las tablas del sistema"""
@@ -19,7 +75,7 @@ def create_tables():
         print("🗄️  Creando tablas...")
         
         # Tabla roles
-        cursor.execute("""
+        execute_ddl(cursor, """
         CREATE TABLE IF NOT EXISTS roles (
             id INT AUTO_INCREMENT PRIMARY KEY,
             name VARCHAR(50) NOT NULL UNIQUE,
@@ -31,7 +87,7 @@ def create_tables():
         print("✅ Tabla 'roles' creada")
         
         # Tabla users
-        cursor.execute("""
+        execute_ddl(cursor, """
         CREATE TABLE IF NOT EXISTS users (
             id INT AUTO_INCREMENT PRIMARY KEY,
             username VARCHAR(50) NOT NULL UNIQUE,
@@ -40,16 +96,18 @@ def create_tables():
             role_id INT NOT NULL,
             is_active BOOLEAN DEFAULT TRUE,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
             FOREIGN KEY (role_id) REFERENCES roles(id) ON DELETE RESTRICT,
             INDEX idx_username (username),
             INDEX idx_email (email),
-            INDEX idx_role (role_id)
+            INDEX idx_role (role_id),
+            INDEX idx_users_updated (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """)
         print("✅ Tabla 'users' creada")
         
         # Tabla courses
-        cursor.execute("""
+        execute_ddl(cursor, """
         CREATE TABLE IF NOT EXISTS courses (
             id INT AUTO_INCREMENT PRIMARY KEY,
             name VARCHAR(100) NOT NULL,
@@ -57,15 +115,17 @@ def create_tables():
             code VARCHAR(20) NOT NULL UNIQUE,
             teacher_id INT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
             FOREIGN KEY (teacher_id) REFERENCES users(id) ON DELETE CASCADE,
             INDEX idx_code (code),
-            INDEX idx_teacher (teacher_id)
+            INDEX idx_teacher (teacher_id),
+            INDEX idx_courses_updated (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """)
         print("✅ Tabla 'courses' creada")
         
         # Tabla assignments
-        cursor.execute("""
+        execute_ddl(cursor, """
         CREATE TABLE IF NOT EXISTS assignments (
             id INT AUTO_INCREMENT PRIMARY KEY,
             title VARCHAR(200) NOT NULL,
@@ -74,15 +134,17 @@ def create_tables():
             due_date DATETIME,
             max_score DECIMAL(5,2) DEFAULT 100.00,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
             FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-            INDEX idx_course (course_id),
-            INDEX idx_due_date (due_date)
+            INDEX idx_course_due (course_id, due_date),
+            INDEX idx_due_date (due_date),
+            INDEX idx_assignments_updated (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """)
         print("✅ Tabla 'assignments' creada")
         
         # Tabla enrollments
-        cursor.execute("""
+        execute_ddl(cursor, """
         CREATE TABLE IF NOT EXISTS enrollments (
             id INT AUTO_INCREMENT PRIMARY KEY,
             student_id INT NOT NULL,
@@ -92,11 +154,33 @@ def create_tables():
             FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
             UNIQUE KEY unique_enrollment (student_id, course_id),
             INDEX idx_student (student_id),
-            INDEX idx_course (course_id)
+            INDEX idx_course_enrolled (course_id, enrolled_at),
+            INDEX idx_enrollments_enrolled (enrolled_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """)
         print("✅ Tabla 'enrollments' creada")
         
+        # Tabla change_log (eliminaciones para /api/sync)
+        execute_ddl(cursor, """
+        CREATE TABLE IF NOT EXISTS change_log (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            entity VARCHAR(20) NOT NULL,
+            entity_id INT NOT NULL,
+            action VARCHAR(10) NOT NULL,
+            course_id INT NOT NULL,
+            teacher_id INT NULL,
+            student_id INT NULL,
+            changed_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_teacher_change (teacher_id, id),
+            INDEX idx_student_change (student_id, id),
+            INDEX idx_course_change (course_id, id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        print("✅ Tabla 'change_log' creada")
+        
+        add_missing_columns(cursor)
+        add_missing_indexes(cursor)
+        
         conn.commit()
         print("\n✨ ¡Base de datos inicializada exitosamente!")
         
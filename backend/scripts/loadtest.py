@@ -0,0 +1,510 @@
+"""
+Script de prueba de carga con una mezcla de perfiles de usuario
+Simula usuarios concurrentes (un hilo por usuario virtual) contra la API
+en ejecución o contra app.test_client():
+- student: lista sus asignaciones y cursos
+- teacher: crea asignaciones e inscribe estudiantes
+- admin: pagina la lista de usuarios
+- login: ráfagas de inicio de sesión
+
+Usa el dataset de benchmarks/datasets.py (usuarios bench_*); lo que crean
+los profesores va a cursos temporales BENCHX que se borran al terminar.
+Reporta throughput, percentiles de latencia y tasa de error por endpoint.
+
+Uso: python scripts/loadtest.py [--url http://localhost:5000 | --test-client]
+                                [--profile ramp | --stages 20x30,20x60,0x10]
+                                [--mix student=60,teacher=15,admin=10,login=15]
+                                [--think-ms 500] [--scale 1k] [--output resumen.json]
+"""
+
+import sys
+import os
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.auth_service import AuthService
+from app.services.course_service import CourseService
+from app.database import execute_query
+from benchmarks.datasets import (
+    SCALES, BENCH_PASSWORD, SCRATCH_COURSE_PREFIX, seed_dataset, drop_scratch
+)
+from benchmarks.measure import percentile
+from logger import APP_LOGGER_NAME, setup_logger
+
+# Etapas: (usuarios al final de la etapa, segundos); el número de usuarios
+# activos cambia linealmente dentro de cada etapa
+PROFILES = {
+    'smoke': '2x5,2x20',
+    'ramp': '50x60,50x120,0x30',
+    'spike': '10x10,10x30,100x5,100x30,10x5,10x30',
+    'soak': '30x60,30x1800,0x30'
+}
+
+DEFAULT_MIX = 'student=60,teacher=15,admin=10,login=15'
+PERSONAS = ('student', 'teacher', 'admin', 'login')
+
+# Inicios de sesión seguidos por ráfaga
+LOGIN_BURST = 5
+USERS_PAGE_SIZE = 50
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Prueba de carga con perfiles de usuario")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', default='http://localhost:5000', help="URL de la API en ejecución")
+    target.add_argument('--test-client', action='store_true', help="Usar app.test_client() en vez de HTTP")
+    parser.add_argument('--profile', choices=list(PROFILES), default='smoke', help="Etapas predefinidas")
+    parser.add_argument('--stages', default=None, help="Etapas usuariosxsegundos separadas por coma (ej. 20x30,20x60,0x10)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Peso de cada perfil (default: {DEFAULT_MIX})")
+    parser.add_argument('--think-ms', type=float, default=500, help="Pausa media entre acciones de un usuario")
+    parser.add_argument('--scale', choices=list(SCALES), default='1k', help="Dataset a usar (se crea si no existe)")
+    parser.add_argument('--report-every', type=float, default=10, help="Segundos entre reportes parciales")
+    parser.add_argument('--output', default=None, help="Guardar el resumen en JSON")
+    return parser.parse_args()
+
+def parse_mix(text):
+    """
+    Args:
+        text: 'student=60,teacher=15,...'
+    
+    Returns:
+        dict: {perfil: peso} con pesos > 0
+    Raises:
+        ValueError: Si un perfil o peso es inválido
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in PERSONAS:
+            raise ValueError(f"Perfil inválido: {name} (opciones: {', '.join(PERSONAS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Peso inválido para {name}: {weight}")
+        if mix[name] < 0:
+            raise ValueError(f"Peso inválido para {name}: {weight}")
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise ValueError("La mezcla no tiene perfiles con peso")
+    return mix
+
+def parse_stages(text):
+    """
+    Args:
+        text: '20x30,20x60,0x10' (usuarios x segundos)
+    
+    Returns:
+        list: [(usuarios, segundos)]
+    Raises:
+        ValueError: Si una etapa es inválida
+    """
+    stages = []
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        users, _, seconds = item.partition('x')
+        try:
+            stage = (int(users), float(seconds))
+        except ValueError:
+            raise ValueError(f"Etapa inválida: {item} (formato usuariosxsegundos)")
+        if stage[0] < 0 or stage[1] <= 0:
+            raise ValueError(f"Etapa inválida: {item}")
+        stages.append(stage)
+    if not stages:
+        raise ValueError("No hay etapas")
+    return stages
+
+def target_users(stages, elapsed):
+    """
+    Usuarios activos a los elapsed segundos
+    
+    Returns:
+        int: Usuarios activos o None si las etapas terminaron
+    """
+    previous = 0
+    for users, seconds in stages:
+        if elapsed < seconds:
+            return round(previous + (users - previous) * elapsed / seconds)
+        elapsed -= seconds
+        previous = users
+    return None
+
+def assign_personas(mix, count):
+    """
+    Perfil de cada usuario virtual, intercalados para que cualquier
+    prefijo (los usuarios activos durante la rampa) respete la mezcla
+    """
+    total = sum(mix.values())
+    assigned = Counter()
+    personas = []
+    for index in range(count):
+        persona = max(mix, key=lambda name: mix[name] / total * (index + 1) - assigned[name])
+        assigned[persona] += 1
+        personas.append(persona)
+    return personas
+
+class Stats:
+    """Latencias y códigos de estado por endpoint (compartido entre hilos)"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.started = time.monotonic()
+    
+    def record(self, endpoint, milliseconds, status):
+        with self.lock:
+            self.latencies[endpoint].append(milliseconds)
+            self.statuses[endpoint][status] += 1
+    
+    def totals(self):
+        with self.lock:
+            requests = sum(len(values) for values in self.latencies.values())
+            errors = sum(
+                count for statuses in self.statuses.values()
+                for status, count in statuses.items() if _is_error(status)
+            )
+        return requests, errors
+    
+    def summary(self, elapsed):
+        """
+        Returns:
+            dict: {endpoint: {requests, rps, p50_ms, p95_ms, p99_ms, max_ms,
+                   error_rate, rate_limited, statuses}}
+        """
+        with self.lock:
+            items = {endpoint: (list(values), Counter(self.statuses[endpoint]))
+                     for endpoint, values in self.latencies.items()}
+        
+        summary = {}
+        for endpoint, (values, statuses) in items.items():
+            errors = sum(count for status, count in statuses.items() if _is_error(status))
+            summary[endpoint] = {
+                'requests': len(values),
+                'rps': round(len(values) / elapsed, 2),
+                'p50_ms': round(percentile(values, 0.50), 2),
+                'p95_ms': round(percentile(values, 0.95), 2),
+                'p99_ms': round(percentile(values, 0.99), 2),
+                'max_ms': round(max(values), 2),
+                'error_rate': round(errors / len(values), 4),
+                'rate_limited': statuses.get(429, 0),
+                'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)}
+            }
+        return summary
+
+def _is_error(status):
+    # 0 = error de conexión o excepción del cliente
+    return status == 0 or status >= 400
+
+class HttpTransport:
+    """HTTP/1.1 con una conexión persistente por hilo"""
+    
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        )
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.local = threading.local()
+    
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = self.connection_class(self.netloc, timeout=30)
+        return connection
+    
+    def request(self, method, path, headers, body=None):
+        """
+        Returns:
+            int: Código de estado
+        """
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self._reset()
+                return response.status
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # El servidor cerró la conexión reutilizada: reintentar con una nueva
+                self._reset()
+                if attempt:
+                    raise
+    
+    def _reset(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+        self.local.connection = None
+
+class TestClientTransport:
+    """app.test_client() (uno por hilo), sin servidor ni red"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+    
+    def request(self, method, path, headers, body=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client.open(path, method=method, headers=headers, json=body).status_code
+
+class VirtualUser:
+    """Usuario virtual: repite las acciones de su perfil con pausas"""
+    
+    def __init__(self, index, persona, context, transport, stats, think_seconds):
+        self.index = index
+        self.persona = persona
+        self.context = context
+        self.transport = transport
+        self.stats = stats
+        self.think_seconds = think_seconds
+        self.random = random.Random(index)
+        self.headers = {'Content-Type': 'application/json'}
+        self.counter = 0
+        self.user = None
+        self.course_id = None
+        self.enroll_queue = []
+    
+    def setup(self):
+        """Token del usuario y, para profesores, un curso temporal propio"""
+        if self.persona == 'login':
+            return
+        users = self.context[self.persona]
+        self.user = users[self.index % len(users)]
+        token = AuthService.generate_token(self.user['id'], self.user['username'], self.persona)
+        self.headers = dict(self.headers, Authorization=f"Bearer {token}")
+        
+        if self.persona == 'teacher':
+            self.course_id = CourseService.create_course(
+                f"Curso de carga {self.index}",
+                f"{SCRATCH_COURSE_PREFIX}L{self.index:05d}",
+                self.user['id']
+            )['id']
+            self.enroll_queue = [student['id'] for student in self.context['student']]
+            self.random.shuffle(self.enroll_queue)
+    
+    def call(self, method, endpoint, path, body=None):
+        start = time.perf_counter()
+        try:
+            status = self.transport.request(method, path, self.headers, body)
+        except Exception:
+            status = 0
+        self.stats.record(f"{method} {endpoint}", (time.perf_counter() - start) * 1000, status)
+        return status
+    
+    def act(self):
+        """Una acción del perfil"""
+        self.counter += 1
+        choice = self.random.random()
+        
+        if self.persona == 'student':
+            if choice < 0.7:
+                self.call('GET', '/api/assignments', '/api/assignments')
+            elif choice < 0.9:
+                self.call('GET', '/api/courses', '/api/courses')
+            else:
+                course_id = self.random.choice(self.context['student_courses'].get(self.user['id']) or [0])
+                self.call('GET', '/api/courses/<id>/assignments', f"/api/courses/{course_id}/assignments")
+        
+        elif self.persona == 'teacher':
+            if choice < 0.4:
+                self.call('POST', '/api/assignments', '/api/assignments', {
+                    'title': f"Tarea de carga {self.index}-{self.counter}",
+                    'course_id': self.course_id
+                })
+            elif choice < 0.7 and self.enroll_queue:
+                self.call('POST', '/api/courses/<id>/enroll', f"/api/courses/{self.course_id}/enroll", {
+                    'student_id': self.enroll_queue.pop()
+                })
+            else:
+                self.call('GET', '/api/courses/<id>/students', f"/api/courses/{self.course_id}/students")
+        
+        elif self.persona == 'admin':
+            page = self.counter % self.context['user_pages'] + 1
+            self.call('GET', '/api/users?page=<n>', f"/api/users?page={page}&limit={USERS_PAGE_SIZE}")
+        
+        else:
+            for _ in range(LOGIN_BURST):
+                student = self.random.choice(self.context['student'])
+                self.call('POST', '/api/auth/login', '/api/auth/login', {
+                    'username': student['username'],
+                    'password': BENCH_PASSWORD
+                })
+    
+    def run(self, schedule, stop):
+        """Actúa mientras el índice del usuario esté dentro de los activos"""
+        while not stop.is_set():
+            if self.index >= schedule.active:
+                stop.wait(0.2)
+                continue
+            self.act()
+            stop.wait(self.think_seconds * self.random.uniform(0.5, 1.5))
+
+class Schedule:
+    """Número de usuarios activos según las etapas"""
+    
+    def __init__(self, stages):
+        self.stages = stages
+        self.active = 0
+    
+    def update(self, elapsed):
+        """
+        Returns:
+            bool: False cuando terminaron las etapas
+        """
+        users = target_users(self.stages, elapsed)
+        if users is None:
+            self.active = 0
+            return False
+        self.active = users
+        return True
+
+def load_context(data):
+    """Usuarios del dataset por perfil y cursos de cada estudiante"""
+    rows = execute_query(
+        """SELECT u.id, u.username, r.name as role_name
+           FROM users u JOIN roles r ON u.role_id = r.id
+           WHERE u.username LIKE %s""",
+        ('bench\\_%',)
+    )
+    context = {'student': [], 'teacher': [], 'admin': []}
+    for row in rows:
+        if row['role_name'] in context:
+            context[row['role_name']].append({'id': row['id'], 'username': row['username']})
+    
+    student_courses = defaultdict(list)
+    for row in execute_query(
+        """SELECT e.student_id, e.course_id FROM enrollments e
+           JOIN users u ON e.student_id = u.id
+           WHERE u.username LIKE %s""",
+        ('bench\\_s%',)
+    ):
+        student_courses[row['student_id']].append(row['course_id'])
+    context['student_courses'] = student_courses
+    
+    total_users = execute_query("SELECT COUNT(*) as total FROM users", fetch_one=True)['total']
+    context['user_pages'] = max(1, -(-total_users // USERS_PAGE_SIZE))
+    return context
+
+def print_summary(summary, elapsed):
+    print(f"\n{'Endpoint':<40} {'n':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'error %':>8} {'429':>6}")
+    for endpoint, item in sorted(summary.items(), key=lambda pair: -pair[1]['requests']):
+        print(f"{endpoint:<40} {item['requests']:>7} {item['rps']:>8.1f} {item['p50_ms']:>8.1f} "
+              f"{item['p95_ms']:>8.1f} {item['p99_ms']:>8.1f} {item['max_ms']:>8.1f} "
+              f"{item['error_rate'] * 100:>7.1f}% {item['rate_limited']:>6}")
+    
+    requests = sum(item['requests'] for item in summary.values())
+    errors = sum(round(item['error_rate'] * item['requests']) for item in summary.values())
+    limited = sum(item['rate_limited'] for item in summary.values())
+    print(f"\nTotal: {requests} peticiones en {elapsed:.1f} s ({requests / elapsed:.1f} req/s), "
+          f"{errors} errores ({errors / max(requests, 1):.1%})")
+    if limited:
+        print(f"⚠️  {limited} respuestas 429: inicia el servidor con RATELIMIT_ENABLED=false para medir capacidad")
+
+def main(args):
+    mix = parse_mix(args.mix)
+    stages = parse_stages(args.stages or PROFILES[args.profile])
+    max_users = max(users for users, _ in stages)
+    
+    data = seed_dataset(args.scale)
+    context = load_context(data)
+    
+    if args.test_client:
+        from app import create_app
+        app = create_app(os.getenv('FLASK_ENV', 'development'))
+        for limiter in app.extensions.get('limiter', ()):
+            limiter.enabled = False
+        transport = TestClientTransport(app)
+        target = 'app.test_client()'
+    else:
+        transport = HttpTransport(args.url)
+        target = args.url
+    
+    print("=" * 50)
+    print(f"  Prueba de carga: {target}")
+    print(f"  Hasta {max_users} usuarios, {sum(seconds for _, seconds in stages):.0f} s, mezcla {mix}")
+    print("=" * 50)
+    
+    stats = Stats()
+    schedule = Schedule(stages)
+    stop = threading.Event()
+    users = [
+        VirtualUser(index, persona, context, transport, stats, args.think_ms / 1000)
+        for index, persona in enumerate(assign_personas(mix, max_users))
+    ]
+    
+    try:
+        drop_scratch()
+        for user in users:
+            user.setup()
+        threads = [
+            threading.Thread(target=user.run, args=(schedule, stop), name=f"vu-{user.index}", daemon=True)
+            for user in users
+        ]
+        
+        started = stats.started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        
+        next_report = args.report_every
+        last_requests = 0
+        while schedule.update(time.monotonic() - started):
+            time.sleep(0.2)
+            elapsed = time.monotonic() - started
+            if elapsed >= next_report:
+                requests, errors = stats.totals()
+                print(f"  t={elapsed:6.0f} s  usuarios={schedule.active:4d}  "
+                      f"req/s={(requests - last_requests) / args.report_every:8.1f}  "
+                      f"errores={errors / max(requests, 1):6.1%}")
+                last_requests = requests
+                next_report += args.report_every
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrumpido")
+    finally:
+        stop.set()
+        elapsed = time.monotonic() - stats.started
+        for thread in threading.enumerate():
+            if thread.name.startswith('vu-'):
+                thread.join(timeout=30)
+        drop_scratch()
+    
+    summary = stats.summary(elapsed)
+    if not summary:
+        print("No se hicieron peticiones")
+        return
+    
+    print_summary(summary, elapsed)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'target': target,
+                'stages': stages,
+                'mix': mix,
+                'elapsed_seconds': round(elapsed, 2),
+                'endpoints': summary
+            }, f, indent=2)
+        print(f"💾 Resumen: {args.output}")
+
+if __name__ == '__main__':
+    args = parse_args()
+    # Sin create_app (modo HTTP): los registros de la aplicación van a la consola
+    setup_logger(APP_LOGGER_NAME)
+    
+    try:
+        main(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
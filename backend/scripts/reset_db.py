@@ -33,7 +33,7 @@ def reset_database():
         cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
         
         # Eliminar datos de todas las tablas (en orden inverso de dependencias)
-        tables = ['enrollments', 'assignments', 'courses', 'users', 'roles']
+        tables = ['change_log', 'enrollments', 'assignments', 'courses', 'users', 'roles']
         
         for table in tables:
             cursor.execute(f"DELETE FROM {table}")
@@ -1,6 +1,9 @@
 """
 Script para cargar datos de prueba en la base de datos
 VERSIÓN MEJORADA - Con manejo robusto de errores
+
+Carga un conjunto pequeño con credenciales conocidas. Para volúmenes
+realistas usar scripts/generate_data.py.
 """
 
 import sys
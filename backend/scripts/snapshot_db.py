@@ -0,0 +1,381 @@
+"""
+Script para guardar y restaurar snapshots de la base de datos
+Más rápido que reset_db.py + seed/generate_data.py para volver a un
+dataset conocido antes de cada benchmark o prueba de carga:
+
+- save: lee todas las tablas en una transacción con snapshot consistente
+  y las escribe como TSV comprimido con gzip (formato de LOAD DATA)
+- restore: TRUNCATE de cada tabla, carga masiva con LOAD DATA LOCAL INFILE
+  (o inserts multi-fila) con las claves foráneas desactivadas y los
+  índices secundarios reconstruidos al final, en una sola pasada por tabla
+
+USAR CON PRECAUCIÓN - restore reemplaza todos los datos
+
+Uso: python scripts/snapshot_db.py save NOMBRE
+     python scripts/snapshot_db.py restore NOMBRE [--method insert] [--yes]
+     python scripts/snapshot_db.py list
+"""
+
+import sys
+import os
+import argparse
+import gzip
+import json
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pymysql
+from pymysql.cursors import DictCursor, SSCursor
+from app.config import Config
+from app.database import get_db_connection, backend
+from scripts.init_db import TABLES
+
+SNAPSHOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'snapshots'))
+MANIFEST_NAME = 'manifest.json'
+FETCH_SIZE = 10000
+INSERT_CHUNK = 10000
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+_ESCAPED = re.compile(r'\\(.)', re.DOTALL)
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Snapshots de la base de datos")
+    parser.add_argument('--dir', default=SNAPSHOT_DIR, help=f"Carpeta de snapshots (default: {SNAPSHOT_DIR})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    save = commands.add_parser('save', help="Guardar un snapshot")
+    save.add_argument('name')
+    save.add_argument('--level', type=int, default=6, help="Nivel de compresión gzip (1-9)")
+    save.add_argument('--force', action='store_true', help="Reemplazar un snapshot existente")
+    
+    restore = commands.add_parser('restore', help="Restaurar un snapshot (reemplaza los datos)")
+    restore.add_argument('name')
+    restore.add_argument('--method', choices=['load-data', 'insert'], default='load-data',
+                         help="LOAD DATA LOCAL INFILE (requiere local_infile=ON) o inserts multi-fila")
+    restore.add_argument('--yes', action='store_true', help="No pedir confirmación")
+    
+    commands.add_parser('list', help="Listar snapshots")
+    return parser.parse_args()
+
+def encode_value(value):
+    """Valor en el formato de LOAD DATA por defecto (\\N = NULL, escapes con \\)"""
+    if value is None:
+        return '\\N'
+    return str(value).translate(_ESCAPES)
+
+def decode_value(text):
+    """Inverso de encode_value"""
+    if text == '\\N':
+        return None
+    return _ESCAPED.sub(lambda match: _UNESCAPES.get(match.group(1), match.group(1)), text)
+
+def encode_row(row):
+    return '\t'.join(map(encode_value, row)) + '\n'
+
+def decode_line(line):
+    return [decode_value(field) for field in line.rstrip('\n').split('\t')]
+
+def _connect():
+    """Conexión propia con LOAD DATA LOCAL habilitado"""
+    return pymysql.connect(**Config.get_database_uri(), cursorclass=DictCursor, local_infile=True)
+
+def table_columns(cursor, table):
+    cursor.execute(
+        """SELECT column_name AS name FROM information_schema.columns
+           WHERE table_schema = DATABASE() AND table_name = %s
+           ORDER BY ordinal_position""",
+        (table,)
+    )
+    return [row['name'] for row in cursor.fetchall()]
+
+def rebuildable_indexes(cursor, table):
+    """
+    Índices secundarios que se pueden quitar durante la carga
+    
+    Se conservan la clave primaria, los índices únicos y los que empiezan
+    por una columna con clave foránea (MySQL no permite quitarlos).
+    
+    Returns:
+        list: [(nombre, [columnas])]
+    """
+    cursor.execute(
+        """SELECT column_name AS name FROM information_schema.key_column_usage
+           WHERE table_schema = DATABASE() AND table_name = %s
+             AND referenced_table_name IS NOT NULL""",
+        (table,)
+    )
+    foreign_keys = {row['name'] for row in cursor.fetchall()}
+    
+    cursor.execute(
+        """SELECT index_name AS name, column_name AS column_name, sub_part
+           FROM information_schema.statistics
+           WHERE table_schema = DATABASE() AND table_name = %s
+             AND index_name <> 'PRIMARY' AND non_unique = 1
+           ORDER BY index_name, seq_in_index""",
+        (table,)
+    )
+    indexes = {}
+    for row in cursor.fetchall():
+        column = f"{row['column_name']}({row['sub_part']})" if row['sub_part'] else row['column_name']
+        indexes.setdefault(row['name'], []).append((row['column_name'], column))
+    
+    return [
+        (name, [column for _, column in columns])
+        for name, columns in indexes.items()
+        if columns[0][0] not in foreign_keys
+    ]
+
+def save_snapshot(directory, name, level=6, force=False):
+    """
+    Guarda todas las tablas en directory/name
+    
+    Returns:
+        dict: Manifiesto del snapshot
+    Raises:
+        ValueError: Si el snapshot ya existe y no se indicó force
+    """
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        if not force:
+            raise ValueError(f"El snapshot '{name}' ya existe (usa --force para reemplazarlo)")
+        shutil.rmtree(path)
+    os.makedirs(path)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    manifest = {
+        'name': name,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'database': Config.DATABASE_NAME,
+        'tables': {}
+    }
+    
+    try:
+        # Todas las tablas ven el mismo instante aunque la app siga escribiendo
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+        for table in TABLES:
+            started = time.perf_counter()
+            columns = table_columns(cursor, table)
+            file_name = f"{table}.tsv.gz"
+            rows = 0
+            
+            stream = conn.cursor(SSCursor)
+            try:
+                stream.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+                with gzip.open(os.path.join(path, file_name), 'wt', encoding='utf-8',
+                               compresslevel=level, newline='') as f:
+                    while True:
+                        batch = stream.fetchmany(FETCH_SIZE)
+                        if not batch:
+                            break
+                        f.writelines(map(encode_row, batch))
+                        rows += len(batch)
+            finally:
+                stream.close()
+            
+            size = os.path.getsize(os.path.join(path, file_name))
+            manifest['tables'][table] = {'columns': columns, 'rows': rows, 'file': file_name, 'bytes': size}
+            print(f"  ✅ {table:<12} {rows:>10,} filas  {size / 1024 / 1024:8.2f} MiB  "
+                  f"{time.perf_counter() - started:6.1f} s")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        shutil.rmtree(path, ignore_errors=True)
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    
+    with open(os.path.join(path, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest(directory, name):
+    """
+    Raises:
+        ValueError: Si el snapshot no existe
+    """
+    path = os.path.join(directory, name, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"No existe el snapshot '{name}' en {directory}")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_data(cursor, table, columns, path, work_dir):
+    """Descomprime el archivo y lo carga con LOAD DATA LOCAL INFILE"""
+    plain = os.path.join(work_dir, f"{table}.tsv")
+    with gzip.open(path, 'rb') as source, open(plain, 'wb') as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 ({', '.join(columns)})",
+            (plain,)
+        )
+        return cursor.rowcount
+    finally:
+        os.remove(plain)
+
+def _insert(conn, cursor, table, columns, path):
+    """Carga el archivo con inserts multi-fila por lotes"""
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    total = 0
+    batch = []
+    with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+        for line in f:
+            batch.append(decode_line(line))
+            if len(batch) >= INSERT_CHUNK:
+                cursor.executemany(query, batch)
+                conn.commit()
+                total += len(batch)
+                batch = []
+    if batch:
+        cursor.executemany(query, batch)
+        total += len(batch)
+    return total
+
+def restore_snapshot(directory, name, method='load-data'):
+    """
+    Reemplaza los datos de todas las tablas por los del snapshot
+    
+    Raises:
+        ValueError: Si el snapshot no existe o no coincide con el esquema
+    """
+    manifest = load_manifest(directory, name)
+    path = os.path.join(directory, name)
+    conn = _connect()
+    cursor = conn.cursor()
+    work_dir = tempfile.mkdtemp(prefix='academic-restore-')
+    dropped = {}
+    started = time.perf_counter()
+    
+    try:
+        for table in TABLES:
+            saved = manifest['tables'].get(table)
+            if saved is None:
+                raise ValueError(f"El snapshot no incluye la tabla '{table}'")
+            missing = set(saved['columns']) - set(table_columns(cursor, table))
+            if missing:
+                raise ValueError(
+                    f"La tabla '{table}' no tiene las columnas {sorted(missing)}: ejecuta scripts/init_db.py"
+                )
+        
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        
+        for table in TABLES:
+            table_started = time.perf_counter()
+            columns = manifest['tables'][table]['columns']
+            file_path = os.path.join(path, manifest['tables'][table]['file'])
+            
+            cursor.execute(f"TRUNCATE TABLE {table}")
+            indexes = rebuildable_indexes(cursor, table)
+            if indexes:
+                cursor.execute(
+                    f"ALTER TABLE {table} " + ', '.join(f"DROP INDEX {index}" for index, _ in indexes)
+                )
+                dropped[table] = indexes
+            
+            if method == 'load-data':
+                rows = _load_data(cursor, table, columns, file_path, work_dir)
+            else:
+                rows = _insert(conn, cursor, table, columns, file_path)
+            conn.commit()
+            print(f"  ✅ {table:<12} {rows:>10,} filas  {time.perf_counter() - table_started:6.1f} s")
+    finally:
+        # Los índices se reconstruyen aunque la carga falle a mitad de camino
+        for table, indexes in dropped.items():
+            index_started = time.perf_counter()
+            cursor.execute(
+                f"ALTER TABLE {table} " +
+                ', '.join(f"ADD INDEX {index} ({', '.join(columns)})" for index, columns in indexes)
+            )
+            print(f"  🔧 {table:<12} {len(indexes)} índices reconstruidos  "
+                  f"{time.perf_counter() - index_started:6.1f} s")
+        try:
+            cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        finally:
+            cursor.close()
+            conn.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    conn = _connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"ANALYZE TABLE {', '.join(TABLES)}")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+    
+    print(f"\n⏱️  Restaurado en {time.perf_counter() - started:.1f} s")
+    return manifest
+
+def require_mysql():
+    """
+    Verifica que el backend activo sea MySQL (save y restore usan
+    START TRANSACTION WITH CONSISTENT SNAPSHOT, SSCursor y LOAD DATA)
+    
+    Raises:
+        ValueError: Si el backend es otro
+    """
+    if backend.NAME != 'mysql':
+        raise ValueError(f"snapshot_db.py solo funciona con MySQL (backend actual: {backend.NAME})")
+
+def list_snapshots(directory):
+    """Imprime los snapshots disponibles"""
+    names = sorted(
+        entry for entry in os.listdir(directory)
+        if os.path.exists(os.path.join(directory, entry, MANIFEST_NAME))
+    ) if os.path.isdir(directory) else []
+    
+    if not names:
+        print(f"No hay snapshots en {directory}")
+        return
+    
+    for name in names:
+        manifest = load_manifest(directory, name)
+        tables = manifest['tables']
+        size = sum(item['bytes'] for item in tables.values())
+        counts = ', '.join(f"{table} {item['rows']:,}" for table, item in tables.items())
+        print(f"  • {name:<20} {manifest['created_at']}  {size / 1024 / 1024:8.2f} MiB  ({counts})")
+
+def confirm_restore(name):
+    """Solicita confirmación del usuario"""
+    print(f"\n⚠️  ADVERTENCIA: Se reemplazarán TODOS los datos de '{Config.DATABASE_NAME}' por el snapshot '{name}'")
+    response = input("\n¿Estás seguro de que quieres continuar? (escribe 'SI' para confirmar): ")
+    return response.strip().upper() == 'SI'
+
+if __name__ == '__main__':
+    args = parse_args()
+    
+    print("=" * 60)
+    print("  Snapshots de Base de Datos")
+    print("=" * 60 + "\n")
+    
+    try:
+        if args.command != 'list':
+            require_mysql()
+        
+        if args.command == 'save':
+            save_snapshot(args.dir, args.name, level=args.level, force=args.force)
+            print(f"\n✅ Snapshot '{args.name}' guardado en {os.path.join(args.dir, args.name)}\n")
+        elif args.command == 'restore':
+            if not args.yes and not confirm_restore(args.name):
+                print("\n❌ Operación cancelada por el usuario")
+                sys.exit(1)
+            restore_snapshot(args.dir, args.name, method=args.method)
+            print(f"\n✅ Snapshot '{args.name}' restaurado\n")
+        else:
+            list_snapshots(args.dir)
+    except ValueError as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        print("\n💡 Con --method load-data el servidor necesita local_infile=ON (o usa --method insert)\n")
+        sys.exit(1)
@@ -0,0 +1,204 @@
+"""
+Script para analizar las trazas exportadas por app/tracing.py
+Muestra las peticiones más lentas con su árbol de spans y el camino
+crítico (la cadena de operaciones que determina la duración total), y
+un resumen por ruta
+
+Uso: python scripts/trace_report.py [logs/traces-1234.jsonl ...] [--min-ms 20] [--top 10] [--route PUT]
+"""
+
+import sys
+import os
+import argparse
+import glob
+import json
+from collections import defaultdict
+
+DEFAULT_FILES = os.path.join('logs', 'traces*.jsonl')
+
+SPAN_KIND_CLIENT = 3
+
+def parse_args():
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Camino crítico de las peticiones lentas")
+    parser.add_argument('files', nargs='*', help=f"Archivos de trazas (default: {DEFAULT_FILES})")
+    parser.add_argument('--min-ms', type=float, default=0, help="Duración mínima de la petición")
+    parser.add_argument('--top', type=int, default=10, help="Cantidad de peticiones a mostrar")
+    parser.add_argument('--route', default=None, help="Solo peticiones cuyo nombre contenga este texto")
+    return parser.parse_args()
+
+def _attribute_value(value):
+    for key in ('stringValue', 'intValue', 'doubleValue', 'boolValue'):
+        if key in value:
+            return int(value[key]) if key == 'intValue' else value[key]
+    return None
+
+def load_traces(paths):
+    """
+    Lee los lotes OTLP y agrupa los spans por traza
+    
+    Las líneas ilegibles (p. ej. un lote truncado por una caída a mitad
+    de la escritura) se omiten y se cuentan.
+    
+    Returns:
+        tuple: ({trace_id: [span]}, líneas omitidas); cada span es un
+               dict con id, parent, name, kind, start, end (ns) y attributes
+    """
+    traces = defaultdict(list)
+    skipped = 0
+    
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                for resource_spans in batch.get('resourceSpans', []):
+                    for scope_spans in resource_spans.get('scopeSpans', []):
+                        for span in scope_spans.get('spans', []):
+                            traces[span['traceId']].append({
+                                'id': span['spanId'],
+                                'parent': span.get('parentSpanId'),
+                                'name': span['name'],
+                                'kind': span.get('kind'),
+                                'start': int(span['startTimeUnixNano']),
+                                'end': int(span['endTimeUnixNano']),
+                                'attributes': {
+                                    item['key']: _attribute_value(item['value'])
+                                    for item in span.get('attributes', [])
+                                }
+                            })
+    
+    return traces, skipped
+
+def build_tree(spans):
+    """
+    Returns:
+        tuple: (span raíz, {span_id: hijos ordenados por inicio})
+    """
+    ids = {span['id'] for span in spans}
+    children = defaultdict(list)
+    roots = []
+    
+    for span in spans:
+        # El padre de la raíz puede ser de otro servicio (traceparent)
+        if span['parent'] in ids:
+            children[span['parent']].append(span)
+        else:
+            roots.append(span)
+    
+    for items in children.values():
+        items.sort(key=lambda span: span['start'])
+    
+    root = max(roots, key=lambda span: span['end'] - span['start'])
+    return root, children
+
+def critical_path(span, children):
+    """
+    Cadena de spans que determina la duración del span
+    
+    Se recorre desde el final: el hijo que termina último antes del cursor
+    está en el camino; el cursor pasa a su inicio y se repite.
+    
+    Returns:
+        list: [(span, tiempo propio en el camino en ns)] en orden cronológico
+    """
+    cursor = span['end']
+    selected = []
+    
+    for child in sorted(children.get(span['id'], []), key=lambda item: item['end'], reverse=True):
+        if child['end'] <= cursor and child['start'] >= span['start']:
+            selected.append(child)
+            cursor = child['start']
+    
+    selected.reverse()
+    self_time = (span['end'] - span['start']) - sum(child['end'] - child['start'] for child in selected)
+    
+    path = [(span, max(self_time, 0))]
+    for child in selected:
+        path.extend(critical_path(child, children))
+    return path
+
+def _ms(nanoseconds):
+    return nanoseconds / 1e6
+
+def _label(span):
+    statement = span['attributes'].get('db.statement')
+    if statement:
+        return f"{span['name']}: {statement[:90]}{'…' if len(statement) > 90 else ''}"
+    return span['name']
+
+def print_tree(span, children, root_start, on_path, depth=0):
+    """Imprime el árbol de spans; * marca los del camino crítico"""
+    marker = '*' if span['id'] in on_path else ' '
+    print(
+        f"  {marker} {_ms(span['start'] - root_start):7.2f} ms "
+        f"{_ms(span['end'] - span['start']):7.2f} ms  {'  ' * depth}{_label(span)}"
+    )
+    for child in children.get(span['id'], []):
+        print_tree(child, children, root_start, on_path, depth + 1)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def report(traces, min_ms=0, top=10, route=None):
+    """Imprime las peticiones más lentas y el resumen por ruta"""
+    requests = []
+    for trace_id, spans in traces.items():
+        root, children = build_tree(spans)
+        if route and route not in root['name']:
+            continue
+        queries = sum(1 for span in spans if span['kind'] == SPAN_KIND_CLIENT)
+        requests.append((root, children, queries, trace_id))
+    
+    if not requests:
+        print("No hay trazas")
+        return
+    
+    slow = [item for item in requests if _ms(item[0]['end'] - item[0]['start']) >= min_ms]
+    slow.sort(key=lambda item: item[0]['end'] - item[0]['start'], reverse=True)
+    
+    for root, children, queries, trace_id in slow[:top]:
+        status = root['attributes'].get('http.status_code', '-')
+        print(
+            f"\n{root['name']}  {_ms(root['end'] - root['start']):.2f} ms  "
+            f"{queries} consultas  status {status}  trace {trace_id}"
+        )
+        
+        path = critical_path(root, children)
+        print_tree(root, children, root['start'], {span['id'] for span, _ in path})
+        
+        print("  Camino crítico (tiempo propio):")
+        for span, self_time in sorted(path, key=lambda item: item[1], reverse=True)[:8]:
+            print(f"    {_ms(self_time):7.2f} ms  {_label(span)}")
+    
+    by_route = defaultdict(list)
+    for root, _, queries, _ in requests:
+        by_route[root['name']].append((_ms(root['end'] - root['start']), queries))
+    
+    print(f"\n{'Ruta':<50} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'consultas':>10}")
+    for name, items in sorted(by_route.items(), key=lambda item: -percentile([d for d, _ in item[1]], 0.95)):
+        durations = [duration for duration, _ in items]
+        avg_queries = sum(queries for _, queries in items) / len(items)
+        print(
+            f"{name[:50]:<50} {len(items):>5} {percentile(durations, 0.5):>8.2f} "
+            f"{percentile(durations, 0.95):>8.2f} {max(durations):>8.2f} {avg_queries:>10.1f}"
+        )
+
+if __name__ == '__main__':
+    args = parse_args()
+    paths = args.files or sorted(glob.glob(DEFAULT_FILES))
+    
+    if not paths:
+        print(f"❌ No se encontraron archivos de trazas ({DEFAULT_FILES})")
+        sys.exit(1)
+    
+    traces, skipped = load_traces(paths)
+    if skipped:
+        print(f"⚠️  {skipped} líneas ilegibles omitidas")
+    report(traces, min_ms=args.min_ms, top=args.top, route=args.route)
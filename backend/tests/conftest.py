@@ -10,8 +10,8 @@ import os
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from backend.app.utils import create_app
-from app.database import get_db_connection
+from app import create_app
+from app.database import get_db_connection, pinned_transaction
 from app.services.auth_service import AuthService
 
 @pytest.fixture
@@ -30,8 +30,13 @@ def runner(app):
     """Runner de comandos CLI"""
     return app.test_cli_runner()
 
+@pytest.fixture(scope='session')
+def test_password_hash():
+    """Hash de la contraseña del usuario de prueba (bcrypt es lento: uno por sesión)"""
+    return AuthService.hash_password('Test123!')
+
 @pytest.fixture
-def auth_headers():
+def auth_headers(test_password_hash):
     """Headers de autorización para tests"""
     # Crear usuario de prueba y obtener token
     conn = get_db_connection()
@@ -56,11 +61,10 @@ def auth_headers():
         user = cursor.fetchone()
         
         if not user:
-            password_hash = AuthService.hash_password('Test123!')
             cursor.execute(
                 """INSERT INTO users (username, email, password_hash, role_id)
                    VALUES ('test_user', 'test@test.com', %s, %s)""",
-                (password_hash, role_id)
+                (test_password_hash, role_id)
             )
             conn.commit()
             user_id = cursor.lastrowid
@@ -91,8 +95,13 @@ def sample_user_data():
 
 @pytest.fixture(autouse=True)
 def cleanup_test_data():
-    """Limpia datos de prueba después de cada test"""
-    yield
+    """
+    Ejecuta cada test dentro de una transacción que se revierte al final
     
-    # Aquí puedes agregar lógica para limpiar datos de prueba
-    # Por ejemplo, eliminar usuarios creados durante tests
\ No newline at end of file
+    Todo el acceso a la BD de app.database pasa por una sola conexión con
+    un savepoint por operación (ver pinned_transaction): los datos creados
+    por el test (incluido el usuario de auth_headers) no llegan a otros
+    tests ni a otros procesos que ejecuten la suite en paralelo.
+    """
+    with pinned_transaction():
+        yield
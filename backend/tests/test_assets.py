@@ -0,0 +1,98 @@
+"""
+Tests para la compilación y el servido de archivos estáticos
+"""
+
+import gzip
+import os
+import pytest
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+from app.assets import AssetStore, IMMUTABLE_CACHE
+from scripts.build_assets import build, minify_css, minify_js
+
+def fallback_app(environ, start_response):
+    """Aplicación WSGI mínima para las rutas fuera del build"""
+    return Response('fallback')(environ, start_response)
+
+class TestAssets:
+    """Suite de tests para el pipeline de assets"""
+    
+    @pytest.fixture
+    def dist(self, tmp_path):
+        """Frontend mínimo compilado en una carpeta temporal"""
+        src = tmp_path / 'frontend'
+        (src / 'js').mkdir(parents=True)
+        (src / 'css').mkdir()
+        (src / 'js' / 'app.js').write_text("/**\n * Comentario\n */\nconst a = 1;\n// otro\n")
+        (src / 'css' / 'style.css').write_text("/* x */\nbody {\n    color: red;\n}\n")
+        (src / 'login.html').write_text(
+            '<link rel="stylesheet" href="css/style.css"><script src="js/app.js"></script>'
+        )
+        
+        out = tmp_path / 'dist'
+        manifest = build(str(src), str(out))
+        return out, manifest
+    
+    def test_minify(self):
+        """Test: Minificación de JS y CSS"""
+        assert minify_js("/**\n * Doc\n */\nfunction f() {\n    return 1; \n}\n") == \
+            "function f() {\nreturn 1;\n}\n"
+        # El código que sigue al cierre de un comentario se conserva
+        assert minify_js("/* a */ var x = 1;\n/*\n b\n*/ var y = 2;\n") == \
+            "var x = 1;\nvar y = 2;\n"
+        assert minify_css("/* c */ a { color: red; }") == "a{color:red}\n"
+    
+    def test_minify_keeps_template_literals(self):
+        """Test: Las líneas dentro de un template literal no se modifican"""
+        source = (
+            "const html = `\n"
+            "    // no es un comentario\n"
+            "    /* tampoco */\n"
+            "\n"
+            "    <p>${user.name} {x}</p>\n"
+            "`;\n"
+            "    // comentario real\n"
+            "    var y = `a${f({b: `c`})}\n"
+            "  // d`;\n"
+        )
+        
+        assert minify_js(source) == (
+            "const html = `\n"
+            "    // no es un comentario\n"
+            "    /* tampoco */\n"
+            "\n"
+            "    <p>${user.name} {x}</p>\n"
+            "`;\n"
+            "var y = `a${f({b: `c`})}\n"
+            "  // d`;\n"
+        )
+    
+    def test_build_rewrites_references(self, dist):
+        """Test: Nombres con hash, .gz y referencias reescritas"""
+        out, manifest = dist
+        hashed_js = manifest['assets']['js/app.js']
+        
+        assert hashed_js != 'js/app.js'
+        assert os.path.exists(out / (hashed_js + '.gz'))
+        assert hashed_js in (out / 'login.html').read_text()
+    
+    def test_asset_store(self, dist):
+        """Test: Assets servidos desde memoria con cache inmutable"""
+        out, manifest = dist
+        client = Client(AssetStore(fallback_app, str(out)))
+        path = '/' + manifest['assets']['css/style.css']
+        
+        response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == IMMUTABLE_CACHE
+        assert gzip.decompress(response.data) == (out / manifest['assets']['css/style.css']).read_bytes()
+        
+        cached = client.get(path, headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag']
+        })
+        assert cached.status_code == 304
+        
+        # La raíz sirve login.html y lo demás pasa a la aplicación
+        assert b'<script' in client.get('/').data
+        assert client.get('/api/courses').data == b'fallback'
@@ -5,6 +5,7 @@ Tests para el módulo de asignaciones (CRUD)
 import json
 import pytest
 from datetime import datetime, timedelta
+from app.utils.pagination import encode_cursor
 
 class TestAssignments:
     """Suite de tests para gestión de asignaciones"""
@@ -200,4 +201,176 @@ class TestAssignments:
         data = json.loads(response.data)
         assert data['success'] is True
         assert 'assignments' in data['data']
-        assert len(data['data']['assignments']) >= 2
\ No newline at end of file
+        assert len(data['data']['assignments']) >= 2
+    
+    def test_course_assignments_cursor_pagination(self, client, auth_headers):
+        """Test: Paginación por cursor de asignaciones de un curso"""
+        course_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Course with Pages',
+                'code': 'CWP101',
+                'description': 'Test'
+            })
+        )
+        course_id = json.loads(course_response.data)['data']['id']
+        
+        for index in range(3):
+            client.post('/api/assignments',
+                headers=auth_headers,
+                data=json.dumps({
+                    'title': f'Paged Assignment {index}',
+                    'course_id': course_id
+                })
+            )
+        
+        # Primera página
+        response = client.get(
+            f'/api/courses/{course_id}/assignments?limit=2&sort=title',
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']
+        assert len(data['assignments']) == 2
+        assert data['pagination']['has_more'] is True
+        
+        # Segunda página con el cursor
+        response = client.get(
+            f'/api/courses/{course_id}/assignments?limit=2&sort=title'
+            f'&cursor={data["pagination"]["next_cursor"]}',
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']
+        assert [a['title'] for a in data['assignments']] == ['Paged Assignment 2']
+        assert data['pagination']['has_more'] is False
+        assert data['pagination']['next_cursor'] is None
+        
+        # Cursor inválido
+        response = client.get(
+            f'/api/courses/{course_id}/assignments?cursor=invalido',
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+        
+        # Cursor bien formado con valores de tipo incorrecto
+        for values in (['due_date', 'asc', None, {'a': 1}],
+                       ['due_date', 'asc', None, True],
+                       ['due_date', 'asc', [1], 1]):
+            response = client.get(
+                f'/api/courses/{course_id}/assignments?cursor={encode_cursor(values)}',
+                headers=auth_headers
+            )
+            assert response.status_code == 400
+    
+    def test_bulk_create_assignments(self, client, auth_headers):
+        """Test: Crear varias asignaciones en lote"""
+        # Crear curso
+        course_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Course for Bulk Test',
+                'code': 'CFBT101',
+                'description': 'Test'
+            })
+        )
+        course_id = json.loads(course_response.data)['data']['id']
+        
+        response = client.post('/api/assignments/bulk',
+            headers=auth_headers,
+            data=json.dumps({
+                'assignments': [
+                    {'title': f'Bulk Assignment {i}', 'course_id': course_id}
+                    for i in range(5)
+                ]
+            })
+        )
+        
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['created'] == 5
+    
+    def test_bulk_create_assignments_invalid_course(self, client, auth_headers):
+        """Test: Crear asignaciones en lote con curso inexistente"""
+        response = client.post('/api/assignments/bulk',
+            headers=auth_headers,
+            data=json.dumps({
+                'assignments': [
+                    {'title': 'Orphan Assignment', 'course_id': 99999}
+                ]
+            })
+        )
+        
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['success'] is False
+    
+    def test_clone_course_assignments(self, client, auth_headers):
+        """Test: Copiar asignaciones de un curso a otro"""
+        # Crear cursos origen y destino
+        source_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Clone Source Course',
+                'code': 'CLSRC101',
+                'description': 'Test'
+            })
+        )
+        source_id = json.loads(source_response.data)['data']['id']
+        
+        target_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Clone Target Course',
+                'code': 'CLTGT101',
+                'description': 'Test'
+            })
+        )
+        target_id = json.loads(target_response.data)['data']['id']
+        
+        due_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+        client.post('/api/assignments',
+            headers=auth_headers,
+            data=json.dumps({
+                'title': 'Assignment to Clone',
+                'course_id': source_id,
+                'due_date': due_date
+            })
+        )
+        
+        response = client.post(f'/api/courses/{source_id}/assignments/clone',
+            headers=auth_headers,
+            data=json.dumps({
+                'target_course_ids': [target_id],
+                'due_date_offset_days': 7
+            })
+        )
+        
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['created'] == 1
+    
+    def test_clone_course_assignments_invalid_targets(self, client, auth_headers):
+        """Test: Copiar asignaciones con destinos que no son enteros"""
+        source_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Clone Invalid Source',
+                'code': 'CLINV101',
+                'description': 'Test'
+            })
+        )
+        source_id = json.loads(source_response.data)['data']['id']
+        
+        response = client.post(f'/api/courses/{source_id}/assignments/clone',
+            headers=auth_headers,
+            data=json.dumps({'target_course_ids': [{'a': 1}]})
+        )
+        
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['success'] is False
@@ -0,0 +1,57 @@
+"""
+Tests para la medición y la comparación contra baseline de los benchmarks
+"""
+
+from benchmarks.datasets import SCALES, course_indexes
+from benchmarks.measure import compare, measure, percentile
+
+class TestBenchmarks:
+    """Suite de tests de benchmarks/measure.py y benchmarks/datasets.py"""
+    
+    def test_percentile_nearest_rank(self):
+        """Test: Percentiles por rango más cercano"""
+        values = list(range(1, 101))
+        
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile([7], 0.99) == 7
+    
+    def test_measure_reports_latency_and_allocations(self):
+        """Test: measure resume percentiles y memoria, y usa el setup"""
+        calls = []
+        result = measure(lambda size: calls.append(bytearray(size)), iterations=10, warmup=2,
+                         setup=lambda: (64 * 1024,), alloc_iterations=2)
+        
+        assert len(calls) == 14
+        assert result['iterations'] == 10
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms'] <= result['max_ms']
+        assert result['alloc_peak_kib'] >= 64
+    
+    def test_compare_flags_regressions_over_threshold(self):
+        """Test: Solo regresa lo que supera el umbral y el ruido mínimo"""
+        baseline = {
+            'lento': {'p95_ms': 10.0, 'alloc_peak_kib': 100.0},
+            'estable': {'p95_ms': 10.0, 'alloc_peak_kib': 100.0},
+            'micro': {'p95_ms': 0.05, 'alloc_peak_kib': 1.0}
+        }
+        current = {
+            'lento': {'p95_ms': 13.0, 'alloc_peak_kib': 100.0},
+            'estable': {'p95_ms': 11.0, 'alloc_peak_kib': 90.0},
+            'micro': {'p95_ms': 0.2, 'alloc_peak_kib': 1.0},
+            'nuevo': {'p95_ms': 50.0}
+        }
+        
+        regressions = compare(current, baseline, threshold=0.2)
+        
+        assert [(name, metric) for name, metric, *_ in regressions] == [('lento', 'p95_ms')]
+    
+    def test_dataset_enrollments_are_unique(self):
+        """Test: Cada estudiante se inscribe en cursos distintos"""
+        scale = SCALES['1k']
+        
+        pairs = {(student, course) for student in range(scale.students)
+                 for course in course_indexes(student, scale)}
+        
+        assert len(pairs) == scale.enrollments
+        assert {course for _, course in pairs} == set(range(scale.courses))
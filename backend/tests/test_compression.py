@@ -0,0 +1,51 @@
+"""
+Tests para la compresión gzip de respuestas
+"""
+
+import gzip
+import pytest
+from app.compression import accepts_gzip, is_compressible
+
+class TestCompression:
+    """Suite de tests para el middleware de compresión"""
+    
+    def test_accepts_gzip(self):
+        """Test: Negociación de Accept-Encoding"""
+        assert accepts_gzip('gzip, deflate, br') is True
+        assert accepts_gzip('br;q=1.0, gzip;q=0.5') is True
+        assert accepts_gzip('gzip;q=0, br') is False
+        assert accepts_gzip('*') is True
+        assert accepts_gzip('identity') is False
+        assert accepts_gzip('') is False
+    
+    def test_is_compressible(self):
+        """Test: Tipos de contenido comprimibles"""
+        assert is_compressible('application/json') is True
+        assert is_compressible('text/css; charset=utf-8') is True
+        assert is_compressible('text/event-stream') is False
+        assert is_compressible('image/png') is False
+    
+    def test_static_file_gzip(self, client):
+        """Test: Archivo estático comprimido y con ETag propio"""
+        plain = client.get('/css/style.css')
+        response = client.get('/css/style.css', headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert gzip.decompress(response.data) == plain.data
+        assert response.headers['ETag'].endswith('-gzip"')
+        
+        # El ETag comprimido también se valida con If-None-Match
+        cached = client.get('/css/style.css', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag']
+        })
+        assert cached.status_code == 304
+    
+    def test_no_gzip_without_accept_encoding(self, client):
+        """Test: Sin Accept-Encoding la respuesta no se comprime"""
+        response = client.get('/css/style.css')
+        
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
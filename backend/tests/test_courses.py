@@ -4,6 +4,7 @@ Tests para el módulo de cursos (CRUD)
 
 import json
 import pytest
+from datetime import datetime, timedelta, timezone
 
 class TestCourses:
     """Suite de tests para gestión de cursos"""
@@ -23,6 +24,19 @@ class TestCourses:
         assert 'courses' in data['data']
         assert 'pagination' in data['data']
     
+    def test_get_courses_columnar(self, client, auth_headers):
+        """Test: Lista de cursos en formato columnar"""
+        response = client.get('/api/courses?format=columns', headers=auth_headers)
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)['data']
+        assert 'id' in data['courses']['columns']
+        assert all(
+            len(row) == len(data['courses']['columns'])
+            for row in data['courses']['rows']
+        )
+        assert 'pagination' in data
+    
     def test_get_course_by_id(self, client, auth_headers):
         """Test: Obtener curso específico por ID"""
         # Primero obtener lista para tener un ID válido
@@ -160,4 +174,93 @@ class TestCourses:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['data']['pagination']['page'] == 1
-        assert data['data']['pagination']['limit'] == 5
\ No newline at end of file
+        assert data['data']['pagination']['limit'] == 5
+    
+    def test_get_enrolled_students(self, client, auth_headers):
+        """Test: Listar estudiantes inscritos (paginado por cursor)"""
+        create_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Course with Students',
+                'code': 'CWS101',
+                'description': 'Test'
+            })
+        )
+        
+        course_id = json.loads(create_response.data)['data']['id']
+        
+        response = client.get(f'/api/courses/{course_id}/students',
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['students'] == []
+        assert data['data']['pagination']['has_more'] is False
+        assert data['data']['pagination']['next_cursor'] is None
+    
+    def test_conditional_get_course(self, client, auth_headers):
+        """Test: ETag e If-None-Match en el detalle de un curso"""
+        create_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Cached Course',
+                'code': 'ETG101',
+                'description': 'Test'
+            })
+        )
+        
+        course_id = json.loads(create_response.data)['data']['id']
+        
+        response = client.get(f'/api/courses/{course_id}', headers=auth_headers)
+        etag = response.headers.get('ETag')
+        
+        assert response.status_code == 200
+        assert etag is not None
+        
+        # Misma versión: 304 sin cuerpo
+        response = client.get(f'/api/courses/{course_id}',
+            headers={**auth_headers, 'If-None-Match': etag}
+        )
+        
+        assert response.status_code == 304
+        assert response.data == b''
+        
+        # Después de actualizar cambia la versión
+        client.put(f'/api/courses/{course_id}',
+            headers=auth_headers,
+            data=json.dumps({'name': 'Cached Course v2'})
+        )
+        
+        response = client.get(f'/api/courses/{course_id}',
+            headers={**auth_headers, 'If-None-Match': etag}
+        )
+        
+        assert response.status_code == 200
+        assert response.headers.get('ETag') != etag
+    
+    def test_last_modified_is_utc(self, client, auth_headers):
+        """Test: Last-Modified en UTC aunque la BD guarde hora local"""
+        create_response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Dated Course',
+                'code': 'LMD101',
+                'description': 'Test'
+            })
+        )
+        
+        course_id = json.loads(create_response.data)['data']['id']
+        
+        response = client.get(f'/api/courses/{course_id}', headers=auth_headers)
+        last_modified = response.last_modified
+        
+        assert last_modified is not None
+        assert abs(datetime.now(timezone.utc) - last_modified) < timedelta(minutes=2)
+        
+        response = client.get(f'/api/courses/{course_id}',
+            headers={**auth_headers, 'If-Modified-Since': response.headers['Last-Modified']}
+        )
+        
+        assert response.status_code == 304
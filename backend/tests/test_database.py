@@ -0,0 +1,57 @@
+"""
+Tests para el aislamiento transaccional de app.database
+"""
+
+import uuid
+import pytest
+from app.database import execute_query, get_db, pinned_transaction, stream_query
+
+def role_exists(name):
+    return execute_query("SELECT id FROM roles WHERE name = %s", (name,), fetch_one=True) is not None
+
+def add_role(name):
+    return execute_query(
+        "INSERT INTO roles (name, description) VALUES (%s, 'tx')", (name,), fetch_all=False
+    )
+
+class TestPinnedTransaction:
+    """Suite de tests de pinned_transaction"""
+    
+    def test_changes_are_rolled_back(self):
+        """Test: Lo confirmado dentro se ve dentro y desaparece al salir"""
+        name = f"tx_{uuid.uuid4().hex[:8]}"
+        
+        with pinned_transaction():
+            assert add_role(name)
+            assert role_exists(name)
+        
+        assert not role_exists(name)
+    
+    def test_failed_block_only_undoes_its_savepoint(self):
+        """Test: Un error en get_db revierte solo su bloque, no lo anterior"""
+        kept, failed = (f"tx_{uuid.uuid4().hex[:8]}" for _ in range(2))
+        
+        with pinned_transaction():
+            add_role(kept)
+            with pytest.raises(RuntimeError):
+                with get_db() as (conn, cursor):
+                    cursor.execute("INSERT INTO roles (name, description) VALUES (%s, 'tx')", (failed,))
+                    raise RuntimeError("falla")
+            
+            assert role_exists(kept)
+            assert not role_exists(failed)
+    
+    def test_stream_can_interleave_queries(self):
+        """Test: Se puede consultar mientras se consume un stream"""
+        names = [f"tx_{uuid.uuid4().hex[:8]}" for _ in range(3)]
+        
+        with pinned_transaction():
+            for name in names:
+                add_role(name)
+            
+            streamed = []
+            for row in stream_query("SELECT name FROM roles WHERE description = 'tx'", batch_size=1):
+                assert role_exists(row['name'])
+                streamed.append(row['name'])
+        
+        assert sorted(streamed) == sorted(names)
@@ -0,0 +1,103 @@
+"""
+Tests para los eventos de cambios en tiempo real
+"""
+
+import socket
+import subprocess
+import sys
+import pytest
+from app.events import EventBroker, UdpBridge
+from app.routes.event_routes import format_sse, public_event
+
+class TestEvents:
+    """Suite de tests para el broker de eventos y el formato SSE"""
+    
+    def test_publish_to_subscribers(self):
+        """Test: Los suscriptores reciben los eventos con versión creciente"""
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        
+        first = broker.publish('assignment', 'created', 1, 10)
+        second = broker.publish('assignment', 'deleted', 1, 10)
+        
+        assert subscription.get(0.1) == first
+        assert subscription.get(0.1) == second
+        assert second['version'] > first['version']
+        
+        broker.unsubscribe(subscription)
+        broker.publish('course', 'updated', 10, 10)
+        assert subscription.get(0.01) is None
+    
+    def test_subscriber_limit(self):
+        """Test: Por encima del límite no se registran más suscriptores"""
+        broker = EventBroker()
+        first = broker.subscribe(limit=1)
+        
+        assert broker.subscribe(limit=1) is None
+        
+        broker.unsubscribe(first)
+        assert broker.subscribe(limit=1) is not None
+    
+    def test_slow_subscriber_overflows(self):
+        """Test: Un cliente que no consume queda marcado para resync"""
+        broker = EventBroker(queue_size=2)
+        subscription = broker.subscribe()
+        
+        for i in range(3):
+            broker.publish('assignment', 'created', i, 1)
+        
+        assert subscription.overflowed is True
+    
+    def test_events_since(self):
+        """Test: Reanudación con Last-Event-ID dentro de la ventana"""
+        broker = EventBroker(history_size=3)
+        events = [broker.publish('assignment', 'updated', i, 1) for i in range(3)]
+        
+        assert broker.events_since(events[0]['version']) == events[1:]
+        
+        broker.publish('assignment', 'updated', 3, 1)
+        assert broker.events_since(events[0]['version']) is None
+    
+    def test_format_sse(self):
+        """Test: Formato text/event-stream sin campos internos"""
+        event = {'type': 'course', 'action': 'created', 'id': 1,
+                 'course_id': 1, 'version': 5, 'teacher_id': 2}
+        
+        message = format_sse('change', public_event(event), event['version'])
+        
+        assert message.startswith('id: 5\nevent: change\ndata: {')
+        assert 'teacher_id' not in message
+        assert message.endswith('\n\n')
+    
+    def test_bridge_requires_signature(self, tmp_path):
+        """Test: El puente entrega eventos firmados y descarta los demás"""
+        sender, receiver = EventBroker(), EventBroker()
+        sender.start_bridge(str(tmp_path), 'clave')
+        bridge = receiver.start_bridge(str(tmp_path), 'clave')
+        subscription = receiver.subscribe()
+        
+        try:
+            forged = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            forged.sendto(b'{"type":"course","version":1}', ('127.0.0.1', bridge.port))
+            forged.close()
+            assert subscription.get(0.2) is None
+            
+            event = sender.publish('course', 'created', 1, 1)
+            assert subscription.get(1) == event
+        finally:
+            sender.bridge.close()
+            bridge.close()
+    
+    def test_bridge_prunes_dead_workers(self, tmp_path):
+        """Test: Los archivos de puerto de procesos terminados se eliminan"""
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        stale = tmp_path / f"{process.pid}.port"
+        stale.write_text('9')
+        
+        bridge = UdpBridge(EventBroker(), str(tmp_path), 'clave')
+        try:
+            assert bridge._load_peers() == []
+            assert not stale.exists()
+        finally:
+            bridge.close()
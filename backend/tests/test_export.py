@@ -0,0 +1,112 @@
+"""
+Tests para el módulo de exportación (streaming CSV/NDJSON/JSON)
+"""
+
+import gzip
+import json
+import pytest
+
+class TestExport:
+    """Suite de tests para exportaciones"""
+    
+    def test_export_without_auth(self, client):
+        """Test: Exportar sin autenticación"""
+        response = client.get('/api/export/users')
+        assert response.status_code == 401
+    
+    def test_export_users_csv(self, client, auth_headers):
+        """Test: Exportar usuarios en CSV"""
+        response = client.get('/api/export/users', headers=auth_headers)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        
+        lines = response.data.decode('utf-8').splitlines()
+        assert lines[0] == 'id,username,email,role_name,is_active,created_at'
+        assert 'password_hash' not in response.data.decode('utf-8')
+    
+    def test_export_assignments_ndjson(self, client, auth_headers):
+        """Test: Exportar asignaciones en NDJSON"""
+        response = client.get('/api/export/assignments?format=ndjson',
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        
+        for line in response.data.decode('utf-8').splitlines():
+            record = json.loads(line)
+            assert 'course_id' in record
+    
+    def test_export_enrollments_gzip(self, client, auth_headers):
+        """Test: Exportar inscripciones comprimidas con gzip"""
+        response = client.get('/api/export/enrollments?gzip=1',
+            headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+        )
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        
+        content = gzip.decompress(response.data).decode('utf-8')
+        assert content.startswith('id,course_id,course_code')
+    
+    def test_export_invalid_format(self, client, auth_headers):
+        """Test: Exportar con formato no soportado"""
+        response = client.get('/api/export/users?format=xml', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_export_query_error_before_response(self, client, auth_headers, monkeypatch):
+        """Test: Un error de BD al iniciar la exportación devuelve 500"""
+        from app.services.export_service import ExportService
+        
+        def failing_rows():
+            raise RuntimeError("conexión perdida")
+            yield
+        
+        monkeypatch.setattr(ExportService, 'export_users',
+                            staticmethod(lambda: (['id'], failing_rows())))
+        
+        response = client.get('/api/export/users', headers=auth_headers)
+        assert response.status_code == 500
+    
+    def test_export_query_error_mid_stream(self, client, auth_headers, monkeypatch):
+        """Test: Un error a mitad de la exportación corta la respuesta"""
+        from app.services.export_service import ExportService
+        
+        def failing_rows():
+            yield {'id': 1}
+            raise RuntimeError("conexión perdida")
+        
+        monkeypatch.setattr(ExportService, 'export_users',
+                            staticmethod(lambda: (['id'], failing_rows())))
+        
+        # La excepción llega al servidor en lugar de cerrar el archivo
+        with pytest.raises(RuntimeError):
+            client.get('/api/export/users', headers=auth_headers).get_data()
+    
+    def test_export_users_json(self, client, auth_headers):
+        """Test: Exportar en JSON con los mismos headers que CSV/NDJSON"""
+        response = client.get('/api/export/users?format=json', headers=auth_headers)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert response.headers['Content-Disposition'].endswith('.json"')
+        assert response.headers['Cache-Control'] == 'no-store'
+        
+        body = json.loads(response.data)
+        assert body['success'] is True
+        assert len(body['data']['users']) > 0
+    
+    def test_export_json_error_mid_stream(self, client, auth_headers, monkeypatch):
+        """Test: Un error a mitad de la exportación JSON se registra y corta la respuesta"""
+        from app.routes import export_routes
+        from app.services.export_service import ExportService
+        
+        def failing_rows():
+            yield {'id': 1}
+            raise RuntimeError("conexión perdida")
+        
+        monkeypatch.setattr(ExportService, 'export_users',
+                            staticmethod(lambda: (['id'], failing_rows())))
+        logged = []
+        monkeypatch.setattr(export_routes.export_logger, 'exception', logged.append)
+        
+        with pytest.raises(RuntimeError):
+            client.get('/api/export/users?format=json', headers=auth_headers).get_data()
+        assert logged == ["Exportación de users interrumpida"]
@@ -0,0 +1,60 @@
+"""
+Tests para el generador de datasets sintéticos
+"""
+
+import pytest
+from datetime import datetime
+from app.database import backend
+from scripts.generate_data import DatasetGenerator, TABLE_COLUMNS, build_params, generate_data, parse_args
+
+START_IDS = {'users': 100, 'courses': 10, 'assignments': 0}
+ROLE_IDS = {'admin': 1, 'teacher': 2, 'student': 3}
+
+def make_generator(seed=7, **overrides):
+    params = build_params('small', **overrides)
+    return DatasetGenerator(params, seed, START_IDS, ROLE_IDS, ['hash-a', 'hash-b'], datetime(2026, 3, 2))
+
+class TestGenerateData:
+    """Suite de tests de scripts/generate_data.py"""
+    
+    def test_row_counts_and_shape(self):
+        """Test: Cada tabla tiene la cantidad pedida y las columnas declaradas"""
+        generator = make_generator(students=300, teachers=10, admins=1, courses=40,
+                                   enrollments=3000, assignments=500)
+        
+        for table, expected in (('users', 311), ('courses', 40), ('assignments', 500), ('enrollments', 3000)):
+            rows = list(getattr(generator, table)())
+            assert len(rows) == expected
+            assert all(len(row) == len(TABLE_COLUMNS[table]) for row in rows)
+    
+    def test_foreign_keys_and_unique_enrollments(self):
+        """Test: Las claves apuntan a filas generadas y no hay inscripciones repetidas"""
+        generator = make_generator(students=200, courses=30, enrollments=2000)
+        users = {row[0]: row[4] for row in generator.users()}
+        courses = {row[0]: row[4] for row in generator.courses()}
+        enrollments = [(row[0], row[1]) for row in generator.enrollments()]
+        
+        assert min(users) == START_IDS['users'] + 1
+        assert all(users[teacher_id] == ROLE_IDS['teacher'] for teacher_id in courses.values())
+        assert all(users[student_id] == ROLE_IDS['student'] and course_id in courses
+                   for student_id, course_id in enrollments)
+        assert len(set(enrollments)) == len(enrollments)
+    
+    def test_same_seed_same_dataset(self):
+        """Test: La semilla determina el dataset"""
+        first = list(make_generator(seed=1).enrollments())
+        
+        assert first == list(make_generator(seed=1).enrollments())
+        assert first != list(make_generator(seed=2).enrollments())
+    
+    def test_rejects_impossible_enrollments(self):
+        """Test: No se piden más inscripciones de las que caben"""
+        with pytest.raises(ValueError):
+            build_params('small', students=10, courses=4, enrollments=100)
+    
+    def test_requires_mysql(self, monkeypatch):
+        """Test: Con otro backend se rechaza antes de tocar la base de datos"""
+        monkeypatch.setattr(backend, 'NAME', 'sqlite')
+        monkeypatch.setattr('sys.argv', ['generate_data.py'])
+        with pytest.raises(ValueError, match='solo funciona con MySQL'):
+            generate_data(parse_args())
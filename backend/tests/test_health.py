@@ -0,0 +1,54 @@
+"""
+Tests para las sondas /healthz y /readyz
+"""
+
+import pytest
+from app.routes import health_routes
+from app.routes.health_routes import ReadinessCache
+
+@pytest.fixture
+def fresh_readiness(monkeypatch):
+    """Caché de readiness sin resultados previos de otros tests"""
+    monkeypatch.setattr(health_routes.readiness, 'checked_at', None)
+    monkeypatch.setattr(health_routes.readiness, 'error', None)
+    return health_routes.readiness
+
+class TestHealth:
+    """Suite de tests de app/routes/health_routes.py"""
+    
+    def test_healthz(self, client):
+        """Test: /healthz responde sin autenticación"""
+        response = client.get('/healthz')
+        
+        assert response.status_code == 200
+        assert response.get_json()['data']['status'] == 'ok'
+    
+    def test_readyz(self, client, fresh_readiness):
+        """Test: /readyz verifica una conexión del pool"""
+        response = client.get('/readyz')
+        
+        assert response.status_code == 200
+        assert response.get_json()['data']['status'] == 'ready'
+    
+    def test_readyz_unavailable(self, client, fresh_readiness, monkeypatch):
+        """Test: 503 si la BD no responde"""
+        def failing_check():
+            raise ConnectionError("sin conexión")
+        
+        monkeypatch.setattr(fresh_readiness, 'check', failing_check)
+        response = client.get('/readyz')
+        
+        assert response.status_code == 503
+        assert response.get_json()['success'] is False
+    
+    def test_readiness_cache(self):
+        """Test: Dentro del ttl se reutiliza el resultado"""
+        calls = []
+        cache = ReadinessCache(lambda: calls.append(1))
+        
+        assert cache.get(60) is None
+        assert cache.get(60) is None
+        assert len(calls) == 1
+        
+        assert cache.get(0) is None
+        assert len(calls) == 2
@@ -0,0 +1,37 @@
+"""
+Tests para la planificación de la prueba de carga
+"""
+
+import pytest
+from collections import Counter
+from scripts.loadtest import assign_personas, parse_mix, parse_stages, target_users
+
+class TestLoadtest:
+    """Suite de tests de scripts/loadtest.py"""
+    
+    def test_parse_mix_and_stages(self):
+        """Test: Se leen la mezcla y las etapas, y se rechazan valores inválidos"""
+        assert parse_mix('student=60,teacher=0,login=15') == {'student': 60.0, 'login': 15.0}
+        assert parse_stages('20x30, 20x60,0x10') == [(20, 30.0), (20, 60.0), (0, 10.0)]
+        
+        with pytest.raises(ValueError):
+            parse_mix('visitante=10')
+        with pytest.raises(ValueError):
+            parse_stages('20x0')
+    
+    def test_target_users_ramps_linearly(self):
+        """Test: Los usuarios activos siguen las etapas y terminan con None"""
+        stages = [(10, 10.0), (10, 20.0), (0, 10.0)]
+        
+        assert target_users(stages, 0) == 0
+        assert target_users(stages, 5) == 5
+        assert target_users(stages, 15) == 10
+        assert target_users(stages, 35) == 5
+        assert target_users(stages, 40) is None
+    
+    def test_personas_follow_mix_in_every_prefix(self):
+        """Test: Durante la rampa los usuarios activos respetan la mezcla"""
+        personas = assign_personas({'student': 60, 'teacher': 15, 'admin': 10, 'login': 15}, 40)
+        
+        assert Counter(personas) == {'student': 24, 'teacher': 6, 'admin': 4, 'login': 6}
+        assert set(personas[:7]) == {'student', 'teacher', 'admin', 'login'}
@@ -0,0 +1,91 @@
+"""
+Tests para el sistema de logging
+"""
+
+import gzip
+import json
+import logging
+import os
+import subprocess
+import sys
+from queue import SimpleQueue
+import pytest
+from logger import JsonFormatter, LocalQueueHandler, SamplingFilter, create_file_handler
+
+def make_record(message='mensaje', **extra):
+    record = logging.LogRecord('academic_system.test', logging.INFO, __file__, 1, message, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+class TestLogger:
+    """Suite de tests para logging estructurado"""
+    
+    def test_json_formatter(self):
+        """Test: Un objeto JSON con request_id y los campos extra"""
+        record = make_record(request_id='abc', fields={'status': 200, 'total_ms': 1.5})
+        entry = json.loads(JsonFormatter().format(record))
+        
+        assert entry['message'] == 'mensaje'
+        assert entry['level'] == 'INFO'
+        assert entry['request_id'] == 'abc'
+        assert entry['status'] == 200
+        assert entry['total_ms'] == 1.5
+    
+    @pytest.mark.parametrize('module', ['logger', 'app.timing', 'app.tracing'])
+    def test_import_without_cycle(self, module):
+        """Test: El logger y los módulos que lo usan se importan en cualquier orden"""
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, '-c', f'import {module}'],
+            cwd=backend_dir, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_queue_keeps_exception(self):
+        """Test: El traceback pasa por la cola y queda en el campo exception"""
+        queue = SimpleQueue()
+        logger = logging.getLogger('academic_system.test_queue')
+        handler = LocalQueueHandler(queue)
+        logger.addHandler(handler)
+        
+        try:
+            try:
+                raise RuntimeError("fallo")
+            except RuntimeError:
+                logger.exception("Error %s", 'procesando')
+        finally:
+            logger.removeHandler(handler)
+        
+        entry = json.loads(JsonFormatter().format(queue.get_nowait()))
+        assert entry['message'] == 'Error procesando'
+        assert 'RuntimeError: fallo' in entry['exception']
+    
+    def test_sampling_filter(self):
+        """Test: Solo se muestrean los registros marcados"""
+        assert SamplingFilter(0).filter(make_record()) is True
+        assert SamplingFilter(0).filter(make_record(sampled=True)) is False
+        assert SamplingFilter(1).filter(make_record(sampled=True)) is True
+    
+    def test_rotation_compresses(self, tmp_path):
+        """Test: El archivo rotado se comprime con gzip"""
+        handler = create_file_handler(str(tmp_path / 'app-{pid}.log'))
+        handler.emit(make_record('antes de rotar'))
+        handler.doRollover()
+        handler.emit(make_record('después de rotar'))
+        handler.close()
+        
+        rotated = [name for name in os.listdir(tmp_path) if name.endswith('.gz')]
+        assert len(rotated) == 1
+        assert rotated[0].startswith(f'app-{os.getpid()}.log.')
+        
+        with gzip.open(tmp_path / rotated[0], 'rt', encoding='utf-8') as f:
+            assert json.loads(f.readline())['message'] == 'antes de rotar'
+    
+    def test_request_id_header(self, client):
+        """Test: Se genera X-Request-ID o se respeta el entrante"""
+        response = client.get('/api/courses')
+        assert len(response.headers['X-Request-ID']) == 32
+        
+        response = client.get('/api/courses', headers={'X-Request-ID': 'proxy-123'})
+        assert response.headers['X-Request-ID'] == 'proxy-123'
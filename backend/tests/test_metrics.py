@@ -0,0 +1,110 @@
+"""
+Tests para las métricas de Prometheus
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app import create_app
+from app.config import Config
+from app import metrics
+from app.metrics import Registry
+
+class TestMetrics:
+    """Suite de tests para /metrics"""
+    
+    def test_histogram_exposition(self):
+        """Test: Buckets acumulativos, suma y conteo"""
+        registry = Registry()
+        histogram = registry.histogram('latency_seconds', 'Latencia', ('route',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, route='/a')
+        histogram.observe(0.5, route='/a')
+        histogram.observe(3, route='/a')
+        
+        lines = registry.render().splitlines()
+        
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+    
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Test: Se suman los procesos; gauges de procesos terminados no"""
+        registry = Registry()
+        counter = registry.counter('jobs_total', 'Trabajos')
+        gauge = registry.gauge('jobs_running', 'Trabajos en curso')
+        counter.inc(2)
+        gauge.set(1)
+        registry.directory = str(tmp_path)
+        
+        # Instantánea de un worker que ya terminó
+        dead = {'jobs_total': [[[], 3]], 'jobs_running': [[[], 4]]}
+        (tmp_path / 'metrics_999999999.json').write_text(json.dumps(dead))
+        
+        lines = registry.render().splitlines()
+        
+        assert 'jobs_total 5' in lines
+        assert 'jobs_running 1' in lines
+    
+    def test_dead_snapshots_archived(self, tmp_path):
+        """Test: Las instantáneas de procesos terminados se archivan una vez"""
+        registry = Registry()
+        counter = registry.counter('jobs_total', 'Trabajos')
+        counter.inc(2)
+        registry.enable_multiprocess(str(tmp_path), flush_seconds=3600)
+        
+        # Worker terminado y worker anterior con el mismo PID (reutilizado)
+        dead = {'jobs_total': [[[], 3]]}
+        (tmp_path / 'metrics_999999999_1.json').write_text(json.dumps(dead))
+        (tmp_path / f'metrics_{os.getpid()}_1.json').write_text(json.dumps(dead))
+        
+        assert 'jobs_total 8' in registry.render().splitlines()
+        assert 'jobs_total 8' in registry.render().splitlines()
+        assert sorted(path.name for path in tmp_path.glob('metrics_*.json')) == [registry.snapshot_name]
+        assert json.loads((tmp_path / 'archive.json').read_text()) == {'jobs_total': [[[], 6]]}
+    
+    def test_app_imports_without_fcntl(self):
+        """Test: La aplicación arranca sin fcntl (Windows) con métricas deshabilitadas"""
+        code = "import sys; sys.modules['fcntl'] = None; from app import create_app; create_app('testing')"
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True
+        )
+        
+        assert result.returncode == 0, result.stderr
+    
+    def test_disabled_registry_records_nothing(self, monkeypatch):
+        """Test: Sin METRICS_ENABLED la instrumentación no registra valores"""
+        monkeypatch.setattr(metrics.registry, 'enabled', False)
+        cache_before = metrics.CACHE_REQUESTS.snapshot()
+        wait_before = metrics.DB_POOL_WAIT.snapshot()
+        
+        metrics.cache_result('http_conditional', True)
+        metrics.DB_POOL_WAIT.observe(0.01)
+        
+        assert metrics.CACHE_REQUESTS.snapshot() == cache_before
+        assert metrics.DB_POOL_WAIT.snapshot() == wait_before
+    
+    def test_metrics_disabled_by_default(self, client):
+        """Test: /metrics no se registra si no se habilita"""
+        assert client.get('/metrics').status_code == 404
+    
+    def test_metrics_endpoint(self, auth_headers, monkeypatch):
+        """Test: /metrics expone latencias y códigos por ruta"""
+        monkeypatch.setattr(Config, 'METRICS_ENABLED', True)
+        client = create_app('testing').test_client()
+        
+        client.get('/api/courses', headers=auth_headers)
+        response = client.get('/metrics')
+        text = response.get_data(as_text=True)
+        
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert 'http_requests_total{blueprint="courses",route="/api/courses",method="GET",status="200"}' in text
+        assert 'http_request_duration_seconds_count{blueprint="courses",route="/api/courses",method="GET"}' in text
+        assert 'db_pool_connections{state="in_use"}' in text
+        assert 'http_requests_in_flight' in text
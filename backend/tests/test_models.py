@@ -0,0 +1,45 @@
+"""
+Tests para los modelos de filas con __slots__
+"""
+
+import json
+import pytest
+from app.models import AssignmentRow, CourseRow, RowJSONProvider
+
+class TestModels:
+    """Suite de tests para los modelos de filas"""
+    
+    def test_row_access(self):
+        """Test: Acceso por atributo y por llave, como un dict"""
+        row_type = CourseRow.for_columns(('id', 'name', 'teacher_id'))
+        row = row_type((1, 'Curso', 7))
+        
+        assert row.name == 'Curso'
+        assert row['teacher_id'] == 7
+        assert row.get('missing') is None
+        assert dict(row) == {'id': 1, 'name': 'Curso', 'teacher_id': 7}
+        assert not hasattr(row, '__dict__')
+        
+        with pytest.raises(KeyError):
+            row['missing']
+    
+    def test_column_mapping_cached(self):
+        """Test: Una subclase por modelo y conjunto de columnas"""
+        columns = ('id', 'title')
+        
+        assert CourseRow.for_columns(columns) is CourseRow.for_columns(columns)
+        assert AssignmentRow.for_columns(columns) is not CourseRow.for_columns(columns)
+        assert issubclass(AssignmentRow.for_columns(columns), AssignmentRow)
+    
+    def test_invalid_column(self):
+        """Test: Nombres de columna que no pueden ser atributos"""
+        with pytest.raises(ValueError):
+            CourseRow.for_columns(('id', 'COUNT(*)'))
+    
+    def test_json_serialization(self):
+        """Test: Las filas se serializan como objetos JSON"""
+        row = CourseRow.for_columns(('id', 'code'))((1, 'C1'))
+        
+        assert json.loads(json.dumps([row], default=RowJSONProvider.default)) == [
+            {'id': 1, 'code': 'C1'}
+        ]
@@ -0,0 +1,85 @@
+"""
+Tests para el perfilado de la aplicación
+"""
+
+import sys
+import threading
+import pytest
+from app import create_app
+from app.config import Config
+from app import profiling
+from app.profiling import StackSampler, collapse_stack
+from app.query_budget import QueryCapture
+
+class TestProfiling:
+    """Suite de tests para el muestreador de pilas"""
+    
+    def test_collapse_stack(self):
+        """Test: La pila se escribe de la raíz a la función actual"""
+        def inner():
+            return collapse_stack(sys._getframe())
+        
+        stack = inner()
+        
+        assert stack.split(';')[-1].startswith('inner (test_profiling.py:')
+        assert 'test_collapse_stack (test_profiling.py:' in stack
+    
+    def test_sampler_writes_folded_file(self, tmp_path):
+        """Test: Solo se muestrean los hilos activos y se agregan las pilas"""
+        sampler = StackSampler(str(tmp_path))
+        ready = threading.Event()
+        done = threading.Event()
+        
+        def busy_request():
+            ready.set()
+            done.wait(5)
+        
+        worker = threading.Thread(target=busy_request)
+        worker.start()
+        ready.wait(5)
+        
+        sampler.sample()
+        assert not sampler.samples
+        
+        sampler.track(worker.ident)
+        sampler.sample()
+        sampler.sample()
+        done.set()
+        worker.join()
+        
+        path = sampler.flush()
+        lines = open(path, encoding='utf-8').read().splitlines()
+        
+        assert all('busy_request (test_profiling.py:' in line for line in lines)
+        assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == 2
+        assert sampler.flush() is None
+    
+    def test_profiled_request_authenticates_once(self, monkeypatch, tmp_path, auth_headers):
+        """Test: X-Profile de un admin guarda el perfil sin repetir la búsqueda del usuario"""
+        monkeypatch.setattr(Config, 'PROFILING_ENABLED', True)
+        monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path))
+        client = create_app('testing').test_client()
+        
+        with QueryCapture() as capture:
+            response = client.get('/api/courses', headers={**auth_headers, 'X-Profile': '1'})
+        
+        assert response.status_code == 200
+        assert (tmp_path / response.headers['X-Profile-File']).exists()
+        assert sum('FROM users u JOIN roles r' in statement for statement in capture.statements) == 1
+    
+    def test_concurrent_profile_request_not_profiled(self, monkeypatch, tmp_path, auth_headers):
+        """Test: Mientras se perfila otra petición, X-Profile se atiende sin perfilar"""
+        monkeypatch.setattr(Config, 'PROFILING_ENABLED', True)
+        monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path))
+        client = create_app('testing').test_client()
+        headers = {**auth_headers, 'X-Profile': '1'}
+        
+        with profiling._profile_lock:
+            response = client.get('/api/courses', headers=headers)
+        
+        assert response.status_code == 200
+        assert 'X-Profile-File' not in response.headers
+        
+        # El lock se libera al terminar cada petición perfilada
+        assert 'X-Profile-File' in client.get('/api/courses', headers=headers).headers
+        assert 'X-Profile-File' in client.get('/api/courses', headers=headers).headers
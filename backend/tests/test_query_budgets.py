@@ -0,0 +1,302 @@
+"""
+Tests de presupuestos de consultas por endpoint
+Fallan si un cambio agrega consultas a una ruta o introduce un N+1
+"""
+
+import json
+import uuid
+import pytest
+from app.database import execute_query
+from app.query_budget import QUERY_BUDGETS, QueryCapture, assert_max_queries
+from app.services.auth_service import AuthService
+
+@pytest.fixture
+def sample_course(client, auth_headers):
+    """Curso con una asignación, creados por la API"""
+    response = client.post(
+        '/api/courses',
+        headers=auth_headers,
+        data=json.dumps({
+            'name': 'Curso de Presupuestos',
+            'code': f"QB{uuid.uuid4().hex[:8].upper()}"
+        })
+    )
+    course_id = json.loads(response.data)['data']['id']
+    
+    response = client.post(
+        '/api/assignments',
+        headers=auth_headers,
+        data=json.dumps({
+            'title': 'Tarea de Presupuestos',
+            'course_id': course_id,
+            'max_score': 100
+        })
+    )
+    assignment_id = json.loads(response.data)['data']['id']
+    
+    return {'course_id': course_id, 'assignment_id': assignment_id}
+
+def create_user(role_name, password_hash):
+    """Crea un usuario con el rol indicado directamente en la BD"""
+    username = f"qb{uuid.uuid4().hex[:10]}"
+    role = execute_query("SELECT id FROM roles WHERE name = %s", (role_name,), fetch_one=True)
+    return execute_query(
+        "INSERT INTO users (username, email, password_hash, role_id) VALUES (%s, %s, %s, %s)",
+        (username, f"{username}@test.com", password_hash, role['id']),
+        fetch_all=False
+    ), username
+
+GET_ENDPOINTS = [
+    ('courses.get_courses', '/api/courses'),
+    ('courses.get_course', '/api/courses/{course_id}'),
+    ('courses.get_enrolled_students', '/api/courses/{course_id}/students'),
+    ('assignments.get_all_assignments', '/api/assignments'),
+    ('assignments.get_course_assignments', '/api/courses/{course_id}/assignments'),
+    ('assignments.get_assignment', '/api/assignments/{assignment_id}'),
+    ('users.get_users', '/api/users'),
+    ('sync.sync', '/api/sync')
+]
+
+class TestQueryBudgets:
+    """Suite de tests de cantidad de consultas"""
+    
+    @pytest.mark.parametrize('endpoint,url', GET_ENDPOINTS)
+    def test_get_endpoint_budget(self, client, auth_headers, sample_course, endpoint, url):
+        """Test: Los GET respetan su presupuesto y no repiten sentencias"""
+        url = url.format(**sample_course)
+        
+        with assert_max_queries(QUERY_BUDGETS[endpoint], f"GET {url}", repeat_threshold=2):
+            response = client.get(url, headers=auth_headers)
+        
+        assert response.status_code == 200
+    
+    def test_update_course_budget(self, client, auth_headers, sample_course):
+        """Test: Actualizar un curso respeta su presupuesto"""
+        url = f"/api/courses/{sample_course['course_id']}"
+        
+        with assert_max_queries(QUERY_BUDGETS['courses.update_course'], f"PUT {url}"):
+            response = client.put(
+                url,
+                headers=auth_headers,
+                data=json.dumps({'name': 'Curso de Presupuestos 2'})
+            )
+        
+        assert response.status_code == 200
+    
+    @pytest.mark.parametrize('role_name', ['admin', 'teacher'])
+    def test_enroll_student_budget(self, client, auth_headers, test_password_hash, role_name):
+        """Test: Inscribir respeta su presupuesto con cada rol que puede hacerlo"""
+        teacher_id, teacher_username = create_user('teacher', test_password_hash)
+        student_id, _ = create_user('student', test_password_hash)
+        response = client.post(
+            '/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Curso de Inscripciones',
+                'code': f"QE{uuid.uuid4().hex[:8].upper()}",
+                'teacher_id': teacher_id
+            })
+        )
+        url = f"/api/courses/{json.loads(response.data)['data']['id']}/enroll"
+        
+        headers = auth_headers
+        if role_name == 'teacher':
+            token = AuthService.generate_token(teacher_id, teacher_username, 'teacher')
+            headers = {**auth_headers, 'Authorization': f'Bearer {token}'}
+        
+        with assert_max_queries(QUERY_BUDGETS['courses.enroll_student'], f"POST {url} ({role_name})"):
+            response = client.post(url, headers=headers, data=json.dumps({'student_id': student_id}))
+        
+        assert response.status_code == 200
+    
+    def test_course_mutation_budgets(self, client, auth_headers):
+        """Test: Crear y eliminar un curso respetan su presupuesto"""
+        with assert_max_queries(QUERY_BUDGETS['courses.create_course'], "POST /api/courses"):
+            response = client.post(
+                '/api/courses',
+                headers=auth_headers,
+                data=json.dumps({
+                    'name': 'Curso Temporal',
+                    'code': f"QC{uuid.uuid4().hex[:8].upper()}"
+                })
+            )
+        
+        assert response.status_code == 201
+        url = f"/api/courses/{json.loads(response.data)['data']['id']}"
+        
+        with assert_max_queries(QUERY_BUDGETS['courses.delete_course'], f"DELETE {url}"):
+            response = client.delete(url, headers=auth_headers)
+        
+        assert response.status_code == 200
+    
+    def test_assignment_mutation_budgets(self, client, auth_headers, sample_course):
+        """Test: Crear, actualizar y eliminar una asignación respetan su presupuesto"""
+        course_id = sample_course['course_id']
+        
+        with assert_max_queries(QUERY_BUDGETS['assignments.create_assignment'], "POST /api/assignments"):
+            response = client.post(
+                '/api/assignments',
+                headers=auth_headers,
+                data=json.dumps({'title': 'Tarea Temporal', 'course_id': course_id})
+            )
+        
+        assert response.status_code == 201
+        url = f"/api/assignments/{json.loads(response.data)['data']['id']}"
+        
+        with assert_max_queries(QUERY_BUDGETS['assignments.update_assignment'], f"PUT {url}"):
+            response = client.put(url, headers=auth_headers, data=json.dumps({'max_score': 50}))
+        
+        assert response.status_code == 200
+        
+        with assert_max_queries(QUERY_BUDGETS['assignments.delete_assignment'], f"DELETE {url}"):
+            response = client.delete(url, headers=auth_headers)
+        
+        assert response.status_code == 200
+    
+    def test_assignment_batch_budgets(self, client, auth_headers, sample_course):
+        """Test: Crear en lote y copiar asignaciones respetan su presupuesto"""
+        with assert_max_queries(QUERY_BUDGETS['assignments.bulk_create_assignments'],
+                                "POST /api/assignments/bulk"):
+            response = client.post(
+                '/api/assignments/bulk',
+                headers=auth_headers,
+                data=json.dumps({
+                    'assignments': [
+                        {'title': f'Tarea en Lote {i}', 'course_id': sample_course['course_id']}
+                        for i in range(5)
+                    ]
+                })
+            )
+        
+        assert response.status_code == 201
+        
+        response = client.post(
+            '/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Curso Destino',
+                'code': f"QD{uuid.uuid4().hex[:8].upper()}"
+            })
+        )
+        target_id = json.loads(response.data)['data']['id']
+        url = f"/api/courses/{sample_course['course_id']}/assignments/clone"
+        
+        with assert_max_queries(QUERY_BUDGETS['assignments.clone_course_assignments'], f"POST {url}"):
+            response = client.post(
+                url,
+                headers=auth_headers,
+                data=json.dumps({'target_course_ids': [target_id]})
+            )
+        
+        assert response.status_code == 201
+    
+    def test_user_budgets(self, client, auth_headers):
+        """Test: Crear, leer, actualizar y eliminar un usuario respetan su presupuesto"""
+        username = f"qu{uuid.uuid4().hex[:10]}"
+        
+        with assert_max_queries(QUERY_BUDGETS['users.create_user'], "POST /api/users"):
+            response = client.post(
+                '/api/users',
+                headers=auth_headers,
+                data=json.dumps({
+                    'username': username,
+                    'email': f"{username}@test.com",
+                    'password': 'Test123!',
+                    'role': 'student'
+                })
+            )
+        
+        assert response.status_code == 201
+        url = f"/api/users/{json.loads(response.data)['data']['id']}"
+        
+        with assert_max_queries(QUERY_BUDGETS['users.get_user'], f"GET {url}"):
+            response = client.get(url, headers=auth_headers)
+        
+        assert response.status_code == 200
+        
+        with assert_max_queries(QUERY_BUDGETS['users.update_user'], f"PUT {url}"):
+            response = client.put(
+                url,
+                headers=auth_headers,
+                data=json.dumps({'email': f"{username}.nuevo@test.com", 'role': 'teacher'})
+            )
+        
+        assert response.status_code == 200
+        
+        with assert_max_queries(QUERY_BUDGETS['users.delete_user'], f"DELETE {url}"):
+            response = client.delete(url, headers=auth_headers)
+        
+        assert response.status_code == 200
+    
+    def test_account_budgets(self, client, auth_headers, test_password_hash):
+        """Test: Registro, login y cambio de contraseña respetan su presupuesto"""
+        username = f"qr{uuid.uuid4().hex[:10]}"
+        
+        with assert_max_queries(QUERY_BUDGETS['auth.register'], "POST /api/auth/register"):
+            response = client.post(
+                '/api/auth/register',
+                headers={'Content-Type': 'application/json'},
+                data=json.dumps({
+                    'username': username,
+                    'email': f"{username}@test.com",
+                    'password': 'Test123!'
+                })
+            )
+        
+        assert response.status_code == 201
+        
+        user_id, username = create_user('student', test_password_hash)
+        
+        with assert_max_queries(QUERY_BUDGETS['auth.login'], "POST /api/auth/login"):
+            response = client.post(
+                '/api/auth/login',
+                headers={'Content-Type': 'application/json'},
+                data=json.dumps({'username': username, 'password': 'Test123!'})
+            )
+        
+        assert response.status_code == 200
+        
+        token = AuthService.generate_token(user_id, username, 'student')
+        headers = {**auth_headers, 'Authorization': f'Bearer {token}'}
+        
+        with assert_max_queries(QUERY_BUDGETS['users.change_password'], "POST /api/users/change-password"):
+            response = client.post(
+                '/api/users/change-password',
+                headers=headers,
+                data=json.dumps({'old_password': 'Test123!', 'new_password': 'Test456!'})
+            )
+        
+        assert response.status_code == 200
+    
+    def test_course_assignments_checks_access_once(self, client, auth_headers, test_password_hash):
+        """Test: La versión (ETag) y la vista comparten la verificación de acceso"""
+        teacher_id, teacher_username = create_user('teacher', test_password_hash)
+        response = client.post(
+            '/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Curso de Acceso',
+                'code': f"QA{uuid.uuid4().hex[:8].upper()}",
+                'teacher_id': teacher_id
+            })
+        )
+        url = f"/api/courses/{json.loads(response.data)['data']['id']}/assignments"
+        token = AuthService.generate_token(teacher_id, teacher_username, 'teacher')
+        
+        with QueryCapture() as capture:
+            response = client.get(url, headers={**auth_headers, 'Authorization': f'Bearer {token}'})
+        
+        assert response.status_code == 200
+        access_checks = [s for s in capture.statements if s.startswith('SELECT teacher_id FROM courses')]
+        assert len(access_checks) == 1
+    
+    def test_failure_shows_captured_sql(self, client, auth_headers):
+        """Test: Al superar el presupuesto se muestra el SQL capturado"""
+        with pytest.raises(AssertionError) as error:
+            with assert_max_queries(1, 'GET /api/courses'):
+                client.get('/api/courses', headers=auth_headers)
+        
+        message = str(error.value)
+        assert 'presupuesto: 1' in message
+        assert 'SQL capturado' in message
+        assert 'FROM courses' in message
@@ -0,0 +1,38 @@
+"""
+Tests para los snapshots de la base de datos
+"""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from app.database import backend
+from scripts.snapshot_db import decode_line, encode_row, load_manifest, require_mysql
+
+class TestSnapshotDb:
+    """Suite de tests de scripts/snapshot_db.py"""
+    
+    def test_row_round_trip(self):
+        """Test: Los valores especiales sobreviven a la codificación TSV"""
+        row = (7, None, 'tab\there', 'línea\nnueva\r', 'barra \\N \\ final\\', '\0', '')
+        
+        line = encode_row(row)
+        
+        assert line.count('\n') == 1 and line.count('\t') == len(row) - 1
+        assert decode_line(line) == ['7', None, 'tab\there', 'línea\nnueva\r', 'barra \\N \\ final\\', '\0', '']
+    
+    def test_encodes_like_mysql_load_data(self):
+        """Test: El formato es el de LOAD DATA por defecto"""
+        row = (1, Decimal('9.50'), datetime(2026, 3, 2, 8, 30), None, 'a\\b')
+        
+        assert encode_row(row) == '1\t9.50\t2026-03-02 08:30:00\t\\N\ta\\\\b\n'
+    
+    def test_missing_snapshot(self, tmp_path):
+        """Test: Restaurar un snapshot inexistente da un error claro"""
+        with pytest.raises(ValueError):
+            load_manifest(str(tmp_path), 'no-existe')
+    
+    def test_requires_mysql(self, monkeypatch):
+        """Test: save y restore rechazan otros backends con un mensaje claro"""
+        monkeypatch.setattr(backend, 'NAME', 'sqlite')
+        with pytest.raises(ValueError, match='solo funciona con MySQL'):
+            require_mysql()
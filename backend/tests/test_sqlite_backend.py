@@ -0,0 +1,116 @@
+"""
+Tests para el backend SQLite y su dialecto
+"""
+
+import pytest
+import pymysql
+from datetime import datetime
+from decimal import Decimal
+from pymysql.cursors import Cursor, DictCursor
+from app.backends import get_backend
+from app.backends.sqlite import connect, translate, translate_ddl
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        code VARCHAR(20) NOT NULL UNIQUE,
+        max_score DECIMAL(5,2) DEFAULT 100.00,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+        INDEX idx_code (code)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS enrollments (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        course_id INT NOT NULL,
+        FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_enrollment (student_id, course_id)
+    ) ENGINE=InnoDB;
+    """
+]
+
+@pytest.fixture
+def conn(tmp_path):
+    """Conexión SQLite con el esquema de prueba"""
+    conn = connect(DictCursor, path=str(tmp_path / 'test.sqlite3'))
+    cursor = conn.cursor()
+    for statement in SCHEMA:
+        for translated in translate_ddl(statement):
+            cursor.execute(translated)
+    conn.commit()
+    yield conn
+    conn.close()
+
+class TestSqliteBackend:
+    """Suite de tests de app/backends/sqlite.py"""
+    
+    def test_translate_queries(self):
+        """Test: Placeholders, LIKE con escapes y NOW(6)"""
+        assert translate("SELECT id FROM users WHERE username LIKE %s AND id > %s") == (
+            "SELECT id FROM users WHERE username LIKE ? ESCAPE '\\' AND id > ?"
+        )
+        assert translate("SELECT %(id)s, '100%%'") == "SELECT :id, '100%'"
+        assert translate("SELECT '100%%'", formatted=False) == "SELECT '100%%'"
+        assert 'NOW' not in translate("SELECT NOW(6) AS now")
+    
+    def test_schema_translation(self, conn):
+        """Test: Índices, AUTO_INCREMENT, collation y ON UPDATE se traducen"""
+        backend = get_backend('sqlite')
+        cursor = conn.cursor()
+        
+        assert backend.has_index(cursor, 'courses', 'idx_code')
+        assert backend.has_column(cursor, 'courses', 'updated_at')
+        assert not backend.has_column(cursor, 'courses', 'teacher_id')
+        assert backend.table_estimates(cursor, ['courses', 'users']) == {'courses': 0}
+        
+        cursor.execute("INSERT INTO courses (code) VALUES (%s)", ('MAT-1',))
+        course_id = cursor.lastrowid
+        cursor.execute("UPDATE courses SET updated_at = %s WHERE id = %s", (datetime(2020, 1, 1), course_id))
+        cursor.execute("UPDATE courses SET code = %s WHERE id = %s", ('MAT-2', course_id))
+        cursor.execute("SELECT * FROM courses WHERE code = %s", ('mat-2',))
+        course = cursor.fetchone()
+        
+        assert course['id'] == course_id
+        assert course['max_score'] == Decimal('100')
+        assert isinstance(course['created_at'], datetime)
+        assert course['updated_at'] > datetime(2020, 1, 1)
+        
+        # Solo las columnas con nombre de fecha se convierten, no el texto
+        cursor.execute("INSERT INTO courses (code) VALUES (%s)", ('2024-01-01 10:00:00',))
+        cursor.execute(
+            "SELECT code, code AS label, MAX(updated_at) AS updated_at, NOW(6) AS now FROM courses WHERE code = %s",
+            ('2024-01-01 10:00:00',)
+        )
+        row = cursor.fetchone()
+        
+        assert row['code'] == row['label'] == '2024-01-01 10:00:00'
+        assert isinstance(row['updated_at'], datetime) and isinstance(row['now'], datetime)
+    
+    def test_pymysql_interface(self, conn):
+        """Test: Filas, executemany, errores de pymysql y transacciones"""
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO courses (code) VALUES (%s)", ('FIS-1',))
+        course_id = cursor.lastrowid
+        conn.commit()
+        
+        cursor.executemany(
+            "INSERT INTO enrollments (student_id, course_id) VALUES (%s, %s)",
+            [(student_id, course_id) for student_id in range(1, 4)]
+        )
+        assert cursor.rowcount == 3
+        
+        with pytest.raises(pymysql.err.IntegrityError) as error:
+            cursor.execute("INSERT INTO enrollments (student_id, course_id) VALUES (%s, %s)", (1, course_id))
+        assert error.value.args[0] == 1062
+        
+        conn.rollback()
+        tuples = conn.cursor(Cursor)
+        tuples.execute("SELECT COUNT(*), MAX(updated_at) FROM courses")
+        total, updated_at = tuples.fetchone()
+        
+        assert total == 1 and isinstance(updated_at, datetime)
+        tuples.execute("SELECT COUNT(*) FROM enrollments")
+        assert tuples.fetchone() == (0,)
@@ -0,0 +1,86 @@
+"""
+Tests para la sincronización incremental
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+from app.services.sync_service import SyncService
+
+class TestSync:
+    """Suite de tests para /api/sync"""
+    
+    def test_sync_without_auth(self, client):
+        """Test: Sincronizar sin autenticación"""
+        response = client.get('/api/sync')
+        assert response.status_code == 401
+    
+    def test_initial_token(self, client, auth_headers):
+        """Test: Sin since solo se retorna el token inicial"""
+        response = client.get('/api/sync', headers=auth_headers)
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)['data']
+        assert data['token']
+        assert data['courses'] == [] and data['deleted'] == []
+    
+    def test_invalid_token(self, client, auth_headers):
+        """Test: Token de sincronización inválido"""
+        response = client.get('/api/sync?since=abc', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_token_roundtrip(self):
+        """Test: El token conserva el momento y el último cambio"""
+        since = datetime(2026, 1, 1, 12, 0, 0, 123456)
+        
+        token = SyncService.encode_token(since, 42)
+        assert SyncService.decode_token(token) == (since, 42)
+    
+    def test_sync_created_and_deleted(self, client, auth_headers):
+        """Test: Creaciones y eliminaciones desde el token"""
+        token = json.loads(client.get('/api/sync', headers=auth_headers).data)['data']['token']
+        
+        response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Curso Sync',
+                'code': 'SYNC01',
+                'description': 'Curso para sincronización'
+            })
+        )
+        course_id = json.loads(response.data)['data']['id']
+        client.delete(f'/api/courses/{course_id}', headers=auth_headers)
+        
+        data = json.loads(client.get(f'/api/sync?since={token}', headers=auth_headers).data)['data']
+        assert {'type': 'course', 'id': course_id, 'course_id': course_id} in data['deleted']
+        assert data['token'] != token
+    
+    def test_sync_course_deletion_removes_assignments(self, client, auth_headers):
+        """Test: Eliminar un curso entrega también la eliminación de sus asignaciones"""
+        response = client.post('/api/courses',
+            headers=auth_headers,
+            data=json.dumps({
+                'name': 'Curso Sync Asignaciones',
+                'code': 'SYNC02',
+                'description': 'Curso con asignaciones'
+            })
+        )
+        course_id = json.loads(response.data)['data']['id']
+        response = client.post('/api/assignments',
+            headers=auth_headers,
+            data=json.dumps({
+                'title': 'Tarea Sync',
+                'course_id': course_id,
+                'description': 'Se elimina con el curso',
+                'due_date': (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S'),
+                'max_score': 100.0
+            })
+        )
+        assignment_id = json.loads(response.data)['data']['id']
+        token = json.loads(client.get('/api/sync', headers=auth_headers).data)['data']['token']
+        
+        client.delete(f'/api/courses/{course_id}', headers=auth_headers)
+        
+        data = json.loads(client.get(f'/api/sync?since={token}', headers=auth_headers).data)['data']
+        assert {'type': 'assignment', 'id': assignment_id, 'course_id': course_id} in data['deleted']
+        assert {'type': 'course', 'id': course_id, 'course_id': course_id} in data['deleted']
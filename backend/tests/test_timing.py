@@ -0,0 +1,31 @@
+"""
+Tests para el desglose de tiempos por petición
+"""
+
+import pytest
+from app.timing import RequestTiming
+
+class TestTiming:
+    """Suite de tests para Server-Timing"""
+    
+    def test_server_timing_format(self):
+        """Test: Formato del header y campos del log"""
+        timing = RequestTiming()
+        timing.add('auth', 0.0012)
+        timing.db_time = 0.0034
+        timing.db_count = 2
+        
+        assert timing.server_timing(0.009) == \
+            'auth;dur=1.2, db;dur=3.4;desc="2 queries", total;dur=9.0'
+        assert timing.fields(0.009) == {
+            'auth_ms': 1.2, 'db_ms': 3.4, 'db_queries': 2, 'total_ms': 9.0
+        }
+    
+    def test_server_timing_header(self, client, auth_headers):
+        """Test: Las respuestas de la API incluyen Server-Timing"""
+        response = client.get('/api/courses', headers=auth_headers)
+        header = response.headers['Server-Timing']
+        
+        assert 'auth;dur=' in header
+        assert 'db;dur=' in header
+        assert 'total;dur=' in header
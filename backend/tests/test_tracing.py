@@ -0,0 +1,117 @@
+"""
+Tests para las trazas de peticiones
+"""
+
+import json
+import pytest
+from flask import g
+from app import create_app
+from app.config import Config
+from app.tracing import SpanExporter, Trace, _parse_traceparent, span, traced_service
+from scripts.trace_report import load_traces
+
+@traced_service
+class SampleService:
+    """Servicio de prueba"""
+    
+    @staticmethod
+    def outer():
+        return SampleService.inner() + 1
+    
+    @staticmethod
+    def inner():
+        return 1
+
+class TestTracing:
+    """Suite de tests para spans y exportación OTLP"""
+    
+    def test_parse_traceparent(self):
+        """Test: Se respeta el trace id y el flag de muestreo de W3C"""
+        trace_id, parent_id, sampled = _parse_traceparent(
+            '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'
+        )
+        
+        assert trace_id == '0af7651916cd43dd8448eb211c80319c'
+        assert parent_id == 'b7ad6b7169203331'
+        assert sampled is True
+        assert _parse_traceparent('00-' + '0' * 32 + '-b7ad6b7169203331-01') is None
+        assert _parse_traceparent('invalido') is None
+    
+    def test_service_spans_are_nested(self, app):
+        """Test: Cada método del servicio abre un span hijo del activo"""
+        with app.test_request_context('/'):
+            trace = Trace('0af7651916cd43dd8448eb211c80319c')
+            g._trace = trace
+            root = trace.start('GET /')
+            
+            assert SampleService.outer() == 2
+            with pytest.raises(ValueError):
+                with span('falla'):
+                    raise ValueError("error")
+            
+            trace.end(root)
+        
+        names = {item.name: item for item in trace.spans}
+        assert names['SampleService.outer'].parent_id == root.span_id
+        assert names['SampleService.inner'].parent_id == names['SampleService.outer'].span_id
+        assert names['falla'].status == 2
+    
+    def test_request_span_attributes(self, monkeypatch, tmp_path, auth_headers):
+        """Test: El token de ?token= no se escribe y db.system es el backend activo"""
+        monkeypatch.setattr(Config, 'TRACING_ENABLED', True)
+        monkeypatch.setattr(Config, 'TRACING_SAMPLE_RATE', 1.0)
+        monkeypatch.setattr(Config, 'TRACING_FILE', str(tmp_path / 'traces.jsonl'))
+        app = create_app('testing')
+        exported = []
+        monkeypatch.setattr(app.extensions['span_exporter'], 'export', exported.append)
+        
+        app.test_client().get('/api/courses?limit=5&token=secreto', headers=auth_headers)
+        
+        root = exported[0].spans[0]
+        queries = [item for item in exported[0].spans if 'db.system' in item.attributes]
+        assert root.attributes['http.target'] == '/api/courses?limit=5&token=REDACTED'
+        assert queries and all(item.attributes['db.system'] == Config.DATABASE_BACKEND for item in queries)
+    
+    def test_exporter_writes_otlp_batch(self, tmp_path):
+        """Test: Un lote por línea con el formato de ExportTraceServiceRequest"""
+        trace = Trace('0af7651916cd43dd8448eb211c80319c')
+        trace.end(trace.start('GET /api/courses'))
+        exporter = SpanExporter(str(tmp_path / 'traces.jsonl'))
+        exporter.export(trace)
+        
+        exporter.flush([exporter.queue.get()])
+        
+        batch = json.loads((tmp_path / 'traces.jsonl').read_text())
+        spans = batch['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert spans[0]['traceId'] == '0af7651916cd43dd8448eb211c80319c'
+        assert spans[0]['name'] == 'GET /api/courses'
+        assert int(spans[0]['endTimeUnixNano']) >= int(spans[0]['startTimeUnixNano'])
+    
+    def test_exporter_close_flushes_pending(self, tmp_path):
+        """Test: Al cerrar se escriben los spans aún en cola"""
+        exporter = SpanExporter(str(tmp_path / 'traces.jsonl'), batch_size=1)
+        for trace_id in ('0af7651916cd43dd8448eb211c80319c', '4bf92f3577b34da6a3ce929d0e0e4736'):
+            trace = Trace(trace_id)
+            trace.end(trace.start('GET /api/courses'))
+            exporter.export(trace)
+        
+        exporter.close()
+        
+        lines = (tmp_path / 'traces.jsonl').read_text().splitlines()
+        assert len(lines) == 2
+        assert exporter.queue.empty()
+    
+    def test_report_skips_torn_lines(self, tmp_path):
+        """Test: Un lote truncado se omite y se cuenta sin perder los demás"""
+        trace = Trace('0af7651916cd43dd8448eb211c80319c')
+        trace.end(trace.start('GET /api/courses'))
+        exporter = SpanExporter(str(tmp_path / 'traces.jsonl'))
+        exporter.export(trace)
+        exporter.flush([exporter.queue.get()])
+        with open(tmp_path / 'traces.jsonl', 'a', encoding='utf-8') as f:
+            f.write('{"resourceSpans": [{"scopeSp')
+        
+        traces, skipped = load_traces([str(tmp_path / 'traces.jsonl')])
+        
+        assert skipped == 1
+        assert [s['name'] for s in traces['0af7651916cd43dd8448eb211c80319c']] == ['GET /api/courses']
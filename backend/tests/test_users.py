@@ -2,6 +2,7 @@
 Tests para el módulo de usuarios (CRUD)
 """
 
+import io
 import json
 import pytest
 
@@ -135,4 +136,63 @@ class TestUsers:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['data']['pagination']['page'] == 1
-        assert data['data']['pagination']['limit'] == 5
\ No newline at end of file
+        assert data['data']['pagination']['limit'] == 5
+    
+    def test_import_users_csv(self, client, auth_headers):
+        """Test: Importar usuarios desde CSV con errores por fila"""
+        csv_data = (
+            "username,email,password,role\n"
+            "importok,importok@test.com,ImportOk123!,student\n"
+            "importbad,importbad@test.com,weak,student\n"
+        )
+        
+        response = client.post('/api/users/import',
+            headers={'Authorization': auth_headers['Authorization']},
+            data={'file': (io.BytesIO(csv_data.encode('utf-8')), 'users.csv')},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['processed'] == 2
+        assert data['data']['failed'] >= 1
+        assert any(error['row'] == 2 for error in data['data']['errors'])
+    
+    def test_import_users_csv_malformed(self, client, auth_headers):
+        """Test: Un CSV mal formado a mitad de archivo devuelve el resumen parcial"""
+        csv_data = (
+            "username,email,password,role\n"
+            "importfirst,importfirst@test.com,ImportOk123!,student\n"
+            "importlong,importlong@test.com," + 'x' * 200000 + ",student\n"
+        )
+        
+        response = client.post('/api/users/import',
+            headers={'Authorization': auth_headers['Authorization']},
+            data={'file': (io.BytesIO(csv_data.encode('utf-8')), 'users.csv')},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['data']['created'] == 1
+        assert data['data']['errors'][-1]['row'] == 2
+    
+    def test_import_users_csv_invalid_encoding(self, client, auth_headers):
+        """Test: Una fila que no es UTF-8 devuelve el resumen parcial"""
+        csv_data = (
+            b"username,email,password,role\n"
+            b"importutf,importutf@test.com,ImportOk123!,student\n"
+            b"import\xff,importbad@test.com,ImportOk123!,student\n"
+        )
+        
+        response = client.post('/api/users/import',
+            headers={'Authorization': auth_headers['Authorization']},
+            data={'file': (io.BytesIO(csv_data), 'users.csv')},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['data']['created'] == 1
+        assert data['data']['errors'][-1]['row'] == 2
@@ -5,6 +5,8 @@
 let currentPage = 1;
 let isEditMode = false;
 let courseIdFilter = null;
+let courseAssignments = [];
+let courseAssignmentsPagination = null;
 
 document.addEventListener('DOMContentLoaded', function() {
     // Verificar autenticación
@@ -31,8 +33,44 @@ document.addEventListener('DOMContentLoaded', function() {
     } else {
         loadAllAssignments();
     }
+    
+    // Recargar solo lo que cambió en otras sesiones
+    subscribeChanges(handleChange);
 });
 
+/**
+ * Aplica un evento de cambio del servidor
+ * En la vista de un curso se actualiza o quita solo la asignación afectada
+ */
+async function handleChange(change) {
+    if (!courseIdFilter) {
+        if (!change || change.type !== 'enrollment') {
+            loadAllAssignments(currentPage);
+        }
+        return;
+    }
+    
+    if (change && change.course_id !== Number(courseIdFilter)) return;
+    
+    if (!change || change.type !== 'assignment' || change.action === 'created') {
+        loadCourseAssignments(courseIdFilter);
+        return;
+    }
+    
+    const index = courseAssignments.findIndex(assignment => assignment.id === change.id);
+    if (index === -1) return;
+    
+    if (change.action === 'deleted') {
+        courseAssignments.splice(index, 1);
+    } else {
+        const response = await apiRequest(`/assignments/${change.id}`);
+        if (!response || !response.ok) return;
+        courseAssignments[index] = response.data.data;
+    }
+    
+    renderAssignments(courseAssignments, courseAssignmentsPagination);
+}
+
 /**
  * Carga todas las asignaciones del usuario
  */
@@ -41,11 +79,11 @@ async function loadAllAssignments(page = 1) {
     const container = document.getElementById('assignmentsContainer');
     
     try {
-        const response = await apiRequest(`/assignments?page=${page}&limit=20`);
+        const response = await apiRequest(`/assignments?page=${page}&limit=20&format=columns`);
         
         if (response && response.ok && response.data.success) {
             const { assignments, pagination } = response.data.data;
-            renderAssignments(assignments, pagination);
+            renderAssignments(decodeColumns(assignments), pagination);
         } else {
             container.innerHTML = '<div class="error-message">Error al cargar asignaciones</div>';
         }
@@ -57,24 +95,38 @@ async function loadAllAssignments(page = 1) {
 
 /**
  * Carga asignaciones de un curso específico
+ * Sin cursor carga la primera página; con cursor agrega la siguiente
  */
-async function loadCourseAssignments(courseId) {
+async function loadCourseAssignments(courseId, cursor = null) {
     const container = document.getElementById('assignmentsContainer');
     
     try {
-        const response = await apiRequest(`/courses/${courseId}/assignments`);
+        let endpoint = `/courses/${courseId}/assignments?limit=50&format=columns`;
+        if (cursor) {
+            endpoint += `&cursor=${encodeURIComponent(cursor)}`;
+        }
+        
+        const response = await apiRequest(endpoint);
         
         if (response && response.ok && response.data.success) {
-            const assignments = response.data.data.assignments;
+            const { pagination } = response.data.data;
+            const assignments = decodeColumns(response.data.data.assignments);
             
-            // Obtener nombre del curso
-            const courseResponse = await apiRequest(`/courses/${courseId}`);
-            if (courseResponse && courseResponse.ok) {
-                const courseName = courseResponse.data.data.name;
-                document.getElementById('pageTitle').textContent = `📝 Asignaciones: ${courseName}`;
+            if (cursor) {
+                courseAssignments = courseAssignments.concat(assignments);
+            } else {
+                courseAssignments = assignments;
+                
+                // Obtener nombre del curso
+                const courseResponse = await apiRequest(`/courses/${courseId}`);
+                if (courseResponse && courseResponse.ok) {
+                    const courseName = courseResponse.data.data.name;
+                    document.getElementById('pageTitle').textContent = `📝 Asignaciones: ${courseName}`;
+                }
             }
             
-            renderAssignments(assignments, null);
+            courseAssignmentsPagination = pagination;
+            renderAssignments(courseAssignments, pagination);
         } else {
             container.innerHTML = '<div class="error-message">Error al cargar asignaciones</div>';
         }
@@ -163,7 +215,9 @@ function renderAssignments(assignments, pagination) {
     html += '</div>';
     
     // Agregar paginación
-    if (pagination && pagination.pages > 1) {
+    if (pagination && pagination.has_more) {
+        html += renderLoadMore(pagination);
+    } else if (pagination && pagination.pages > 1) {
         html += renderPagination(pagination);
     }
     
@@ -190,6 +244,19 @@ function renderPagination(pagination) {
     return html;
 }
 
+/**
+ * Renderiza el botón para cargar la siguiente página (paginación por cursor)
+ */
+function renderLoadMore(pagination) {
+    return `
+        <div style="margin-top: 20px; text-align: center;">
+            <button class="btn btn-secondary btn-sm" onclick="loadCourseAssignments(courseIdFilter, '${pagination.next_cursor}')">
+                Cargar más
+            </button>
+        </div>
+    `;
+}
+
 /**
  * Muestra el modal para crear asignación
  */
@@ -78,6 +78,38 @@ function requireAuth() {
     return true;
 }
 
+/**
+ * Convierte una lista en formato columnar (?format=columns) en objetos
+ * { columns: ['id', 'name'], rows: [[1, 'A']] } -> [{ id: 1, name: 'A' }]
+ */
+function decodeColumns(table) {
+    return table.rows.map(row => {
+        const item = {};
+        table.columns.forEach((column, index) => {
+            item[column] = row[index];
+        });
+        return item;
+    });
+}
+
+/**
+ * Se suscribe a los cambios en tiempo real (/api/events/stream)
+ * handler recibe { type, action, id, course_id, version }, o null cuando
+ * el servidor pide recargar todo (resync). EventSource reconecta solo
+ * y reanuda con Last-Event-ID.
+ */
+function subscribeChanges(handler) {
+    if (!window.EventSource || !isAuthenticated()) return null;
+    
+    const url = `${CONFIG.API_URL}/events/stream?token=${encodeURIComponent(getToken())}`;
+    const source = new EventSource(url);
+    
+    source.addEventListener('change', event => handler(JSON.parse(event.data)));
+    source.addEventListener('resync', () => handler(null));
+    
+    return source;
+}
+
 /**
  * Verifica si el usuario tiene un rol específico
  */
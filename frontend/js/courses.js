@@ -4,6 +4,8 @@
 
 let currentPage = 1;
 let isEditMode = false;
+let enrolledStudents = [];
+let studentsCourseId = null;
 
 document.addEventListener('DOMContentLoaded', function() {
     // Verificar autenticación
@@ -22,8 +24,22 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Cargar cursos
     loadCourses();
+    
+    // Recargar solo lo que cambió en otras sesiones
+    subscribeChanges(handleChange);
 });
 
+/**
+ * Aplica un evento de cambio del servidor
+ */
+function handleChange(change) {
+    if (!change || change.type === 'course') {
+        loadCourses(currentPage);
+    } else if (change.type === 'enrollment' && change.course_id === studentsCourseId) {
+        viewStudents(studentsCourseId);
+    }
+}
+
 /**
  * Carga la lista de cursos
  */
@@ -32,11 +48,11 @@ async function loadCourses(page = 1) {
     const container = document.getElementById('coursesContainer');
     
     try {
-        const response = await apiRequest(`/courses?page=${page}&limit=20`);
+        const response = await apiRequest(`/courses?page=${page}&limit=20&format=columns`);
         
         if (response && response.ok && response.data.success) {
             const { courses, pagination } = response.data.data;
-            renderCourses(courses, pagination);
+            renderCourses(decodeColumns(courses), pagination);
         } else {
             container.innerHTML = '<div class="error-message">Error al cargar cursos</div>';
         }
@@ -258,28 +274,40 @@ async function deleteCourse(courseId, courseName) {
 /**
  * Ver estudiantes inscritos
  */
-async function viewStudents(courseId) {
-    document.getElementById('studentsModal').classList.add('show');
-    document.getElementById('studentsContent').innerHTML = `
-        <div class="loading">
-            <div class="spinner"></div>
-            <p>Cargando estudiantes...</p>
-        </div>
-    `;
+async function viewStudents(courseId, cursor = null) {
+    const container = document.getElementById('studentsContent');
+    
+    if (!cursor) {
+        enrolledStudents = [];
+        studentsCourseId = courseId;
+        document.getElementById('studentsModal').classList.add('show');
+        container.innerHTML = `
+            <div class="loading">
+                <div class="spinner"></div>
+                <p>Cargando estudiantes...</p>
+            </div>
+        `;
+    }
     
     try {
-        const response = await apiRequest(`/courses/${courseId}/students`);
+        let endpoint = `/courses/${courseId}/students?limit=50&format=columns`;
+        if (cursor) {
+            endpoint += `&cursor=${encodeURIComponent(cursor)}`;
+        }
+        
+        const response = await apiRequest(endpoint);
         
         if (response && response.ok && response.data.success) {
-            const students = response.data.data.students;
-            renderStudents(students);
+            const { students, pagination } = response.data.data;
+            enrolledStudents = enrolledStudents.concat(decodeColumns(students));
+            renderStudents(enrolledStudents, courseId, pagination);
         } else {
-            document.getElementById('studentsContent').innerHTML = 
+            container.innerHTML = 
                 '<div class="error-message">Error al cargar estudiantes</div>';
         }
     } catch (error) {
         console.error('Error:', error);
-        document.getElementById('studentsContent').innerHTML = 
+        container.innerHTML = 
             '<div class="error-message">Error de conexión</div>';
     }
 }
@@ -287,7 +315,7 @@ async function viewStudents(courseId) {
 /**
  * Renderiza la lista de estudiantes
  */
-function renderStudents(students) {
+function renderStudents(students, courseId, pagination) {
     const container = document.getElementById('studentsContent');
     
     if (students.length === 0) {
@@ -313,6 +341,18 @@ function renderStudents(students) {
     });
     
     html += '</tbody></table>';
+    
+    // Siguiente página por cursor
+    if (pagination && pagination.has_more) {
+        html += `
+            <div style="margin-top: 15px; text-align: center;">
+                <button class="btn btn-secondary btn-sm" onclick="viewStudents(${courseId}, '${pagination.next_cursor}')">
+                    Cargar más
+                </button>
+            </div>
+        `;
+    }
+    
     container.innerHTML = html;
 }
 
@@ -331,6 +371,7 @@ function closeModal() {
 }
 
 function closeStudentsModal() {
+    studentsCourseId = null;
     document.getElementById('studentsModal').classList.remove('show');
 }
 
@@ -32,11 +32,11 @@ async function loadUsers(page = 1) {
     const container = document.getElementById('usersTableContainer');
     
     try {
-        const response = await apiRequest(`/users?page=${page}&limit=20`);
+        const response = await apiRequest(`/users?page=${page}&limit=20&format=columns`);
         
         if (response && response.ok && response.data.success) {
             const { users, pagination } = response.data.data;
-            renderUsersTable(users, pagination);
+            renderUsersTable(decodeColumns(users), pagination);
         } else {
             container.innerHTML = '<div class="error-message">Error al cargar usuarios</div>';
         }